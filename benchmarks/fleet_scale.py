@@ -0,0 +1,202 @@
+"""
+Filename: fleet_scale.py
+Version name: 1.0, 2026-10-17
+Short description: Fleet scale test with more than 100 simulated Robotinos whose resourceIds have several digits. Runs
+the RobotinoServer, RobotinoManager and MESClient against the RobotinoSimulator and the MESSimulator through state
+updates and the dispatch of transport tasks. Run with "python -m benchmarks.fleet_scale" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import argparse
+import time
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from commandserver.robotinoserver import RobotinoServer
+from commandserver.robotinosimulator import RobotinoSimulator
+from conf import POLL_TIME_FLEET
+from mescommunicator.connectionpool import ServiceConnectionPool
+from mescommunicator.mesclient import MESClient
+from mescommunicator.messimulator import MESSimulator
+from robotinomanager.robotinomanager import RobotinoManager
+
+HOST = "127.0.0.1"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fleet scale test against simulated Robotinos and IAS-MES"
+    )
+    parser.add_argument(
+        "--robotinos", type=int, default=120, help="number of simulated robotinos"
+    )
+    parser.add_argument(
+        "--first-id", type=int, default=10, help="resourceId of the first robotino"
+    )
+    parser.add_argument(
+        "--connections", type=int, default=4, help="connections of the simulator"
+    )
+    parser.add_argument(
+        "--joined",
+        type=int,
+        default=2,
+        help="robotinos which join the fleet after it was created",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=60.0, help="duration of the test in seconds"
+    )
+    parser.add_argument(
+        "--task-rate", type=float, default=20.0, help="new transport tasks per second"
+    )
+    # Robotino._waitForOpResponse samples the command info once per second, so the "Started-..." of an operation has
+    # to stay visible for longer than that
+    parser.add_argument(
+        "--op-duration",
+        type=float,
+        default=2.5,
+        help="duration of an operation in seconds",
+    )
+    parser.add_argument(
+        "--min-finished",
+        type=float,
+        default=0.25,
+        help="min share of the robotinos which have to finish a task",
+    )
+    parser.add_argument(
+        "--max-missing",
+        type=float,
+        default=0.01,
+        help="max share of the polled RobotInfos which may be missing",
+    )
+    args = parser.parse_args()
+    ids = list(range(args.first_id, args.first_id + args.robotinos))
+    initialIds = ids[: len(ids) - args.joined]
+
+    app = QCoreApplication([])
+    mesSimulator = MESSimulator(
+        host=HOST,
+        resources=range(1, 41),
+        taskRate=args.task_rate,
+        maxTasks=2 * args.robotinos,
+        seed=1,
+    )
+    mesSimulator.start()
+    mesClient = MESClient()
+    mesClient.IP_MES = HOST
+    mesClient.servicePool = ServiceConnectionPool((HOST, 2000))
+    robotinoServer = RobotinoServer()
+    robotinoServer.ADDR = (HOST, 13000)
+    robotinoManager = RobotinoManager(
+        mesClient=mesClient, robotinoServer=robotinoServer
+    )
+    robotinoServer.setRobotinoManager(robotinoManager)
+    mesClient.start()
+    robotinoServer.start()
+    robotinoManager.start()
+    robotinoSimulator = RobotinoSimulator(
+        initialIds,
+        host=HOST,
+        connections=args.connections,
+        opDuration=args.op_duration,
+        seed=1,
+    )
+    robotinoSimulator.start()
+
+    # wait until the fleet is created from the AllRobotinoID message
+    deadline = time.monotonic() + 10
+    while len(robotinoManager.fleet) != len(initialIds) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.1)
+    assert [
+        robotino.id for robotino in robotinoManager.fleet
+    ] == initialIds, "Fleet wasn't created with all resourceIds"
+    # the robotinos which join are added by the next poll of the fleet. Each connection asks for the fleet while it is
+    # empty, so the replies to these requests have to arrive before
+    time.sleep(1)
+    fleetPolls = robotinoSimulator.getMetrics()["commands"]["GetAllRobotinoID"]
+    for id in ids[len(initialIds) :]:
+        robotinoSimulator.addRobotino(id)
+    deadline = time.monotonic() + POLL_TIME_FLEET + 10
+    while len(robotinoManager.fleet) != len(ids) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.1)
+    assert [
+        robotino.id for robotino in robotinoManager.fleet
+    ] == ids, f"Robotinos {ids[len(initialIds) :]} didn't join the fleet"
+    assert (
+        robotinoSimulator.getMetrics()["commands"]["GetAllRobotinoID"] > fleetPolls
+    ), "Robotinos joined the fleet without a poll of the fleet"
+    for robotino in robotinoManager.fleet:
+        robotino.activateAutoMode()
+    robotinoManager.startAutomatedOperation()
+    startedAt = time.monotonic()
+
+    QTimer.singleShot(int(args.duration * 1000), app.quit)
+    app.exec()
+    duration = time.monotonic() - startedAt
+
+    # each robotino got its own state and the states were published to the IAS-MES
+    updated = [
+        robotino
+        for robotino in robotinoManager.fleet
+        if robotino.robotInfo.robotinoId == robotino.id
+    ]
+    robotinoMetrics = robotinoSimulator.getMetrics()
+    mesMetrics = mesSimulator.getMetrics()
+    managerMetrics = robotinoManager.getMetrics()
+    serverMetrics = robotinoServer.getMetrics()
+    queueMetrics = serverMetrics["commandQueue"]
+    pollMetrics = serverMetrics["statePolls"]
+    robotInfos = robotinoMetrics["commands"].get("GetRobotInfo", 0)
+    print(f"{len(ids)} robotinos (resourceIds {ids[0]}-{ids[-1]}), {duration:.1f} s:")
+    print(f"  robotinos with state: {len(updated)}/{len(ids)}")
+    print(
+        f"  state updates: {robotInfos} ({robotInfos / len(ids) / duration:.2f} per robotino and second)"
+    )
+    print(
+        f"  state poll of the fleet: {pollMetrics['avgPollTime'] * 1000:.1f} ms avg, "
+        + f"{pollMetrics['missingRobotInfos']} missing replies in {pollMetrics['polls']} polls"
+    )
+    print(f"  status records at IAS-MES: {mesMetrics['statusRecords']}")
+    print(f"  transport tasks: {managerMetrics['taskLedger']}")
+    print(
+        f"  pickup latency: {managerMetrics['taskPoller']['avgPickupLatency'] * 1000:.1f} ms avg"
+    )
+    print(
+        f"  command queue: max depth {queueMetrics['maxDepth']}, avg wait {queueMetrics['avgWaitTime'] * 1000:.1f} ms"
+    )
+    print(
+        f"  operations finished by the robotinos: {robotinoMetrics['finishedOperations']}"
+    )
+
+    # stop the tasks and the simulated robotinos first, so no late messages arrive for a fleet which is already cleared
+    fleet = robotinoManager.fleet
+    robotinoManager.stopAutomatedOperation()
+    for robotino in fleet:
+        robotino.stopFlagAutoOperation.set()
+    robotinoSimulator.stop()
+    robotinoServer.stopServer()
+    # the threads have to end before the app is destroyed
+    for robotino in fleet:
+        robotino.wait()
+    robotinoManager.stop()
+    robotinoManager.wait()
+    robotinoServer.wait()
+    mesClient.stopClient()
+    mesClient.wait()
+    mesSimulator.stop()
+
+    finished = managerMetrics["taskLedger"]["finished"]
+    polledRobotInfos = pollMetrics["polls"] * len(ids)
+    assert len(updated) == len(ids), "Not all robotinos got their state"
+    assert finished >= args.min_finished * len(
+        ids
+    ), f"Only {finished} transport tasks were finished"
+    assert (
+        pollMetrics["missingRobotInfos"] <= args.max_missing * polledRobotInfos
+    ), f"{pollMetrics['missingRobotInfos']} of {polledRobotInfos} polled RobotInfos are missing"
+
+
+if __name__ == "__main__":
+    main()
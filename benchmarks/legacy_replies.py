@@ -0,0 +1,107 @@
+"""
+Filename: legacy_replies.py
+Version name: 1.0, 2026-10-17
+Short description: Test of the replies of older fleet software which aren't terminated by a newline. The RobotinoServer
+has to take them as replies after ROBOTINO_REPLY_QUIET_TIME instead of waiting for ROBOTINO_RESPONSE_TIMEOUT. Run
+with "python -m benchmarks.legacy_replies" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import argparse
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from commandserver import robotinoserver
+from commandserver.robotinoserver import RobotinoServer
+from commandserver.robotinosimulator import RobotinoSimulator
+from conf import ROBOTINO_REPLY_QUIET_TIME, ROBOTINO_RESPONSE_TIMEOUT
+from robotinomanager.robotinomanager import RobotinoManager
+
+HOST = "127.0.0.1"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replies without newline of older fleet software"
+    )
+    parser.add_argument(
+        "--robotinos", type=int, default=5, help="number of simulated robotinos"
+    )
+    parser.add_argument(
+        "--first-id", type=int, default=10, help="resourceId of the first robotino"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=10, help="state polls of each robotino"
+    )
+    parser.add_argument(
+        "--selectors", action="store_true", help="serve the connection with selectors"
+    )
+    args = parser.parse_args()
+    ids = list(range(args.first_id, args.first_id + args.robotinos))
+    robotinoserver.ROBOTINO_SERVER_SELECTORS = args.selectors
+
+    app = QCoreApplication([])
+    robotinoServer = RobotinoServer()
+    robotinoServer.ADDR = (HOST, 13000)
+    # only the fleet of the manager is used, so it isn't started
+    robotinoManager = RobotinoManager(mesClient=None, robotinoServer=robotinoServer)
+    robotinoServer.setRobotinoManager(robotinoManager)
+    robotinoServer.start()
+    robotinoSimulator = RobotinoSimulator(ids, host=HOST, legacy=True, seed=1)
+    robotinoSimulator.start()
+
+    # the fleet is created from the AllRobotinoID reply without newline
+    startedAt = time.monotonic()
+    while len(robotinoManager.fleet) != len(ids) and time.monotonic() < startedAt + 10:
+        time.sleep(0.01)
+    fleetTime = time.monotonic() - startedAt
+    fleetIds = [robotino.id for robotino in robotinoManager.fleet]
+
+    # each poll of a single robotino is one command which is answered by a RobotInfo without newline
+    pollTimes = []
+    missing = []
+    for _ in range(args.rounds):
+        for id in ids:
+            startedAt = time.monotonic()
+            missing += robotinoServer.pollRobotInfos(
+                [id], timeout=ROBOTINO_RESPONSE_TIMEOUT
+            )
+            pollTimes.append(time.monotonic() - startedAt)
+    updated = [
+        robotino
+        for robotino in robotinoManager.fleet
+        if robotino.robotInfo.robotinoId == robotino.id
+    ]
+
+    print(
+        f"{len(ids)} robotinos, {'selectors' if args.selectors else 'threads'}, "
+        + f"quiet time {ROBOTINO_REPLY_QUIET_TIME * 1000:.0f} ms:"
+    )
+    print(f"  fleet created after {fleetTime * 1000:.1f} ms")
+    print(
+        f"  state poll of a robotino: {sum(pollTimes) / len(pollTimes) * 1000:.1f} ms avg, "
+        + f"{max(pollTimes) * 1000:.1f} ms max, {len(missing)} missing replies in {len(pollTimes)} polls"
+    )
+
+    robotinoSimulator.stop()
+    robotinoServer.stopServer()
+    robotinoServer.wait()
+    for robotino in robotinoManager.fleet:
+        robotino.wait()
+    robotinoManager.stop()
+
+    # a reply has to be taken long before the timeout of the command
+    maxReplyTime = ROBOTINO_RESPONSE_TIMEOUT / 10
+    assert fleetIds == ids, "Fleet wasn't created with all resourceIds"
+    assert fleetTime < maxReplyTime, f"Fleet was created after {fleetTime:.2f} s"
+    assert len(missing) == 0, f"No reply from Robotinos {missing}"
+    assert len(updated) == len(ids), "Not all robotinos got their state"
+    assert (
+        max(pollTimes) < maxReplyTime
+    ), f"State poll of a robotino took {max(pollTimes):.2f} s"
+
+
+if __name__ == "__main__":
+    main()
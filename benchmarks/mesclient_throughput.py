@@ -0,0 +1,77 @@
+"""
+Filename: mesclient_throughput.py
+Version name: 1.0, 2026-10-17
+Short description: Benchmark of the service request throughput of the MESClient against the local MES simulator.
+Compares lock-step with pipelined requests for different numbers of concurrent callers and injected latencies.
+Run with "python -m benchmarks.mesclient_throughput" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import time
+from threading import Thread
+
+from mescommunicator.connectionpool import ServiceConnectionPool
+from mescommunicator.mesclient import MESClient
+from mescommunicator.messimulator import MESSimulator
+
+HOST = "127.0.0.1"
+DURATION = 2.0
+CALLERS = [1, 4, 16]
+LATENCIES = [0.0, 0.005]
+
+
+def caller(mesClient, robotinoId, deadline, results):
+    requests = 0
+    while time.monotonic() < deadline:
+        if requests % 2 == 0:
+            mesClient.getTransportTasks(4)
+        else:
+            mesClient.setDockingPos(robotinoId % 6, robotinoId)
+        requests += 1
+    results.append(requests)
+
+
+def run(callers, latency, pipelined):
+    simulator = MESSimulator(host=HOST, taskRate=10, latency=latency, seed=1)
+    simulator.start()
+    mesClient = MESClient()
+    mesClient.IP_MES = HOST
+    mesClient.servicePool = ServiceConnectionPool((HOST, 2000), pipelined=pipelined)
+    mesClient._connect()
+    mesClient.serviceSocketIsAlive = True
+    try:
+        results = []
+        deadline = time.monotonic() + DURATION
+        threads = [
+            Thread(target=caller, args=(mesClient, id, deadline, results))
+            for id in range(callers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics = simulator.getMetrics()["services"]
+        return sum(results) / DURATION, metrics
+    finally:
+        mesClient.stopClient()
+        simulator.stop()
+        # give the os time to release the ports
+        time.sleep(0.2)
+
+
+def main():
+    for latency in LATENCIES:
+        print(f"Latency of IAS-MES: {latency * 1000:.0f} ms")
+        for callers in CALLERS:
+            for pipelined in (False, True):
+                throughput, metrics = run(callers, latency, pipelined)
+                serviceTime = metrics.get("200/21", {}).get("p99", 0.0)
+                print(
+                    f"  {callers:2} callers, {'pipelined' if pipelined else 'lock-step'}: {throughput:8.0f} req/s, "
+                    + f"p99 service time 200/21: {serviceTime * 1000:.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Filename: robotinfo_parse.py
+Version name: 1.0, 2026-10-17
+Short description: Benchmark of parsing the RobotInfo messages of the Robotinos. Compares the one-pass parser with the
+former parsing which split the message once per field. Run with "python -m benchmarks.robotinfo_parse" from the root
+of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import timeit
+
+from commandserver.robotinomessages import parseRobotInfo
+
+ROUNDS = 20
+# RobotInfo messages as sent by the Robotinos, the corpus is repeated to get a measurable run time
+CORPUS = [
+    "RobotInfo robotinoid:7 x:-2.951 y:1.747 phi:-21.599 batteryvoltage:23.951 current:1.162 laserwarning:0 "
+    + "lasersafety:0 boxpresent:0 state:IDLE",
+    "RobotInfo robotinoid:1 x:0.512 y:-3.02 phi:90.0 batteryvoltage:24.402 current:2.871 laserwarning:0 "
+    + "lasersafety:0 boxpresent:1 state:BUSY",
+    "RobotInfo robotinoid:3 x:4.25 y:0.003 phi:179.95 batteryvoltage:22.87 current:3.402 laserwarning:1 "
+    + "lasersafety:0 boxpresent:1 state:BUSY",
+    "RobotInfo robotinoid:5 x:-0.75 y:2.5 phi:-45.5 batteryvoltage:23.2 current:0.981 laserwarning:0 "
+    + "lasersafety:1 boxpresent:0 state:ERROR",
+] * 250
+# same messages with another order of the fields, parsed by key instead of position
+REORDERED_CORPUS = [
+    "RobotInfo " + " ".join(reversed(msg.split(" ")[1:])) for msg in CORPUS
+]
+
+
+class State(object):
+    """
+    Target of the former parser with the attributes of the Robotino
+    """
+
+    def __init__(self):
+        self.id = 0
+        self.busy = False
+        self.errorL2 = False
+
+
+def legacyParse(self, msg):
+    """
+    Former implementation (Robotino.fetchStateMsg without logging). Only kept as baseline
+    """
+    self.errorL2 = False
+    strId = msg.split("robotinoid:")
+    self.id = int(strId[1][0])
+    strState = msg.split("state:")
+    if "IDLE" in strState[1]:
+        self.busy = False
+    elif "BUSY" in strState[1]:
+        self.busy = True
+    elif "ERROR" in strState[1]:
+        self.busy = False
+        self.errorL2 = True
+    strBattery = msg.split("batteryvoltage:")
+    strBattery = strBattery[1].split(" ")
+    self.batteryVoltage = float(strBattery[0])
+    strLaserWarning = msg.split("laserwarning:")
+    if len(strLaserWarning) >= 2:
+        strLaserWarning = strLaserWarning[1].split(" ")
+    if "0" in strLaserWarning[0]:
+        self.laserWarning = False
+    elif "1" in strLaserWarning[0]:
+        self.laserWarning = True
+        self.errorL2 = True
+    strLaserSafey = msg.split("lasersafety:")
+    strLaserSafey = strLaserSafey[1].split(" ")
+    if "0" in strLaserSafey[0]:
+        self.laserSaftey = False
+    elif "1" in strLaserSafey[0]:
+        self.laserSaftey = True
+        self.errorL2 = True
+    strBox = msg.split("boxpresent:")
+    strBox = strBox[1].split(" ")
+    if "0" in strBox[0]:
+        self.boxPresent = False
+    elif "1" in strBox[0]:
+        self.boxPresent = True
+    strPosX = msg.split("x:")
+    strPosX = strPosX[1].split(" ")
+    self.positionX = float(strPosX[0])
+    strPosY = msg.split("y:")
+    strPosY = strPosY[1].split(" ")
+    self.positionY = float(strPosY[0])
+    strPosPhi = msg.split("phi:")
+    strPosPhi = strPosPhi[1].split(" ")
+    self.positionPhi = float(strPosPhi[0])
+
+
+def legacyRun():
+    state = State()
+    for msg in CORPUS:
+        legacyParse(state, msg)
+
+
+def parserRun(corpus):
+    for msg in corpus:
+        parseRobotInfo(msg)
+
+
+def main():
+    # both parsers agree on the fields the former parser got right
+    for msg in CORPUS[:4]:
+        assert parseRobotInfo(msg) == parseRobotInfo(
+            "RobotInfo " + " ".join(reversed(msg.split(" ")[1:]))
+        )
+        state = State()
+        legacyParse(state, msg)
+        robotInfo = parseRobotInfo(msg)
+        assert (state.id, state.batteryVoltage, state.positionPhi) == (
+            robotInfo.robotinoId,
+            robotInfo.batteryVoltage,
+            robotInfo.positionPhi,
+        )
+
+    legacy = min(timeit.repeat(legacyRun, number=ROUNDS, repeat=5))
+    parser = min(timeit.repeat(lambda: parserRun(CORPUS), number=ROUNDS, repeat=5))
+    reordered = min(
+        timeit.repeat(lambda: parserRun(REORDERED_CORPUS), number=ROUNDS, repeat=5)
+    )
+    messages = ROUNDS * len(CORPUS)
+    print(f"{len(CORPUS)} RobotInfo messages:")
+    print(f"  legacy split per field:         {messages / legacy:10.0f} msgs/s")
+    print(
+        f"  one-pass parser:                {messages / parser:10.0f} msgs/s, speedup {legacy / parser:.1f}x"
+    )
+    print(
+        f"  one-pass parser, other order:   {messages / reordered:10.0f} msgs/s, speedup {legacy / reordered:.1f}x"
+    )
+    # the former parser read only the first digit of the id and matched "y:" inside "lasersafety:"
+    msg = "RobotInfo robotinoid:12 lasersafety:0 x:1.0 y:2.5 phi:0.0 batteryvoltage:24.0 laserwarning:0 boxpresent:0"
+    state = State()
+    legacyParse(state, msg + " state:IDLE")
+    robotInfo = parseRobotInfo(msg + " state:IDLE")
+    print(f"  id/y of {msg!r}:")
+    print(
+        f"    legacy: {state.id}/{state.positionY}, parser: {robotInfo.robotinoId}/{robotInfo.positionY}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Filename: robotinocommands.py
+Version name: 1.0, 2026-10-17
+Short description: Benchmark of building the command frames to the Robotinos. Compares the CommandBuilder with the
+former conversion into a hex string and bytes.fromhex. Run with "python -m benchmarks.robotinocommands" from the root
+of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import timeit
+
+from commandserver.commandbuilder import CommandBuilder
+
+FLEET_SIZE = 20
+ROUNDS = 20000
+COMMANDS = ["LoadBox", "UnloadBox", "Undock", "GetRobotInfo"]
+
+
+def legacyFrame(request):
+    """
+    Former implementation (strToBin and bytes.fromhex). Only kept as baseline
+    """
+    encodedMsg = ""
+    for i in range(len(request)):
+        # convert character to hex value
+        encodedMsg += str(format(ord(request[i]), "x"))
+    # line of end ascii
+    encodedMsg += "0a"
+    return bytes.fromhex(encodedMsg)
+
+
+def legacyCycle():
+    for resourceId in range(1, FLEET_SIZE + 1):
+        legacyFrame("PushCommand " + str(resourceId) + " LoadBox 0")
+        legacyFrame("PushCommand " + str(resourceId) + " UnloadBox 0")
+        legacyFrame(f"PushCommand {resourceId} Undock")
+        legacyFrame(f"GetRobotInfo {resourceId}")
+
+
+def builderCycle(commandBuilder):
+    for resourceId in range(1, FLEET_SIZE + 1):
+        for command in COMMANDS:
+            commandBuilder.getFrame(command, resourceId)
+
+
+def uncachedCycle(commandBuilder):
+    for resourceId in range(1, FLEET_SIZE + 1):
+        commandBuilder.build("PushCommand " + str(resourceId) + " LoadBox 0")
+        commandBuilder.build("PushCommand " + str(resourceId) + " UnloadBox 0")
+        commandBuilder.build(f"PushCommand {resourceId} Undock")
+        commandBuilder.build(f"GetRobotInfo {resourceId}")
+
+
+def main():
+    commandBuilder = CommandBuilder()
+    # frames of both implementations are identical
+    for resourceId in range(1, FLEET_SIZE + 1):
+        assert commandBuilder.getFrame("LoadBox", resourceId) == legacyFrame(
+            f"PushCommand {resourceId} LoadBox 0"
+        )
+        assert commandBuilder.getFrame("GetRobotInfo", resourceId) == legacyFrame(
+            f"GetRobotInfo {resourceId}"
+        )
+
+    frames = ROUNDS * FLEET_SIZE * len(COMMANDS)
+    legacy = min(timeit.repeat(legacyCycle, number=ROUNDS, repeat=3))
+    uncached = min(
+        timeit.repeat(lambda: uncachedCycle(commandBuilder), number=ROUNDS, repeat=3)
+    )
+    cached = min(
+        timeit.repeat(lambda: builderCycle(commandBuilder), number=ROUNDS, repeat=3)
+    )
+    print(f"{FLEET_SIZE} robotinos, {len(COMMANDS)} commands each:")
+    print(f"  legacy hex string:   {frames / legacy:12.0f} frames/s")
+    print(
+        f"  builder (uncached):  {frames / uncached:12.0f} frames/s, speedup {legacy / uncached:.1f}x"
+    )
+    print(
+        f"  builder (cached):    {frames / cached:12.0f} frames/s, speedup {legacy / cached:.1f}x"
+    )
+    # characters below 0x10 were encoded with a single hex digit
+    try:
+        print(f"  legacy frame of a tab: {legacyFrame(chr(9))!r}")
+    except ValueError as e:
+        print(f"  legacy frame of a tab fails: {e}")
+    print(f"  builder frame of a tab: {commandBuilder.build(chr(9))!r}")
+
+
+if __name__ == "__main__":
+    main()
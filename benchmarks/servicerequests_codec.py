@@ -0,0 +1,122 @@
+"""
+Filename: servicerequests_codec.py
+Version name: 1.0, 2026-10-17
+Short description: Micro-benchmark of the binary codec of the servicerequests. Compares the bytes-native struct codec
+with the former hex string codec. Run with "python -m benchmarks.servicerequests_codec" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import binascii
+import timeit
+
+from mescommunicator.servicerequests import MES_FIELDS, ServiceRequests
+
+ROUNDS = 5000
+
+
+class LegacyHexCodec(ServiceRequests):
+    """
+    Former implementation of the binary format which parses each field to/from a hex string. Only kept as baseline
+    """
+
+    def encodeFrame(self):
+        msg = str(self.tcpIdent)
+        for field in MES_FIELDS:
+            msg += self._parseToEndian(getattr(self, field.attr), field.width == 4)
+        for _ in range(44):
+            msg += "00"
+        for param in self.serviceParams:
+            msg += self._parseToEndian(param, False)
+        return bytes.fromhex(msg)
+
+    def decodeFrame(self, data):
+        self.msg = binascii.hexlify(data).decode()
+        bytes = list((self.msg[i : i + 2] for i in range(0, len(self.msg), 2)))
+        for field in MES_FIELDS:
+            setattr(
+                self,
+                field.attr,
+                self._parseFromEndian(bytes[field.offset : field.offset + field.width]),
+            )
+        for i in range(128, len(bytes), 2):
+            self.serviceParams.append(self._parseFromEndian(bytes[i : i + 2]))
+
+    def _parseToEndian(self, number, isInt32):
+        hex = format(number, "08x") if isInt32 else format(number, "04x")
+        binArray = [hex[i : i + 2] for i in range(0, len(hex), 2)]
+        binStr = ""
+        for i in range(len(binArray) - 1, -1, -1):
+            binStr += binArray[i]
+        return binStr
+
+    def _parseFromEndian(self, bytes):
+        nmbrstr = ""
+        for i in range(len(bytes) - 1, -1, -1):
+            nmbrstr += bytes[i]
+        return int(nmbrstr, 16)
+
+
+class StructCodec(ServiceRequests):
+    def encodeFrame(self):
+        return self.encodeBytes()
+
+    def decodeFrame(self, data):
+        self.decodeBytes(data)
+
+
+def transportTaskResponse(noOfTasks):
+    """
+    Builds a 200/21 response like the IAS-MES sends it with noOfTasks records
+    """
+    response = ServiceRequests()
+    response.getTransportTasks(noOfTasks)
+    for i in range(noOfTasks):
+        response.serviceParams += [i % 7 + 1, 1, 1, 0, (i + 3) % 7 + 1, 2, 1, 0]
+    response.dataLength = 2 * len(response.serviceParams)
+    return response.encodeBytes()
+
+
+SERVICES = {
+    "200/21": lambda codec: codec.getTransportTasks(10),
+    "151/5": lambda codec: codec.moveBuf(7, 3, True),
+    "151/12": lambda codec: codec.delBuf(7),
+    "201/1": lambda codec: codec.setDockingPos(3, 7),
+}
+
+
+def roundTrip(codecClass, setup, response):
+    request = codecClass()
+    setup(request)
+    request.encodeFrame()
+    codecClass().decodeFrame(response)
+
+
+def benchmark():
+    print(
+        f"{'service':<8}{'hex [frames/s]':>16}{'struct [frames/s]':>20}{'speedup':>10}"
+    )
+    for name, setup in SERVICES.items():
+        if name == "200/21":
+            response = transportTaskResponse(10)
+        else:
+            frame = ServiceRequests()
+            setup(frame)
+            response = frame.encodeBytes()
+        results = []
+        for codecClass in (LegacyHexCodec, StructCodec):
+            duration = min(
+                timeit.repeat(
+                    lambda: roundTrip(codecClass, setup, response),
+                    number=ROUNDS,
+                    repeat=5,
+                )
+            )
+            results.append(ROUNDS / duration)
+        print(
+            f"{name:<8}{results[0]:>16.0f}{results[1]:>20.0f}{results[1] / results[0]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
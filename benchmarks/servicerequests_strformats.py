@@ -0,0 +1,144 @@
+"""
+Filename: servicerequests_strformats.py
+Version name: 1.0, 2026-10-17
+Short description: Benchmark of the decode throughput of the full string and shortened string format. Compares the
+schema based decoder with the former substring matching decoder. Run with
+"python -m benchmarks.servicerequests_strformats" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import timeit
+
+from mescommunicator.servicerequests import ServiceRequests
+
+ROUNDS = 5000
+
+# Sample messages of the IAS-MES in full string format
+SAMPLES_FULL = [
+    "444;RequestId=12;MClass=200;MNo=21;DataLength=32;MaxRecords=2;StartId=1;TargetId=5;StartId=3;TargetId=4<CR>",
+    "444;RequestId=13;MClass=151;MNo=5;DataLength=12;ResourceID=7;BufNo=1;BufPos=1<CR>",
+    "444;RequestId=14;MClass=151;MNo=12;ResourceID=7;BufNo=1<CR>",
+    "444;RequestId=15;MClass=201;MNo=1;ResourceID=3;Aux1Int=7<CR>",
+    "444;RequestId=16;MClass=100;MNo=3;ResourceID=2;ONo=1054;OPos=1;WPNo=2;OpNo=210;StepNo=30;ErrorStepNo=4;"
+    + "PNo=110;BoxPNo=25;PalletPNo=31;MainPNo=1100;CarrierID=12;BufNo=2;BufPos=1<CR>",
+]
+# Sample messages of the IAS-MES in shortened string format
+SAMPLES_SHORT = [
+    "445<CR>12<CR>200<CR>21<CR>0<CR>32<CR>"
+    + "0<CR>" * 14
+    + "2<CR>"
+    + "0<CR>" * 12
+    + "1<CR>0<CR>5<CR>0<CR>3<CR>0<CR>4<CR>0<CR>",
+    "445<CR>13<CR>151<CR>5<CR>0<CR>12<CR>7<CR>"
+    + "0<CR>" * 26
+    + "3<CR>1<CR>1<CR>7<CR>1<CR>1<CR>",
+    "445<CR>15<CR>201<CR>1<CR>0<CR>0<CR>3<CR>" + "0<CR>" * 21 + "7<CR>" + "0<CR>" * 4,
+]
+
+
+class LegacyStrDecoder(ServiceRequests):
+    """
+    Former implementation which matches each parameter by substring in a fixed order. Only kept as baseline
+    """
+
+    MATCH_ORDER = [
+        ("RequestId", "requestID"),
+        ("MClass", "mClass"),
+        ("MNo", "mNo"),
+        ("ErrorState", "errorState"),
+        ("DataLength", "dataLength"),
+        ("ResourceID", "resourceId"),
+        ("ONo", "oNo"),
+        ("OPos", "oPos"),
+        ("wpNo", "wpNo"),
+        ("OpNo", "opNo"),
+        ("BufNo", "bufNo"),
+        ("BufPos", "bufPos"),
+        ("CarrierID", "carrierId"),
+        ("PalletID", "palletID"),
+        ("PalletPos", "palletPos"),
+        ("PNo", "pNo"),
+        ("StopperID", "stopperId"),
+        ("ErrorStepNo", "errorStepNo"),
+        ("StepNo", "stepNo"),
+        ("MaxRecords", "maxRecords"),
+        ("BoxID", "boxId"),
+        ("BoxPos", "boxPos"),
+        ("MainOPos", "mainOPos"),
+        ("BeltNo", "beltNo"),
+        ("CNo", "cNo"),
+        ("BoxPNo", "boxPNo"),
+        ("PalletPNo=", "palletPNo"),
+        ("Aux1Int", "aux1Int"),
+        ("Aux2Int", "aux2Int"),
+        ("Aux1DInt", "aux1DInt"),
+        ("Aux2DInt", "aux2DInt"),
+        ("MainPNo", "mainPNo"),
+    ]
+
+    def _decodeStrFull(self):
+        for item in self.msg.split(";"):
+            param = item.split("=")
+            if len(param) == 2 and "<CR>" in param[1]:
+                param[1] = param[1].replace("<CR>", "")
+            if "444" in item or "445" in item:
+                self.tcpIdent = int(item)
+                continue
+            for name, attr in self.MATCH_ORDER:
+                if name in item:
+                    setattr(self, attr, param[1])
+                    break
+            else:
+                self.serviceParams.append((param[0], param[1]))
+
+    def _decodeStrShort(self):
+        bytes = self.msg.split("<CR>")
+        for i, (_, attr) in enumerate(self.MATCH_ORDER):
+            setattr(self, attr, bytes[i + 1])
+        for i in range(33, len(bytes)):
+            self.serviceParams.append(bytes[i])
+
+
+def decodeAll(decoderClass, samples):
+    for sample in samples:
+        decoderClass().decodeMessage(sample)
+
+
+def benchmark():
+    print(
+        f"{'format':<8}{'substring [msgs/s]':>20}{'schema [msgs/s]':>18}{'speedup':>10}"
+    )
+    for name, samples in (("full", SAMPLES_FULL), ("short", SAMPLES_SHORT)):
+        results = []
+        for decoderClass in (LegacyStrDecoder, ServiceRequests):
+            duration = min(
+                timeit.repeat(
+                    lambda: decodeAll(decoderClass, samples), number=ROUNDS, repeat=5
+                )
+            )
+            results.append(ROUNDS * len(samples) / duration)
+        print(
+            f"{name:<8}{results[0]:>20.0f}{results[1]:>18.0f}{results[1] / results[0]:>9.1f}x"
+        )
+
+    # fields which were misattributed by the substring matching
+    legacy, schema = LegacyStrDecoder(), ServiceRequests()
+    legacy.decodeMessage(SAMPLES_FULL[-1])
+    schema.decodeMessage(SAMPLES_FULL[-1])
+    for attr in (
+        "pNo",
+        "boxPNo",
+        "palletPNo",
+        "mainPNo",
+        "stepNo",
+        "errorStepNo",
+        "wpNo",
+    ):
+        print(
+            f"{attr:<12}substring: {str(getattr(legacy, attr)):<6}schema: {getattr(schema, attr)}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,117 @@
+"""
+Filename: statusframe.py
+Version name: 1.0, 2026-10-17
+Short description: Benchmark of the cyclic status messages to the IAS-MES. Compares packing the whole fleet into one
+preallocated frame with the former per-robotino hex strings and numpy.packbits. Run with
+"python -m benchmarks.statusframe" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import timeit
+
+import numpy as np
+
+from mescommunicator.statusframe import StatusFrame
+
+FLEET_SIZES = [5, 50, 200]
+ROUNDS = 2000
+
+
+class State(object):
+    """
+    Minimal Robotino with the attributes of the status record
+    """
+
+    def __init__(self, id):
+        self.id = id
+        self.mesMode = id % 2 == 0
+        self.errorL2 = False
+        self.errorL1 = id % 7 == 0
+        self.errorL0 = False
+        self.reset = False
+        self.busy = id % 3 == 0
+        self.manualMode = False
+        self.autoMode = True
+
+
+class CountingSocket(object):
+    """
+    Socket which only counts the calls, so the benchmark measures the encoding and the number of syscalls
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, data):
+        self.calls += 1
+        return len(data)
+
+    def sendall(self, data):
+        self.calls += 1
+
+
+def legacyCycle(sock, states):
+    """
+    Former implementation which sends each robotino separately. Only kept as baseline
+    """
+    for i in range(len(states)):
+        msg = ""
+        msg += format(states[i].id, "04x")
+        msg += format(2, "02x")
+        statusbits = np.array(
+            [
+                int(states[i].mesMode),
+                int(states[i].errorL2),
+                int(states[i].errorL1),
+                int(states[i].errorL0),
+                int(states[i].reset),
+                int(states[i].busy),
+                int(states[i].manualMode),
+                int(states[i].autoMode),
+            ]
+        )
+        msg += format(np.packbits(statusbits)[0], "02x")
+        sock.send(bytes.fromhex(msg))
+
+
+def packedCycle(sock, states, statusFrame):
+    sock.sendall(statusFrame.pack(states))
+
+
+def main():
+    for fleetSize in FLEET_SIZES:
+        states = [State(id) for id in range(1, fleetSize + 1)]
+        statusFrame = StatusFrame(fleetSize)
+        legacySock, packedSock = CountingSocket(), CountingSocket()
+        # frames of both implementations are identical
+        legacyFrames = []
+        legacySock.send = lambda data: legacyFrames.append(data) or len(data)
+        legacyCycle(legacySock, states)
+        assert b"".join(legacyFrames) == bytes(statusFrame.pack(states))
+        legacySock = CountingSocket()
+
+        legacy = min(
+            timeit.repeat(
+                lambda: legacyCycle(legacySock, states), number=ROUNDS, repeat=5
+            )
+        )
+        packed = min(
+            timeit.repeat(
+                lambda: packedCycle(packedSock, states, statusFrame),
+                number=ROUNDS,
+                repeat=5,
+            )
+        )
+        print(f"{fleetSize} robotinos:")
+        print(
+            f"  legacy: {ROUNDS / legacy:10.0f} cycles/s, {legacySock.calls // (5 * ROUNDS)} sends/cycle"
+        )
+        print(
+            f"  packed: {ROUNDS / packed:10.0f} cycles/s, {packedSock.calls // (5 * ROUNDS)} sends/cycle"
+        )
+        print(f"  speedup: {legacy / packed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Filename: commandbuilder.py
+Version name: 1.0, 2026-10-17
+Short description: builds the ready-to-send frames of the commands to the robotinos
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+
+# commands which only depend on the resourceId of the robotino. {} is replaced by the resourceId
+STATIC_COMMANDS = {
+    "LoadBox": "PushCommand {} LoadBox 0",
+    "UnloadBox": "PushCommand {} UnloadBox 0",
+    "DockTo": "PushCommand {} DockTo 1",
+    "Undock": "PushCommand {} Undock",
+    "ThankYou": "PushCommand {} Thank You",
+    "GetRobotInfo": "GetRobotInfo {}",
+    "EndTask": "EndTask {}",
+    "GetAllRobotinoID": "GetAllRobotinoID",
+}
+
+
+def encodeCommand(request):
+    """
+    Encodes a command into a frame which can be sent to the Robotino
+
+    Args:
+        request (str): the command without line ending
+
+    Returns:
+        bytes: the utf-8 encoded command terminated by a newline
+    """
+    return request.encode("utf-8") + b"\n"
+
+
+def getResourceIds(frame):
+    """
+    Gets the resourceIds of the robotinos which the commands of a frame are for. The replies of the Robotinos carry
+    the same resourceId, except the reply to GetAllRobotinoID which has none
+
+    Args:
+        frame (bytes): frame of one or several commands
+
+    Returns:
+        list: resourceId (int) of each command. 0 for commands which aren't robotino specific
+    """
+    resourceIds = []
+    for command in frame.splitlines():
+        tokens = command.split(maxsplit=2)
+        resourceIds.append(
+            int(tokens[1]) if len(tokens) >= 2 and tokens[1].isdigit() else 0
+        )
+    return resourceIds
+
+
+class CommandBuilder(object):
+    """
+    Builds the frames of the commands to the Robotinos as bytes. The frames of the static commands (see
+    STATIC_COMMANDS) are encoded once per Robotino and cached, because they are sent over and over again (e.g.
+    GetRobotInfo on each state update)
+    """
+
+    def __init__(self):
+        # (command, resourceId) -> frame
+        self.frames = {}
+        # (command, resourceIds) -> frame of the batch
+        self.batches = {}
+        # metrics
+        self.hits = 0
+        self.misses = 0
+
+    def getFrame(self, command, resourceId=0):
+        """
+        Gets the frame of a static command
+
+        Args:
+            command (str): name of the command, see STATIC_COMMANDS
+            resourceId (int, optional): ResourceId of the robotino which the command is for
+
+        Returns:
+            bytes: the frame
+        """
+        key = (command, resourceId)
+        frame = self.frames.get(key)
+        if frame == None:
+            frame = encodeCommand(STATIC_COMMANDS[command].format(resourceId))
+            self.frames[key] = frame
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def getBatchFrame(self, command, resourceIds):
+        """
+        Gets one frame with a static command for each Robotino, so the commands for the whole fleet are sent with one
+        send (e.g. GetRobotInfo on each state update). The batch is cached as long as the fleet doesn't change
+
+        Args:
+            command (str): name of the command, see STATIC_COMMANDS
+            resourceIds (list): ResourceIds of the robotinos which the command is for
+
+        Returns:
+            bytes: the frames of the commands one after another
+        """
+        key = (command, tuple(resourceIds))
+        frame = self.batches.get(key)
+        if frame == None:
+            frame = b"".join(
+                self.getFrame(command, resourceId) for resourceId in resourceIds
+            )
+            # only the batch of the current fleet is kept
+            self.batches = {key: frame}
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def build(self, request):
+        """
+        Builds the frame of a command with arguments which change from call to call (e.g. the target of GoToPosition)
+
+        Args:
+            request (str): the command without line ending
+
+        Returns:
+            bytes: the frame
+        """
+        return encodeCommand(request)
+
+    def getMetrics(self):
+        """
+        Returns:
+            dict: number of cached frames, cache hits and cache misses
+        """
+        return {
+            "cachedFrames": len(self.frames),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,185 @@
+"""
+Filename: commandqueue.py
+Version name: 1.0, 2026-10-17
+Short description: thread-safe queue of the commands which are sent to the robotinos
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import time
+from collections import deque
+from threading import Condition
+
+
+class CommandQueue(object):
+    """
+    Queues the commands for the Robotinos with one FIFO per Robotino. Producers enqueue without blocking. The
+    connections of the RobotinoServer take the commands in the order they were enqueued, but a Robotino whose previous
+    command is still in flight on a connection is skipped until it is answered, so the commands of one Robotino are
+    never reordered or interleaved across connections. Commands with priority (e.g. the state poll of the fleet) have
+    their own lane which is served before the other commands. Measures the queue depth and the wait time of the
+    commands
+    """
+
+    def __init__(self):
+        self.condition = Condition()
+        # resourceId of robotino (0 if the command isn't robotino specific) -> deque of (frame, enqueuedAt)
+        self.queues = {}
+        # order in which the robotinos enqueued their commands. A robotino can be listed once per queued command
+        self.order = deque()
+        # lane of the commands with priority, same layout as queues and order
+        self.priorityQueues = {}
+        self.priorityOrder = deque()
+        # robotinos whose command is sent but not answered yet
+        self.inFlight = set()
+        self.depth = 0
+        self.isClosed = False
+        # called after a command was enqueued, e.g. to wake up a selector
+        self.onPut = None
+        # metrics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.coalesced = 0
+        self.maxDepth = 0
+        self.totalWaitTime = 0.0
+        self.maxWaitTime = 0.0
+        self.lastWaitTime = 0.0
+
+    def put(self, command, robotinoId=0, coalesce=False, priority=False):
+        """
+        Enqueues a command
+
+        Args:
+            command (bytes): the frame of the command
+            robotinoId (int, optional): resourceId of the robotino which the command is for
+            coalesce (bool, optional): If the command is dropped when the same command of the robotino is still
+                                       queued. Used for polls, so they don't pile up while no Robotino is connected
+            priority (bool, optional): If the command is sent before the commands without priority
+        """
+        queues, order = (
+            (self.priorityQueues, self.priorityOrder)
+            if priority
+            else (self.queues, self.order)
+        )
+        with self.condition:
+            queue = queues.setdefault(robotinoId, deque())
+            if coalesce:
+                for queuedCommand, _ in queue:
+                    if queuedCommand == command:
+                        self.coalesced += 1
+                        return
+            queue.append((command, time.monotonic()))
+            order.append(robotinoId)
+            self.depth += 1
+            self.enqueued += 1
+            self.maxDepth = max(self.maxDepth, self.depth)
+            self.condition.notify()
+            onPut = self.onPut
+        if onPut != None:
+            onPut()
+
+    def get(self, timeout=None):
+        """
+        Takes the oldest command with priority, otherwise the oldest command, of a robotino which has no command in
+        flight. The robotino stays in flight until setDone is called
+
+        Args:
+            timeout (float, optional): max time to wait for a command (in seconds). Waits forever if None
+
+        Returns:
+            int, bytes: resourceId of the robotino and the frame of the command. (None, None) if the timeout passed or
+                        the queue is closed
+        """
+        deadline = None if timeout == None else time.monotonic() + timeout
+        with self.condition:
+            while not self.isClosed:
+                for queues, order in (
+                    (self.priorityQueues, self.priorityOrder),
+                    (self.queues, self.order),
+                ):
+                    for index, robotinoId in enumerate(order):
+                        if robotinoId not in self.inFlight:
+                            del order[index]
+                            return robotinoId, self._pop(queues, robotinoId)
+                remaining = None if deadline == None else deadline - time.monotonic()
+                if remaining != None and remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            return None, None
+
+    def setDone(self, robotinoId):
+        """
+        Marks the command of a robotino as answered, so its next command can be taken
+        """
+        with self.condition:
+            self.inFlight.discard(robotinoId)
+            self.condition.notify_all()
+
+    def setWakeUp(self, callback):
+        """
+        Sets a callback which is called after a command was enqueued
+
+        Args:
+            callback (callable): callback without args or None to remove it
+        """
+        self.onPut = callback
+
+    def isEmpty(self):
+        return self.depth == 0
+
+    def close(self):
+        """
+        Wakes up all waiting connections. get returns (None, None) afterwards
+        """
+        with self.condition:
+            self.isClosed = True
+            self.condition.notify_all()
+
+    def open(self):
+        with self.condition:
+            self.isClosed = False
+            self.inFlight.clear()
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the queue
+
+        Returns:
+            dict: current and max queue depth, depth of each robotino and of the priority lane, number of enqueued, sent
+                  and coalesced commands
+                  and wait time of the commands in the queue (in seconds)
+        """
+        with self.condition:
+            return {
+                "depth": self.depth,
+                "maxDepth": self.maxDepth,
+                "depthPerRobotino": {
+                    id: len(queue) for id, queue in self.queues.items() if queue
+                },
+                "priorityDepth": sum(
+                    len(queue) for queue in self.priorityQueues.values()
+                ),
+                "inFlight": len(self.inFlight),
+                "enqueued": self.enqueued,
+                "dequeued": self.dequeued,
+                "coalesced": self.coalesced,
+                "avgWaitTime": self.totalWaitTime / self.dequeued
+                if self.dequeued
+                else 0.0,
+                "maxWaitTime": self.maxWaitTime,
+                "lastWaitTime": self.lastWaitTime,
+            }
+
+    def _pop(self, queues, robotinoId):
+        """
+        Must be called while holding the condition
+        """
+        command, enqueuedAt = queues[robotinoId].popleft()
+        self.inFlight.add(robotinoId)
+        self.depth -= 1
+        self.dequeued += 1
+        waitTime = time.monotonic() - enqueuedAt
+        self.totalWaitTime += waitTime
+        self.maxWaitTime = max(self.maxWaitTime, waitTime)
+        self.lastWaitTime = waitTime
+        return command
@@ -0,0 +1,104 @@
+"""
+Filename: messageframer.py
+Version name: 1.0, 2026-10-17
+Short description: splits the byte stream of a robotino connection into newline-delimited messages
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+from conf import appLogger
+
+# max length of a message. A longer line is dropped so a missing newline can't grow the buffer forever
+MAX_MESSAGE_LENGTH = 65536
+
+
+class MessageFramer(object):
+    """
+    Incremental framer for the text messages of the Robotinos which are terminated by a newline. Bytes of an incomplete
+    message are kept until the rest arrives, so a message split across several reads (e.g. a long AllRobotinoID list)
+    or several messages in one read (e.g. RobotInfo and CommandInfo) are framed correctly
+    """
+
+    def __init__(self, maxLength=MAX_MESSAGE_LENGTH):
+        """
+        Args:
+            maxLength (int, optional): Max length of a message in bytes
+        """
+        self.maxLength = maxLength
+        self.buffer = bytearray()
+        # metrics
+        self.messages = 0
+        self.bytesReceived = 0
+        self.dropped = 0
+
+    def feed(self, data):
+        """
+        Adds received bytes to the buffer and frames all complete messages
+
+        Args:
+            data (bytes): received bytes
+
+        Returns:
+            list: complete messages (str) without line ending in the order they were received. Empty lines are skipped
+        """
+        self.bytesReceived += len(data)
+        # only the new bytes can contain the end of a message
+        start = len(self.buffer)
+        self.buffer += data
+        messages = []
+        lineStart = 0
+        end = self.buffer.find(b"\n", start)
+        while end != -1:
+            line = self.buffer[lineStart:end].rstrip(b"\r")
+            if line:
+                messages.append(line.decode("utf-8", errors="replace"))
+            lineStart = end + 1
+            end = self.buffer.find(b"\n", lineStart)
+        del self.buffer[:lineStart]
+        if len(self.buffer) > self.maxLength:
+            appLogger.warning(
+                f"Dropped message of robotino which exceeds {self.maxLength} bytes"
+            )
+            self.buffer.clear()
+            self.dropped += 1
+        self.messages += len(messages)
+        return messages
+
+    def flush(self):
+        """
+        Takes the incomplete message, e.g. a reply without newline of an older fleet software after the reply timed out
+
+        Returns:
+            list: the incomplete message (str) or an empty list if there is none
+        """
+        line = bytes(self.buffer).rstrip(b"\r")
+        self.buffer.clear()
+        if not line:
+            return []
+        self.messages += 1
+        return [line.decode("utf-8", errors="replace")]
+
+    def isEmpty(self):
+        """
+        Returns:
+            bool: If there is no incomplete message
+        """
+        return len(self.buffer) == 0
+
+    def reset(self):
+        """
+        Drops an incomplete message, e.g. after a reconnect
+        """
+        self.buffer.clear()
+
+    def getMetrics(self):
+        """
+        Returns:
+            dict: number of framed messages, received bytes, dropped messages and bytes of the incomplete message
+        """
+        return {
+            "messages": self.messages,
+            "bytesReceived": self.bytesReceived,
+            "dropped": self.dropped,
+            "pending": len(self.buffer),
+        }
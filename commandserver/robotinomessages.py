@@ -0,0 +1,187 @@
+"""
+Filename: robotinomessages.py
+Version name: 1.0, 2026-10-17
+Short description: parser of the messages which the robotinos send to the robotinoserver
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import re
+from collections import namedtuple
+
+# "key: value" pairs of a message. The space after the colon is optional
+FIELD_PATTERN = re.compile(r"(\w+):\s*(\S+)")
+# resourceId of the robotino in a message, can have several digits
+ROBOTINOID_PATTERN = re.compile(r"robotinoid:\s*(\d+)", re.IGNORECASE)
+# resourceIds of an AllRobotinoID message
+ID_LIST_PATTERN = re.compile(r"\d+")
+# order of the fields in the RobotInfo messages of the Robotinos. Messages with this layout are parsed without lookups
+ROBOTINFO_LAYOUT = [
+    "robotinoid",
+    "x",
+    "y",
+    "phi",
+    "batteryvoltage",
+    "current",
+    "laserwarning",
+    "lasersafety",
+    "boxpresent",
+    "state",
+]
+
+
+class RobotInfo(
+    namedtuple(
+        "RobotInfo",
+        [
+            "robotinoId",
+            "state",
+            "batteryVoltage",
+            "current",
+            "laserWarning",
+            "laserSafety",
+            "boxPresent",
+            "positionX",
+            "positionY",
+            "positionPhi",
+        ],
+        defaults=(0, "", 0.0, 0.0, False, False, False, 0.0, 0.0, 0.0),
+    )
+):
+    """
+    Immutable record of the telemetry of a Robotino from a RobotInfo message. Has no instance dict, the fields are
+    stored in the tuple
+    """
+
+    __slots__ = ()
+
+
+def getRobotinoId(msg):
+    """
+    Extracts the resourceId of the Robotino from a message (e.g. CommandInfo or RobotInfo)
+
+    Args:
+        msg (str): message of the Robotino
+
+    Returns:
+        int: resourceId of the robotino. 0 if the message has no robotinoid
+    """
+    match = ROBOTINOID_PATTERN.search(msg)
+    if match == None:
+        return 0
+    return int(match.group(1))
+
+
+def getAllRobotinoIds(msg):
+    """
+    Extracts the resourceIds of the active Robotinos from an AllRobotinoID message (e.g. "AllRobotinoID 7,12,13")
+
+    Args:
+        msg (str): the AllRobotinoID message
+
+    Returns:
+        list: resourceIds (int) in the order of the message
+    """
+    idList = msg.split("AllRobotinoID", 1)
+    if len(idList) < 2:
+        return []
+    return [int(id) for id in ID_LIST_PATTERN.findall(idList[1])]
+
+
+def parseCommandInfo(msg):
+    """
+    Splits a CommandInfo message into the id and the state. The state is the text in the first pair of quotes
+
+    Args:
+        msg (str): the CommandInfo message
+
+    Returns:
+        int: resourceId of the robotino from which the command info comes. 0 if the message has no robotinoid
+        str: state message of the command info. Empty if the message has none
+    """
+    robotinoId = getRobotinoId(msg)
+    if robotinoId == 0:
+        return 0, ""
+    state = msg.split('"')
+    if len(state) >= 2:
+        return robotinoId, state[1]
+    return robotinoId, ""
+
+
+def parseFields(msg):
+    """
+    Extracts all "key: value" pairs of a message in one pass
+
+    Args:
+        msg (str): message of the Robotino
+
+    Returns:
+        dict: lowercase key -> value (str)
+    """
+    return {key.lower(): value for key, value in FIELD_PATTERN.findall(msg)}
+
+
+def parseRobotInfo(msg):
+    """
+    Parses a RobotInfo message in one pass. The message is split into tokens once. If the fields have the usual order
+    (see ROBOTINFO_LAYOUT) the values are taken by position, otherwise they are looked up by key. FIELD_PATTERN is
+    only used if the tokens don't pair up
+
+    Args:
+        msg (str): the RobotInfo message. Fields which are missing keep the defaults of RobotInfo
+
+    Returns:
+        RobotInfo: the telemetry of the Robotino
+
+    Raises:
+        ValueError: The message has no robotinoid or a field has an invalid value
+    """
+    # "RobotInfo robotinoid: 7 x: -2.951 ..." -> ["RobotInfo", "robotinoid", "7", "x", "-2.951", ...]
+    tokens = msg.replace(":", " ").split()
+    if tokens[1::2] == ROBOTINFO_LAYOUT:
+        (
+            robotinoId,
+            x,
+            y,
+            phi,
+            batteryVoltage,
+            current,
+            laserWarning,
+            laserSafety,
+            boxPresent,
+            state,
+        ) = tokens[2::2]
+        return tuple.__new__(
+            RobotInfo,
+            (
+                int(robotinoId),
+                state,
+                float(batteryVoltage),
+                float(current),
+                laserWarning == "1",
+                laserSafety == "1",
+                boxPresent == "1",
+                float(x),
+                float(y),
+                float(phi),
+            ),
+        )
+
+    # fields in another order are paired up by the tokens as well. Values with spaces misalign the pairs
+    fields = dict(zip(tokens[1::2], tokens[2::2])) if len(tokens) % 2 == 1 else {}
+    if "robotinoid" not in fields:
+        fields = parseFields(msg)
+    if "robotinoid" not in fields:
+        raise ValueError(f"RobotInfo without robotinoid: {msg}")
+    return RobotInfo(
+        robotinoId=int(fields["robotinoid"]),
+        state=fields.get("state", ""),
+        batteryVoltage=float(fields.get("batteryvoltage", 0.0)),
+        current=float(fields.get("current", 0.0)),
+        laserWarning=fields.get("laserwarning") == "1",
+        laserSafety=fields.get("lasersafety") == "1",
+        boxPresent=fields.get("boxpresent") == "1",
+        positionX=float(fields.get("x", 0.0)),
+        positionY=float(fields.get("y", 0.0)),
+        positionPhi=float(fields.get("phi", 0.0)),
+    )
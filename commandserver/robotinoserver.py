@@ -8,11 +8,28 @@ Short description: tcp server to receive and send commands to robotino
 """
 
 
+import select
+import selectors
 import socket
-from threading import Thread, Event, Lock
+import time
+from collections import deque
+from threading import Condition, Thread, Event
 from PySide6.QtCore import QThread, Signal
 
-from conf import IP_FLEETIAS, TCP_BUFF_SIZE, appLogger
+from .commandbuilder import CommandBuilder, getResourceIds
+from .commandqueue import CommandQueue
+from .messageframer import MessageFramer
+from .robotinomessages import getRobotinoId, parseCommandInfo, parseRobotInfo
+from conf import (
+    IP_FLEETIAS,
+    ROBOTINO_IDLE_READ_INTERVAL,
+    ROBOTINO_REPLY_QUIET_TIME,
+    ROBOTINO_RESPONSE_TIMEOUT,
+    ROBOTINO_SERVER_SELECTORS,
+    ROBOTINO_STATE_POLL_TIMEOUT,
+    TCP_BUFF_SIZE,
+    appLogger,
+)
 
 
 class RobotinoServer(QThread):
@@ -31,14 +48,25 @@ class RobotinoServer(QThread):
         self.SERVER = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.SERVER.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.stopFlag = Event()
-        self.lock = Lock()
-        # messages
-        self.encodedMsg = ""
+        # commands which are sent to the robotinos
+        self.commandBuilder = CommandBuilder()
+        self.commandQueue = CommandQueue()
+        # socket which wakes up the selector when a command is queued (only in selector mode)
+        self.wakeUpSocket = None
+        # resourceIds of the robotinos whose RobotInfo is awaited by a state poll
+        self.pendingRobotInfos = set()
+        self.robotInfoReceived = Condition()
+        # metrics of the state polls
+        self.statePolls = 0
+        self.missingRobotInfos = 0
+        self.totalPollTime = 0.0
+        self.lastPollTime = 0.0
         # robotinomanager for delegating messages to be handled
         self.robotinoManager = None
 
     def run(self):
         self.stopFlag.clear()
+        self.commandQueue.open()
         self.SERVER = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.SERVER.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         appLogger.info("Robotinoserver started")
@@ -46,7 +74,10 @@ class RobotinoServer(QThread):
         try:
             self.SERVER.bind(self.ADDR)
             self.SERVER.listen()
-            self.waitForConnection()
+            if ROBOTINO_SERVER_SELECTORS:
+                self.serveConnections()
+            else:
+                self.waitForConnection()
         except Exception as e:
             appLogger.warning(e)
 
@@ -72,105 +103,363 @@ class RobotinoServer(QThread):
         Args:
             client (Client): Socket of the Robotino
         """
-        while not self.stopFlag.is_set():
-            if len(self.robotinoManager.fleet) == 0 and self.encodedMsg == "":
+        framer = MessageFramer()
+        isConnected = True
+        while isConnected and not self.stopFlag.is_set():
+            if len(self.robotinoManager.fleet) == 0 and self.commandQueue.isEmpty():
                 self.getAllRobotinoID()
-            elif self.encodedMsg != "":
-                data = bytes.fromhex(self.encodedMsg)
+            robotinoId, frame = self.commandQueue.get(timeout=ROBOTINO_IDLE_READ_INTERVAL)
+            if frame != None:
                 try:
-                    client.send(data)
-                    self.encodedMsg = ""
-                    response = client.recv(TCP_BUFF_SIZE)
-
-                    if response:
-                        response = response.decode("utf-8")
-                        # print(response)
-                        # -------------------- Error handling ------------------------
-                        # station doesnt respond when loading/unloading carrier
-                        if "error" in response.lower():
-                            _, id = self._parseCommandInfo(response)
-                            # Give Robotino error msgs
-                            if self.robotinoManager != None:
-                                self.robotinoManager.setCommandInfo(response)
-                            errMsg = ""
-                            if (
-                                "loadbox" in response.lower()
-                                and "station" in response.lower()
-                            ):
-                                errMsg = (
-                                    "Error while loading carrier: Station didn't respond"
-                                )
-                                appLogger.error(errMsg)
-                            elif (
-                                "unloadbox" in response.lower()
-                                and "station" in response.lower()
-                            ):
-                                errMsg = (
-                                    "Error while unloading Carrier: Station didn't respond"
-                                )
-                            # robotino tries to undock but isnt docked
-                            elif "docked" in response.lower():
-                                errMsg = "Error while undocking from resource: Robotino isn't docked"
-                            # robotino tries to dock but didnt find markers to dock
-                            elif "station" in response.lower():
-                                errMsg = "Error while docking to resource: Robotino couldn't find markers to dock"
-                            # robotino tries to drive to resource but path is blocked
-                            elif "path" in response.lower():
-                                errMsg = "Error while driving to resource: Path is blocked"
-                            # robotino tries to load carrier, but a carrier is already present on robotino
-                            elif "loadbox" in response.lower():
-                                errMsg = "Error while loading carrier: A carrier is already present on carrier"
-                            elif "unloadbox" in response.lower():
-                                errMsg = "Error while unloading carrier: After finishing operation the box is still present"
-                            # robotino tries to load carrier, but didnt get a carrier from station
-                            elif "present" in response.lower():
-                                errMsg = "Error while unloading carrier: Robotino hasn't a box present"
-                            elif "loadbox" in response.lower() and "no_box" in response.lower():
-                                errMsg = "Error while loading carrier: Carrier was not sucessfully loaded"
-                            else:
-                                print(f"Unclassified error occured: {response}")
-
-                            self.errorSignal.emit(errMsg, id)
-                            appLogger.error(errMsg)
-                            self.endTask(id)
-
-                        # -------- Handling responses from commands -----------
-                        # response from commandexecution
-                        if "commandinfo" in response.lower():
-                            if self.robotinoManager != None:
-                                self.robotinoManager.setCommandInfo(response)
-                        # fetch state message
-                        elif "robotinfo" in response.lower():
-                            strId = response.split("robotinoid:")
-                            id = int(strId[1][0])
-                            if self.robotinoManager != None:
-                                robotino = self.robotinoManager.getRobotino(id)
-                                robotino.fetchStateMsg(response)
-                        # create/update fleet
-                        elif "allrobotinoid" in response.lower():
-                            if self.robotinoManager != None:
-                                self.robotinoManager.createFleet(response)
-                        # print out response which isnt handled when received
-                        else:
-                            appLogger.error(
-                                "Catched unhandled response from robotino: " + str(response)
-                            )
+                    client.sendall(frame)
+                    # command is answered when a message of its robotino arrived. Messages of other robotinos which
+                    # were pushed in between are only dispatched. A batch of commands is answered by one message per
+                    # command, which are dispatched as they arrive. An incomplete message is taken as reply when the
+                    # robotino stays quiet for ROBOTINO_REPLY_QUIET_TIME
+                    awaited, deadline = self._getAwaitedReplies(frame)
+                    quietAt = deadline
+                    while len(awaited) != 0:
+                        wakeUpAt = deadline if framer.isEmpty() else min(deadline, quietAt)
+                        remaining = max(wakeUpAt - time.monotonic(), 0)
+                        readable, _, _ = select.select([client], [], [], remaining)
+                        if len(readable) == 0:
+                            if time.monotonic() >= deadline:
+                                self._onReplyTimeout(framer, awaited)
+                                break
+                            self._flushIncomplete(framer, awaited)
+                            continue
+                        response = client.recv(TCP_BUFF_SIZE)
+                        if not response:
+                            isConnected = False
+                            break
+                        quietAt = time.monotonic() + ROBOTINO_REPLY_QUIET_TIME
+                        messages = framer.feed(response)
+                        self._removeAnswered(awaited, messages)
+                        self._dispatchMessages(messages)
                 except Exception as e:
-                    print(e)
+                    appLogger.error(f"Couldn't send command to robotino {robotinoId}: {e}")
+                finally:
+                    # next command of the robotino can be sent
+                    self.commandQueue.setDone(robotinoId)
+            else:
+                # dispatch messages which the robotino pushed between the commands, e.g. CommandInfo
+                try:
+                    readable, _, _ = select.select([client], [], [], 0)
+                    if len(readable) != 0:
+                        response = client.recv(TCP_BUFF_SIZE)
+                        if not response:
+                            isConnected = False
+                        self._dispatchMessages(framer.feed(response))
+                except OSError as e:
+                    appLogger.error(e)
+                    isConnected = False
+        client.close()
+        appLogger.info("Robotino disconnected from socket")
+
+    def serveConnections(self):
+        """
+        Serves all connections of the Robotinos from one thread. A selector waits until a connection is readable or a
+        command is queued, so idle connections don't use any CPU
+        """
+        selector = selectors.DefaultSelector()
+        wakeUpReader, self.wakeUpSocket = socket.socketpair()
+        wakeUpReader.setblocking(False)
+        self.wakeUpSocket.setblocking(False)
+        self.SERVER.setblocking(False)
+        selector.register(self.SERVER, selectors.EVENT_READ)
+        selector.register(wakeUpReader, selectors.EVENT_READ)
+        self.commandQueue.setWakeUp(self._wakeUp)
+        # connections which can send the next command
+        idleClients = deque()
+        # client -> (resourceId of robotino whose command is in flight on the connection, awaited replies, deadline)
+        inFlight = {}
+        # client -> time when the incomplete message of a connection with a command in flight is taken as reply
+        quietAt = {}
+        # client -> MessageFramer of the connection
+        framers = {}
+        try:
+            while not self.stopFlag.is_set():
+                # send the queued commands to the idle connections
+                while len(idleClients) != 0:
+                    if len(self.robotinoManager.fleet) == 0 and self.commandQueue.isEmpty():
+                        self.getAllRobotinoID()
+                    robotinoId, frame = self.commandQueue.get(timeout=0)
+                    if frame == None:
+                        break
+                    client = idleClients.popleft()
+                    try:
+                        client.sendall(frame)
+                        awaited, deadline = self._getAwaitedReplies(frame)
+                        inFlight[client] = (robotinoId, awaited, deadline)
+                    except OSError as e:
+                        appLogger.error(e)
+                        self.commandQueue.setDone(robotinoId)
+                        self._closeClient(selector, client)
+
+                timeout = 1
+                for _, _, deadline in inFlight.values():
+                    timeout = min(timeout, max(deadline - time.monotonic(), 0))
+                for client in quietAt:
+                    timeout = min(timeout, max(quietAt[client] - time.monotonic(), 0))
+                for key, _ in selector.select(timeout=timeout):
+                    if key.fileobj == self.SERVER:
+                        try:
+                            client, addr = self.SERVER.accept()
+                        except BlockingIOError:
+                            continue
+                        appLogger.info(f"{addr} connected to socket")
+                        client.setblocking(True)
+                        selector.register(client, selectors.EVENT_READ)
+                        framers[client] = MessageFramer()
+                        idleClients.append(client)
+                    elif key.fileobj == wakeUpReader:
+                        try:
+                            wakeUpReader.recv(TCP_BUFF_SIZE)
+                        except BlockingIOError:
+                            pass
+                    else:
+                        client = key.fileobj
+                        try:
+                            response = client.recv(TCP_BUFF_SIZE)
+                        except OSError:
+                            response = b""
+                        if not response:
+                            quietAt.pop(client, None)
+                            if client in inFlight:
+                                self.commandQueue.setDone(inFlight.pop(client)[0])
+                            if client in idleClients:
+                                idleClients.remove(client)
+                            del framers[client]
+                            self._closeClient(selector, client)
+                            continue
+                        messages = framers[client].feed(response)
+                        # command is answered when the messages of its robotinos arrived. Messages on an idle
+                        # connection or of other robotinos were pushed by the robotinos between the commands
+                        if client in inFlight:
+                            robotinoId, awaited, _ = inFlight[client]
+                            self._removeAnswered(awaited, messages)
+                            if len(awaited) == 0:
+                                del inFlight[client]
+                                quietAt.pop(client, None)
+                                self.commandQueue.setDone(robotinoId)
+                                idleClients.append(client)
+                            elif not framers[client].isEmpty():
+                                quietAt[client] = time.monotonic() + ROBOTINO_REPLY_QUIET_TIME
+                            else:
+                                quietAt.pop(client, None)
+                        self._dispatchMessages(messages)
+
+                # incomplete replies of robotinos which stayed quiet and commands which weren't answered in time
+                now = time.monotonic()
+                for client, (robotinoId, awaited, deadline) in list(inFlight.items()):
+                    if deadline <= now:
+                        self._onReplyTimeout(framers[client], awaited)
+                    elif quietAt.get(client, deadline) <= now:
+                        self._flushIncomplete(framers[client], awaited)
+                    else:
+                        continue
+                    quietAt.pop(client, None)
+                    if deadline <= now or len(awaited) == 0:
+                        del inFlight[client]
+                        self.commandQueue.setDone(robotinoId)
+                        idleClients.append(client)
+        except Exception as e:
+            appLogger.error(e)
+        finally:
+            self.commandQueue.setWakeUp(None)
+            for robotinoId, _, _ in inFlight.values():
+                self.commandQueue.setDone(robotinoId)
+            for key in list(selector.get_map().values()):
+                if key.fileobj != self.SERVER:
+                    key.fileobj.close()
+            selector.close()
+            self.wakeUpSocket.close()
+            self.wakeUpSocket = None
+
+    def _wakeUp(self):
+        """
+        Wakes up the selector of serveConnections
+        """
+        wakeUpSocket = self.wakeUpSocket
+        if wakeUpSocket != None:
+            try:
+                wakeUpSocket.send(b"\0")
+            except OSError:
+                # buffer is full, so the selector is already woken up
+                pass
+
+    def _closeClient(self, selector, client):
+        selector.unregister(client)
+        client.close()
+        appLogger.info("Robotino disconnected from socket")
+
+    def _getAwaitedReplies(self, frame):
+        """
+        Gets the replies which answer the commands of a frame
+
+        Args:
+            frame (bytes): the sent frame
+
+        Returns:
+            dict: resourceId of robotino -> number of awaited replies
+            float: deadline for the replies. A batch of commands is answered within ROBOTINO_STATE_POLL_TIMEOUT
+        """
+        awaited = {}
+        for resourceId in getResourceIds(frame):
+            awaited[resourceId] = awaited.get(resourceId, 0) + 1
+        timeout = ROBOTINO_RESPONSE_TIMEOUT if sum(awaited.values()) == 1 else ROBOTINO_STATE_POLL_TIMEOUT
+        return awaited, time.monotonic() + timeout
 
-    def strToBin(self, request):
+    def _removeAnswered(self, awaited, messages):
         """
-        Converts the string to binary which the server can send
+        Removes the replies which arrived from the awaited replies. The robotinos push their messages with robotinoid,
+        so a message without one is the reply of an older fleet software to the first awaited command
 
         Args:
-            request (str): The message to convert
+            awaited (dict): resourceId of robotino -> number of awaited replies in the order of the commands
+            messages (list): the received messages (str)
+        """
+        for message in messages:
+            resourceId = getRobotinoId(message)
+            if resourceId == 0 and len(awaited) != 0:
+                resourceId = next(iter(awaited))
+            if resourceId in awaited:
+                awaited[resourceId] -= 1
+                if awaited[resourceId] == 0:
+                    del awaited[resourceId]
+
+    def _flushIncomplete(self, framer, awaited):
         """
-        self.encodedMsg = ""
-        for i in range(len(request)):
-            # convert character to hex value
-            self.encodedMsg += str(format(ord(request[i]), "x"))
-        # line of end ascii
-        self.encodedMsg += "0a"
+        Takes the incomplete message of a connection as reply, because older fleet software doesn't terminate its
+        replies with a newline
+
+        Args:
+            framer (MessageFramer): framer of the connection
+            awaited (dict): resourceId of robotino -> number of awaited replies
+        """
+        messages = framer.flush()
+        self._removeAnswered(awaited, messages)
+        self._dispatchMessages(messages)
+
+    def _onReplyTimeout(self, framer, awaited):
+        """
+        Gives up on the replies of a command
+
+        Args:
+            framer (MessageFramer): framer of the connection
+            awaited (dict): resourceId of robotino -> number of replies which didn't arrive
+        """
+        self._flushIncomplete(framer, awaited)
+        if len(awaited) != 0:
+            appLogger.warning(f"No reply from Robotinos {list(awaited)} in time")
+
+    def _dispatchMessages(self, messages):
+        """
+        Handles the framed messages in the order they were received
+
+        Args:
+            messages (list): The messages (str) of the Robotino
+        """
+        for message in messages:
+            try:
+                self._handleResponse(message)
+            except Exception as e:
+                appLogger.error(f"Couldn't handle message of robotino {message}: {e}")
+
+    def _handleResponse(self, response):
+        """
+        Handles a message of the Robotino and delegates it to the RobotinoManager
+
+        Args:
+            response (str): The received message without line ending
+        """
+        # print(response)
+        # -------------------- Error handling ------------------------
+        # station doesnt respond when loading/unloading carrier
+        if "error" in response.lower():
+            id, _ = parseCommandInfo(response)
+            # Give Robotino error msgs
+            if self.robotinoManager != None:
+                self.robotinoManager.setCommandInfo(response)
+            errMsg = ""
+            if (
+                "loadbox" in response.lower()
+                and "station" in response.lower()
+            ):
+                errMsg = (
+                    "Error while loading carrier: Station didn't respond"
+                )
+                appLogger.error(errMsg)
+            elif (
+                "unloadbox" in response.lower()
+                and "station" in response.lower()
+            ):
+                errMsg = (
+                    "Error while unloading Carrier: Station didn't respond"
+                )
+            # robotino tries to undock but isnt docked
+            elif "docked" in response.lower():
+                errMsg = "Error while undocking from resource: Robotino isn't docked"
+            # robotino tries to dock but didnt find markers to dock
+            elif "station" in response.lower():
+                errMsg = "Error while docking to resource: Robotino couldn't find markers to dock"
+            # robotino tries to drive to resource but path is blocked
+            elif "path" in response.lower():
+                errMsg = "Error while driving to resource: Path is blocked"
+            # robotino tries to load carrier, but a carrier is already present on robotino
+            elif "loadbox" in response.lower():
+                errMsg = "Error while loading carrier: A carrier is already present on carrier"
+            elif "unloadbox" in response.lower():
+                errMsg = "Error while unloading carrier: After finishing operation the box is still present"
+            # robotino tries to load carrier, but didnt get a carrier from station
+            elif "present" in response.lower():
+                errMsg = "Error while unloading carrier: Robotino hasn't a box present"
+            elif "loadbox" in response.lower() and "no_box" in response.lower():
+                errMsg = "Error while loading carrier: Carrier was not sucessfully loaded"
+            else:
+                print(f"Unclassified error occured: {response}")
+
+            self.errorSignal.emit(errMsg, id)
+            appLogger.error(errMsg)
+            self.endTask(id)
+
+        # -------- Handling responses from commands -----------
+        # response from commandexecution
+        if "commandinfo" in response.lower():
+            if self.robotinoManager != None:
+                self.robotinoManager.setCommandInfo(response)
+        # fetch state message
+        elif "robotinfo" in response.lower():
+            robotInfo = parseRobotInfo(response)
+            if self.robotinoManager != None:
+                robotino = self.robotinoManager.getRobotino(robotInfo.robotinoId)
+                if robotino != None:
+                    robotino.setRobotInfo(robotInfo)
+            with self.robotInfoReceived:
+                if robotInfo.robotinoId in self.pendingRobotInfos:
+                    self.pendingRobotInfos.discard(robotInfo.robotinoId)
+                    self.robotInfoReceived.notify_all()
+        # create/update fleet
+        elif "allrobotinoid" in response.lower():
+            if self.robotinoManager != None:
+                self.robotinoManager.createFleet(response)
+        # print out response which isnt handled when received
+        else:
+            appLogger.error(
+                "Catched unhandled response from robotino: " + str(response)
+            )
+
+    def pushCommand(self, frame, resourceId=0, coalesce=False, priority=False):
+        """
+        Queues the frame of a command so it is sent by the next free connection
+
+        Args:
+            frame (bytes): The frame from the CommandBuilder
+            resourceId (int, optional): ResourceId of robotino which the command is for. 0 if it isn't robotino specific
+            coalesce (bool, optional): If the command is dropped when the same one is still queued
+            priority (bool, optional): If the command is sent before the queued commands without priority
+        """
+        self.commandQueue.put(frame, resourceId, coalesce, priority)
 
     def loadBox(self, resourceId=7):
         """
@@ -182,8 +471,7 @@ class RobotinoServer(QThread):
         Returns:
             Nothing
         """
-        request = "PushCommand " + str(resourceId) + " LoadBox 0"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("LoadBox", resourceId), resourceId)
 
     def unloadBox(self, resourceId=7):
         """
@@ -195,8 +483,7 @@ class RobotinoServer(QThread):
         Returns:
             Nothing
         """
-        request = "PushCommand " + str(resourceId) + " UnloadBox 0"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("UnloadBox", resourceId), resourceId)
 
     def goTo(self, position, resourceId=7, type="resource"):
         """
@@ -212,7 +499,7 @@ class RobotinoServer(QThread):
         """
 
         request = f"PushCommand {resourceId} GoToPosition {position}"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.build(request), resourceId)
 
     def dock(self, resourceId=7):
         """
@@ -224,8 +511,7 @@ class RobotinoServer(QThread):
         Returns:
             Nothing
         """
-        request = f"PushCommand {resourceId} DockTo 1"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("DockTo", resourceId), resourceId)
 
     def undock(self, resourceId=7):
         """
@@ -237,8 +523,7 @@ class RobotinoServer(QThread):
         Return:
             Nothing
         """
-        request = f"PushCommand {resourceId} Undock"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("Undock", resourceId), resourceId)
 
     def getRobotinoInfo(self, resourceId=7):
         """
@@ -250,16 +535,48 @@ class RobotinoServer(QThread):
         Returns:
             Nothing
         """
-        request = f"GetRobotInfo {resourceId}"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("GetRobotInfo", resourceId), resourceId, coalesce=True)
+
+    def pollRobotInfos(self, resourceIds, timeout=ROBOTINO_STATE_POLL_TIMEOUT):
+        """
+        Polls the state of several robotinos at once. The GetRobotInfo commands of all robotinos are sent with one send
+        and the replies are collected as they arrive, so the state of the whole fleet is updated after about one
+        round-trip. Blocks until all robotinos replied or the timeout passed
+
+        Args:
+            resourceIds (list): ResourceIds of the robotinos
+            timeout (float, optional): max time to wait for the replies (in seconds)
+
+        Returns:
+            list: resourceIds of the robotinos which didn't reply before the timeout
+        """
+        if len(resourceIds) == 0:
+            return []
+        startedAt = time.monotonic()
+        with self.robotInfoReceived:
+            self.pendingRobotInfos.update(resourceIds)
+        # the poll has priority, so it isn't delayed by the queued commands of the robotinos
+        frame = self.commandBuilder.getBatchFrame("GetRobotInfo", resourceIds)
+        self.pushCommand(frame, coalesce=True, priority=True)
+        with self.robotInfoReceived:
+            self.robotInfoReceived.wait_for(
+                lambda: self.pendingRobotInfos.isdisjoint(resourceIds) or self.stopFlag.is_set(), timeout
+            )
+            missing = [resourceId for resourceId in resourceIds if resourceId in self.pendingRobotInfos]
+            self.pendingRobotInfos.difference_update(missing)
+            pollTime = time.monotonic() - startedAt
+            self.statePolls += 1
+            self.missingRobotInfos += len(missing)
+            self.totalPollTime += pollTime
+            self.lastPollTime = pollTime
+        return missing
 
     def getAllRobotinoID(self):
         """
         Command to get the resourceIds of all active robotinos
         """
         # self.response = "PushCommand GetAllRobotinoID"
-        request = "GetAllRobotinoID"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("GetAllRobotinoID"), coalesce=True)
 
     def endTask(self, resourceId=7):
         """
@@ -272,8 +589,7 @@ class RobotinoServer(QThread):
             Nothing
         """
         # self.response = "PushCommand GetAllRobotinoID"
-        request = f"EndTask {resourceId}"
-        self.strToBin(request)
+        self.pushCommand(self.commandBuilder.getFrame("EndTask", resourceId), resourceId)
 
     def ack(self, resourceId=7):
         """
@@ -285,30 +601,7 @@ class RobotinoServer(QThread):
         Returns:
             Nothing
         """
-        request = f"PushCommand {resourceId} Thank You"
-        self.strToBin(request)
-
-    def _parseCommandInfo(self, msg):
-        """
-        Splits the commandinfo into an id and state
-
-        Args:
-            msg (str): Message from which the state and id is extracted
-
-        Returns:
-            state (string): State message of the command info
-            id (int): ResourceId of Robotino from which the command info comes
-        """
-        id = msg.split("robotinoid:")
-        if id[0] != "":
-            id = int(id[1][0])
-            state = msg.split('"')
-            if len(state)>= 2:
-                state = state[1]
-
-            return id, state
-        else:
-            return 0, ""
+        self.pushCommand(self.commandBuilder.getFrame("ThankYou", resourceId), resourceId)
 
     """
     Setter
@@ -317,8 +610,32 @@ class RobotinoServer(QThread):
     def setRobotinoManager(self, robotinoManager):
         self.robotinoManager = robotinoManager
 
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the RobotinoServer
+
+        Returns:
+            dict: metrics of the command builder, the command queue and the state polls
+        """
+        with self.robotInfoReceived:
+            statePolls = {
+                "polls": self.statePolls,
+                "missingRobotInfos": self.missingRobotInfos,
+                "avgPollTime": self.totalPollTime / self.statePolls if self.statePolls else 0.0,
+                "lastPollTime": self.lastPollTime,
+            }
+        return {
+            "commandBuilder": self.commandBuilder.getMetrics(),
+            "commandQueue": self.commandQueue.getMetrics(),
+            "statePolls": statePolls,
+        }
+
     def stopServer(self):
         self.stopFlag.set()
+        self.commandQueue.close()
+        self._wakeUp()
+        with self.robotInfoReceived:
+            self.robotInfoReceived.notify_all()
         if self.robotinoManager != None:
             self.robotinoManager.stopCyclicStateUpdate()
             self.robotinoManager.stopAutomatedOperation()
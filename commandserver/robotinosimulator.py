@@ -0,0 +1,323 @@
+"""
+Filename: robotinosimulator.py
+Version name: 1.0, 2026-10-17
+Short description: local stand-in of the proprietary Festo fleet software for fleet scale tests. Run with
+"python -m commandserver.robotinosimulator" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import argparse
+import heapq
+import random
+import socket
+import time
+from threading import Condition, Event, Lock, Thread
+
+from .messageframer import MessageFramer
+from conf import TCP_BUFF_SIZE, appLogger
+
+# commands which are answered with "Started-<name>" and finish after the duration of the operation
+OPERATIONS = {
+    "GoToPosition": "GotoPosition",
+    "DockTo": "DockTo",
+    "Undock": "Undock",
+    "LoadBox": "LoadBox",
+    "UnloadBox": "UnloadBox",
+}
+
+
+class SimulatedRobotino(object):
+    """
+    State of one simulated Robotino
+    """
+
+    __slots__ = (
+        "id",
+        "state",
+        "batteryVoltage",
+        "boxPresent",
+        "positionX",
+        "positionY",
+        "positionPhi",
+    )
+
+    def __init__(self, id, rand):
+        self.id = id
+        self.state = "IDLE"
+        self.batteryVoltage = round(rand.uniform(22.5, 25.0), 3)
+        self.boxPresent = False
+        self.positionX = round(rand.uniform(-5.0, 5.0), 3)
+        self.positionY = round(rand.uniform(-5.0, 5.0), 3)
+        self.positionPhi = round(rand.uniform(-180.0, 180.0), 3)
+
+    def getRobotInfo(self):
+        return (
+            f"RobotInfo robotinoid:{self.id} x:{self.positionX} y:{self.positionY} phi:{self.positionPhi} "
+            + f"batteryvoltage:{self.batteryVoltage} current:1.0 laserwarning:0 lasersafety:0 "
+            + f"boxpresent:{int(self.boxPresent)} state:{self.state}"
+        )
+
+
+class RobotinoSimulator(object):
+    """
+    Connects to the RobotinoServer like the fleet software of Festo and answers the commands for a fleet of simulated
+    Robotinos. Each command is answered right away. Operations (driving, docking, loading ...) push their
+    "Finished-..." CommandInfo after the duration of the operation, so the server also receives messages between
+    the commands. In legacy mode the replies aren't terminated by a newline like the ones of older fleet software
+    """
+
+    def __init__(
+        self,
+        ids,
+        host="127.0.0.1",
+        port=13000,
+        connections=1,
+        opDuration=0.2,
+        legacy=False,
+        seed=None,
+    ):
+        """
+        Args:
+            ids (list): resourceIds of the simulated Robotinos
+            host (str, optional): Address of the RobotinoServer
+            port (int, optional): Port of the RobotinoServer
+            connections (int, optional): Number of connections to the RobotinoServer
+            opDuration (float, optional): Duration of an operation (in seconds)
+            legacy (bool, optional): Reply without newline like older fleet software
+            seed (int, optional): Seed of the random generator, so a run can be repeated
+        """
+        self.addr = (host, port)
+        self.connectionCount = connections
+        self.opDuration = opDuration
+        self.legacy = legacy
+        self.random = random.Random(seed)
+        self.robotinos = {id: SimulatedRobotino(id, self.random) for id in ids}
+        self.connections = []
+        self.lock = Lock()
+        # serializes the responses and the pushed messages, so they aren't interleaved on a connection
+        self.sendLock = Lock()
+        self.stopFlag = Event()
+        # heap of (dueTime, sequence, connection, robotinoId, operation) of the running operations
+        self.operations = []
+        self.operationsChanged = Condition(self.lock)
+        self.sequence = 0
+        # metrics: command -> number of received commands
+        self.commands = {}
+        self.finishedOperations = 0
+
+    def start(self, timeout=10):
+        """
+        Connects to the RobotinoServer
+
+        Args:
+            timeout (float, optional): max time to wait until the RobotinoServer accepts the connections (in seconds)
+        """
+        self.stopFlag.clear()
+        deadline = time.monotonic() + timeout
+        while len(self.connections) < self.connectionCount:
+            try:
+                connection = socket.create_connection(self.addr)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+                continue
+            self.connections.append(connection)
+            Thread(target=self._serve, args=(connection,), daemon=True).start()
+        Thread(target=self._finishOperations, daemon=True).start()
+        appLogger.info(
+            f"Robotino simulator connected with {len(self.robotinos)} robotinos"
+        )
+
+    def stop(self):
+        self.stopFlag.set()
+        with self.lock:
+            self.operationsChanged.notify_all()
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+        self.connections = []
+
+    def addRobotino(self, id):
+        """
+        Adds a Robotino which joined the fleet. It is reported with the next AllRobotinoID message
+
+        Args:
+            id (int): resourceId of the Robotino
+        """
+        with self.lock:
+            self.robotinos[id] = SimulatedRobotino(id, self.random)
+
+    def getMetrics(self):
+        """
+        Returns:
+            dict: number of received commands by command, finished operations and running operations
+        """
+        with self.lock:
+            return {
+                "commands": dict(self.commands),
+                "finishedOperations": self.finishedOperations,
+                "runningOperations": len(self.operations),
+            }
+
+    def _serve(self, connection):
+        """
+        Thread which answers the commands of one connection
+        """
+        framer = MessageFramer()
+        while not self.stopFlag.is_set():
+            try:
+                data = connection.recv(TCP_BUFF_SIZE)
+            except OSError:
+                break
+            if not data:
+                break
+            for command in framer.feed(data):
+                response = self._handle(connection, command)
+                if not self._send(connection, response, "" if self.legacy else "\n"):
+                    return
+
+    def _handle(self, connection, command):
+        """
+        Executes a command on the simulated fleet
+
+        Args:
+            connection (socket): connection which received the command
+            command (str): the command without line ending
+
+        Returns:
+            str: the response
+        """
+        tokens = command.split()
+        name = (
+            tokens[2] if tokens[0] == "PushCommand" and len(tokens) >= 3 else tokens[0]
+        )
+        with self.lock:
+            self.commands[name] = self.commands.get(name, 0) + 1
+            if name == "GetAllRobotinoID":
+                return "AllRobotinoID " + ",".join(str(id) for id in self.robotinos)
+            robotino = (
+                self.robotinos.get(int(tokens[1]))
+                if len(tokens) >= 2 and tokens[1].isdigit()
+                else None
+            )
+            if robotino == None:
+                return f"Unknown robotino: {command}"
+            if name == "GetRobotInfo":
+                return robotino.getRobotInfo()
+            if name == "EndTask":
+                robotino.state = "IDLE"
+                return f'CommandInfo robotinoid:{robotino.id} "EndTask"'
+            if name in OPERATIONS:
+                robotino.state = "BUSY"
+                self.sequence += 1
+                heapq.heappush(
+                    self.operations,
+                    (
+                        time.monotonic() + self.opDuration,
+                        self.sequence,
+                        connection,
+                        robotino.id,
+                        name,
+                    ),
+                )
+                self.operationsChanged.notify()
+                return (
+                    f'CommandInfo robotinoid:{robotino.id} "Started-{OPERATIONS[name]}"'
+                )
+            return f'CommandInfo robotinoid:{robotino.id} "Unknown-{name}"'
+
+    def _finishOperations(self):
+        """
+        Thread which pushes the "Finished-..." CommandInfo when an operation is done
+        """
+        while not self.stopFlag.is_set():
+            with self.lock:
+                while not self.stopFlag.is_set() and (
+                    len(self.operations) == 0
+                    or self.operations[0][0] > time.monotonic()
+                ):
+                    timeout = (
+                        self.operations[0][0] - time.monotonic()
+                        if self.operations
+                        else None
+                    )
+                    self.operationsChanged.wait(timeout)
+                if self.stopFlag.is_set():
+                    return
+                _, _, connection, robotinoId, name = heapq.heappop(self.operations)
+                robotino = self.robotinos[robotinoId]
+                robotino.state = "IDLE"
+                if name == "LoadBox":
+                    robotino.boxPresent = True
+                elif name == "UnloadBox":
+                    robotino.boxPresent = False
+                elif name == "GoToPosition":
+                    robotino.positionX = round(self.random.uniform(-5.0, 5.0), 3)
+                    robotino.positionY = round(self.random.uniform(-5.0, 5.0), 3)
+                self.finishedOperations += 1
+            self._send(
+                connection,
+                f'CommandInfo robotinoid:{robotinoId} "Finished-{OPERATIONS[name]}"',
+            )
+
+    def _send(self, connection, msg, terminator="\n"):
+        """
+        Sends a message
+
+        Args:
+            connection (socket): connection to the RobotinoServer
+            msg (str): the message without line ending
+            terminator (str, optional): line ending of the message
+
+        Returns:
+            bool: If the message was sent
+        """
+        with self.sendLock:
+            try:
+                connection.sendall((msg + terminator).encode("utf-8"))
+                return True
+            except OSError:
+                return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Local stand-in of the Festo fleet software"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--robotinos", type=int, default=20, help="number of simulated robotinos"
+    )
+    parser.add_argument(
+        "--connections", type=int, default=1, help="connections to the robotinoserver"
+    )
+    parser.add_argument(
+        "--op-duration",
+        type=float,
+        default=0.2,
+        help="duration of an operation in seconds",
+    )
+    parser.add_argument("--legacy", action="store_true", help="reply without newline")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = RobotinoSimulator(
+        ids=range(1, args.robotinos + 1),
+        host=args.host,
+        connections=args.connections,
+        opDuration=args.op_duration,
+        legacy=args.legacy,
+        seed=args.seed,
+    )
+    simulator.start()
+    try:
+        while True:
+            time.sleep(10)
+            print(simulator.getMetrics())
+    except KeyboardInterrupt:
+        simulator.stop()
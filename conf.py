@@ -13,10 +13,52 @@ IP_FLEETIAS = "129.69.102.129"
 IP_MES = "129.69.102.129"
 IP_ROS = "129.69.102.180"
 TCP_BUFF_SIZE = 512
+# serve all connections of the robotinos from one thread with a selector instead of one thread per connection
+ROBOTINO_SERVER_SELECTORS = False
+# interval in which an idle connection checks for messages which the robotinos push between commands (in seconds).
+# Only used without ROBOTINO_SERVER_SELECTORS
+ROBOTINO_IDLE_READ_INTERVAL = 0.1
+# max time to wait for the reply of a robotino to a command (in seconds)
+ROBOTINO_RESPONSE_TIMEOUT = 5
+# time without new bytes after which an incomplete message is taken as reply (in seconds). Older fleet software doesn't
+# terminate its replies with a newline
+ROBOTINO_REPLY_QUIET_TIME = 0.05
+# max time to wait for the replies of a state poll of the whole fleet (in seconds). Should be below
+# POLL_TIME_STATUSUPDATES
+ROBOTINO_STATE_POLL_TIMEOUT = 0.5
+
+# Conf for MES-Communication
+# max number of request frames which are kept pre-encoded
+MES_FRAME_CACHE_SIZE = 32
+# keep several service requests in flight and match the responses by RequestId. The IAS-MES has to echo the RequestId
+MES_PIPELINED_REQUESTS = False
+# max time to wait for the response of a service request (in seconds)
+MES_REQUEST_TIMEOUT = 5
+# number of connections to the service port. Pool starts with min size and grows lazily up to max size
+MES_POOL_MIN_SIZE = 1
+MES_POOL_MAX_SIZE = 4
+# time in which state changes of the robotinos are collected and coalesced before they are sent (in seconds)
+MES_SUBMIT_WINDOW = 0.2
+# period of the cyclic status messages to the IAS-MES (in seconds)
+MES_STATUS_PERIOD = 1
+# only publish the status records which changed and send all records every keepalive interval (in seconds)
+MES_STATUS_DELTA = False
+MES_STATUS_KEEPALIVE = 10
+# delay of the reconnects to the IAS-MES. Doubles with each failed attempt up to the max delay (in seconds)
+MES_RECONNECT_MIN_DELAY = 1
+MES_RECONNECT_MAX_DELAY = 30
+# max number of state changes which are kept while the IAS-MES is disconnected and replayed after the reconnect
+MES_REPLAY_QUEUE_SIZE = 64
+# run the MESClient on an asyncio event loop instead of a pool of blocking connections
+MES_USE_ASYNCIO_CLIENT = False
 
 # Poll times (in seconds)
 POLL_TIME_STATUSUPDATES = 1
+# the resourceIds of the fleet are polled again in this time, so robotinos which joined or left are noticed
+POLL_TIME_FLEET = 10
 POLL_TIME_TASKS = 3
+# max poll time of the transport tasks. Poll time doubles up to it while the IAS-MES has no new tasks
+POLL_TIME_TASKS_MAX = 15
 
 """
 Logger
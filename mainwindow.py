@@ -24,8 +24,9 @@ from robotinomanager.robotinomanager import RobotinoManager
 from commandserver.robotinoserver import RobotinoServer
 from commandserver.commandserver import CommandServer
 from mescommunicator.mesclient import MESClient
+from mescommunicator.asyncmesclient import SyncMESClient
 from frontend.ui_form import Ui_MainWindow
-from conf import appLogger, rosLogger, log_formatter_ros, log_formatter_app, IP_FLEETIAS
+from conf import appLogger, rosLogger, log_formatter_ros, log_formatter_app, IP_FLEETIAS, MES_USE_ASYNCIO_CLIENT
 
 
 class MainWindow(QMainWindow):
@@ -76,7 +77,7 @@ class MainWindow(QMainWindow):
         ##############################################
         self.robotinoServer = RobotinoServer()
         self.commandServer = CommandServer()
-        self.mesClient = MESClient()
+        self.mesClient = SyncMESClient() if MES_USE_ASYNCIO_CLIENT else MESClient()
         self.robotinoManager = RobotinoManager(robotinoServer= self.robotinoServer,mesClient= self.mesClient)
         self.robotinoServer.setRobotinoManager(self.robotinoManager)
         self.commandServer.setRobotinoManager(self.robotinoManager)
@@ -0,0 +1,550 @@
+"""
+Filename: asyncmesclient.py
+Version name: 1.0, 2026-10-17
+Short description: asyncio client to receive and send messages to mes. One event loop drives the service and the
+cyclic connection
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import asyncio
+import itertools
+import time
+from PySide6.QtCore import QThread, Signal
+
+from .framecache import RequestFrames
+from .framereader import frameLength
+from .mesresponse import MESResponse
+from .servicerequests import BIN_HEADER_SIZE
+from .serviceconnection import stampRequestId
+from .statuspublisher import StatusPublisher
+from .submissionqueue import SubmissionQueue
+from .supervisor import ConnectionSupervisor
+from conf import (
+    IP_MES,
+    MES_PIPELINED_REQUESTS,
+    MES_REQUEST_TIMEOUT,
+    appLogger,
+)
+
+
+class AsyncMESClient(object):
+    """
+    Client for the IAS-MES which runs on an asyncio event loop. The service requests are coroutines with the same
+    arguments and return values as the ones of MESClient. In lock-step mode the requests are serialised on the service
+    connection, in pipelined mode they are stamped with an unique RequestId and a reader task routes the responses
+    """
+
+    def __init__(
+        self,
+        pipelined=MES_PIPELINED_REQUESTS,
+        timeout=MES_REQUEST_TIMEOUT,
+        connectionChanged=None,
+    ):
+        """
+        Args:
+            pipelined (bool, optional): If service requests are pipelined
+            timeout (float, optional): Max time to wait for the response of a service request (in seconds)
+            connectionChanged (callable, optional): Called with True/False when the connection is established/lost
+        """
+        self.IP_MES = IP_MES
+        self.pipelined = pipelined
+        self.timeout = timeout
+        self.connectionChanged = connectionChanged
+        # templates of the recurring service requests
+        self.requestFrames = RequestFrames()
+        # streams of service (port 2000) and cyclic (port 2001) connection
+        self.serviceReader = None
+        self.serviceWriter = None
+        self.cyclicWriter = None
+        # lock-step: lock for the whole round trip
+        self.serviceLock = None
+        # pipelined: requestId -> Future of the request which waits for the response
+        self.pending = {}
+        self._requestIds = itertools.cycle(range(1, 0x10000))
+        self.readerTask = None
+        # params regarding robotinos
+        self.statesRobotinos = []
+        self.serviceSocketIsAlive = False
+        # schedule of the cyclic status messages
+        self.statusPublisher = StatusPublisher()
+        # set when the states are updated, so changes are published right away in delta mode
+        self.statesChanged = None
+        self.loop = None
+        # reconnects with backoff and uptime of the connection
+        self.supervisor = ConnectionSupervisor()
+        # metrics
+        self.requests = 0
+
+    async def connect(self):
+        """
+        Opens the service and the cyclic connection to the IAS-MES
+
+        Raises:
+            OSError: if the IAS-MES isn't reachable
+        """
+        _, self.cyclicWriter = await asyncio.wait_for(
+            asyncio.open_connection(self.IP_MES, 2001), 5.0
+        )
+        self.serviceReader, self.serviceWriter = await asyncio.wait_for(
+            asyncio.open_connection(self.IP_MES, 2000), 5.0
+        )
+        self.serviceLock = asyncio.Lock()
+        self.serviceSocketIsAlive = True
+        if self.pipelined:
+            self.readerTask = asyncio.create_task(self._readResponses())
+
+    async def run(self):
+        """
+        Connects to the IAS-MES and sends the states of the Robotinos until it is cancelled. Reconnects with
+        exponential backoff if the connection can't be established or breaks
+        """
+        appLogger.info("MESClient started")
+        self.loop = asyncio.get_running_loop()
+        self.statesChanged = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await self.connect()
+                    self.supervisor.setConnected()
+                    self._setConnected(True)
+                    await self.cyclicCommunication()
+                except Exception as e:
+                    appLogger.warning(e)
+                self._setConnected(False)
+                self.supervisor.setDisconnected()
+                await self.close()
+                delay = self.supervisor.getDelay()
+                appLogger.info(f"Reconnecting to IAS-MES in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        finally:
+            self._setConnected(False)
+            self.supervisor.setDisconnected()
+            await self.close()
+
+    async def getTransportTasks(self, noOfActiveAGV, asArray=False):
+        """
+        Get transport tasks from IAS-MES
+
+        Args:
+            noOfActiveAGV(int): number of active robotinos which can execute tasks. Can be higher than the fleet size
+                                to build up a local backlog
+            asArray (bool, optional): If tasks should be returned as structured array instead of a set. Defaults to False
+
+        Returns:
+            transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId). If asArray
+                                       is set, a numpy.ndarray with the fields startId and targetId
+        """
+        request = self.requestFrames.getTransportTasks(noOfActiveAGV)
+        try:
+            response = await self._serviceRequest(request)
+            if response != None and asArray:
+                return response.readTransportTasksArray()
+            elif response != None:
+                return response.readTransportTasks()
+        except ConnectionError:
+            self.serviceSocketIsAlive = False
+        except Exception as e:
+            appLogger.error(e)
+
+    async def moveBuf(self, robotinoId, resourceId, isLoading):
+        """
+        Inform mes that robotino loads/unloads carrier
+
+        Args:
+            robotinoId (int): resourceId of the robotino which loads/unloads
+            resourceId (int): resourceId of resource where it loads/unloads the carrier
+            isLoading (bool): if robotino loads (True) or unLoads(False) the carrier
+        """
+        request = self.requestFrames.moveBuf(robotinoId, resourceId, isLoading)
+        try:
+            return await self._serviceRequest(request) != None
+        except ConnectionError:
+            self.serviceSocketIsAlive = False
+        except Exception as e:
+            appLogger.error("[MESCLIENT] " + str(e))
+
+    async def delBuf(self, robotinoId):
+        """
+        Delete buffer in mes
+
+        Args:
+            robotinoId (int): resourceId of robotino which buffer should be deleted
+        """
+        request = self.requestFrames.delBuf(robotinoId)
+        try:
+            return await self._serviceRequest(request) != None
+        except ConnectionError:
+            self.serviceSocketIsAlive = False
+        except Exception as e:
+            appLogger.error("[MESCLIENT] " + str(e))
+
+    async def setDockingPos(self, dockedAt, robotinoId):
+        """
+        Set docking position in mes
+
+        Args:
+            dockedAt (int): resourceId of resource where it is docked at (undocked: dockedAt=0)
+            robotinoID (int): resourceId of robotino which has docked
+        """
+        request = self.requestFrames.setDockingPos(dockedAt, robotinoId)
+        try:
+            return await self._serviceRequest(request) != None
+        except ConnectionError:
+            self.serviceSocketIsAlive = False
+            appLogger.error("Can't send message to IAS-MES: Connection is broken")
+        except Exception as e:
+            appLogger.error(str(e))
+
+    async def sendBatch(self, requests):
+        """
+        Sends several requests back-to-back in one write
+
+        Args:
+            requests (list): encoded requests
+
+        Returns:
+            bool: If all requests were answered
+
+        Raises:
+            ConnectionError: if the connection to the IAS-MES is broken
+            TimeoutError: if the IAS-MES didn't respond in time
+        """
+        try:
+            responses = await self._serviceRequests(requests)
+            return all(response != None for response in responses)
+        except (ConnectionError, TimeoutError):
+            self.serviceSocketIsAlive = False
+            appLogger.error("Can't send message to IAS-MES: Connection is broken")
+            raise
+
+    async def cyclicCommunication(self):
+        """
+        Task for cyclically sending state of Robotinos to IAS-MES
+
+        Raises:
+            ConnectionError: if the connection to the IAS-MES broke
+        """
+        self.statusPublisher.start()
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self.statesChanged.wait(), self.statusPublisher.getDelay()
+                )
+            except asyncio.TimeoutError:
+                pass
+            self.statesChanged.clear()
+            if not self.serviceSocketIsAlive:
+                raise ConnectionError("Connection to service port of IAS-MES is broken")
+            isDue = self.statusPublisher.isDue()
+            sentAt = time.monotonic()
+            # send states of all (delta mode: changed) robotinos in one write
+            states = self.statusPublisher.getFrame(self.statesRobotinos, isDue)
+            if states:
+                # transport may keep the buffer, so it gets a copy
+                self.cyclicWriter.write(bytes(states))
+            if isDue:
+                self.statusPublisher.setPublished(sentAt)
+            await self.cyclicWriter.drain()
+
+    async def close(self):
+        """
+        Closes both connections. Requests which are still waiting for a response fail with a ConnectionError
+        """
+        self.serviceSocketIsAlive = False
+        if self.readerTask != None:
+            self.readerTask.cancel()
+            self.readerTask = None
+        self._failPending(ConnectionError("Connection to IAS-MES was closed"))
+        for writer in (self.serviceWriter, self.cyclicWriter):
+            if writer != None:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+        self.serviceWriter = self.cyclicWriter = None
+
+    async def _serviceRequest(self, request):
+        """
+        Sends a request over the service connection and waits for its response
+
+        Args:
+            request (bytes): encoded request
+
+        Returns:
+            MESResponse: response of the IAS-MES or None if it couldn't be decoded
+
+        Raises:
+            ConnectionError: if the connection is broken
+            TimeoutError: if the IAS-MES didn't respond in time
+        """
+        (response,) = await self._serviceRequests([request])
+        return response
+
+    async def _serviceRequests(self, requests):
+        """
+        Sends requests back-to-back in one write over the service connection and waits for their responses
+
+        Args:
+            requests (list): encoded requests
+
+        Returns:
+            list: MESResponse of each request in the order of the requests (None if it couldn't be decoded)
+
+        Raises:
+            ConnectionError: if the connection is broken
+            TimeoutError: if the IAS-MES didn't respond in time
+        """
+        if not self.serviceSocketIsAlive:
+            raise ConnectionError("Connection to IAS-MES is closed")
+        self.requests += len(requests)
+        if not self.pipelined:
+            async with self.serviceLock:
+                self.serviceWriter.write(b"".join(requests))
+                try:
+                    await self.serviceWriter.drain()
+                    frames = await asyncio.wait_for(
+                        self._readFrames(len(requests)), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    # a late response would bring the stream out of sync
+                    self.serviceSocketIsAlive = False
+                    self.serviceWriter.close()
+                    raise TimeoutError("IAS-MES didn't respond to request in time")
+                return [MESResponse.fromBuffer(frame) for frame in frames]
+
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for request in requests:
+            requestId = next(self._requestIds)
+            futures[requestId] = self.pending[requestId] = loop.create_future()
+        try:
+            self.serviceWriter.write(
+                b"".join(
+                    stampRequestId(request, requestId)
+                    for request, requestId in zip(requests, futures)
+                )
+            )
+            await self.serviceWriter.drain()
+            return await asyncio.wait_for(
+                asyncio.gather(*futures.values()), self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError("IAS-MES didn't respond to request in time")
+        finally:
+            for requestId in futures:
+                self.pending.pop(requestId, None)
+
+    async def _readFrames(self, count):
+        return [await self._readFrame() for _ in range(count)]
+
+    async def _readFrame(self):
+        """
+        Reads the next frame from the service connection
+
+        Returns:
+            bytes: the frame (header and serviceparams)
+
+        Raises:
+            ConnectionError: if the connection was closed by the IAS-MES
+        """
+        try:
+            header = await self.serviceReader.readexactly(BIN_HEADER_SIZE)
+            return header + await self.serviceReader.readexactly(
+                frameLength(header) - BIN_HEADER_SIZE
+            )
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Connection was closed by IAS-MES")
+
+    async def _readResponses(self):
+        """
+        Task which reads the responses in pipelined mode and routes them to the waiting requests
+        """
+        try:
+            while True:
+                response = MESResponse.fromBuffer(await self._readFrame())
+                if response == None:
+                    continue
+                future = self.pending.pop(response.requestID, None)
+                if future != None and not future.done():
+                    future.set_result(response)
+                elif future == None:
+                    appLogger.warning(
+                        f"Received response for unknown RequestId {response.requestID}"
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.serviceSocketIsAlive:
+                appLogger.error(f"Connection to IAS-MES is broken: {e}")
+            self.serviceSocketIsAlive = False
+            self._failPending(ConnectionError("Connection to IAS-MES is broken"))
+
+    def _setConnected(self, isConnected):
+        if self.connectionChanged != None:
+            self.connectionChanged(isConnected)
+
+    def _failPending(self, exception):
+        pending = list(self.pending.values())
+        self.pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(exception)
+
+    """
+    Setter
+    """
+
+    def setStatesRobotinos(self, states):
+        """
+        Sets the Robotinos whose states are published. Can be called from other threads
+        """
+        self.statesRobotinos = states
+        loop = self.loop
+        if self.statusPublisher.deltaOnly and loop != None:
+            try:
+                loop.call_soon_threadsafe(self.statesChanged.set)
+            except RuntimeError:
+                # loop is already closed
+                pass
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the AsyncMESClient
+
+        Returns:
+            dict: metrics of the AsyncMESClient
+        """
+        return {
+            "frameCache": self.requestFrames.frameCache.getMetrics(),
+            "requests": self.requests,
+            "pendingRequests": len(self.pending),
+            "statusPublisher": self.statusPublisher.getMetrics(),
+            "connection": self.supervisor.getMetrics(),
+        }
+
+
+class SyncMESClient(QThread):
+    """
+    Synchronous facade of the AsyncMESClient with the interface of MESClient, so it can be used by the Qt callers.
+    The event loop runs in this thread, the service requests of other threads are submitted to it and block until
+    they are answered
+    """
+
+    stoppedSignal = Signal()
+
+    def __init__(self, pipelined=MES_PIPELINED_REQUESTS, timeout=MES_REQUEST_TIMEOUT):
+        super(SyncMESClient, self).__init__()
+        # state changes of the robotinos which are sent batched
+        self.submissionQueue = SubmissionQueue(self._sendBatch)
+        self.client = AsyncMESClient(
+            pipelined, timeout, connectionChanged=self.submissionQueue.setConnected
+        )
+        self.timeout = timeout
+        self.loop = None
+        self.mainTask = None
+
+    def run(self):
+        """
+        Runs/starts the event loop of the AsyncMESClient
+        """
+        self.loop = asyncio.new_event_loop()
+        self.submissionQueue.start()
+        try:
+            self.mainTask = self.loop.create_task(self.client.run())
+            self.loop.run_until_complete(self.mainTask)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.run_until_complete(self.client.close())
+            loop, self.loop = self.loop, None
+            loop.close()
+        self.stoppedSignal.emit()
+
+    @property
+    def serviceSocketIsAlive(self):
+        return self.client.serviceSocketIsAlive
+
+    def getTransportTasks(self, noOfActiveAGV, asArray=False):
+        return self._call(self.client.getTransportTasks(noOfActiveAGV, asArray))
+
+    def moveBuf(self, robotinoId, resourceId, isLoading):
+        return self._call(self.client.moveBuf(robotinoId, resourceId, isLoading))
+
+    def delBuf(self, robotinoId):
+        return self._call(self.client.delBuf(robotinoId))
+
+    def setDockingPos(self, dockedAt, robotinoId):
+        return self._call(self.client.setDockingPos(dockedAt, robotinoId))
+
+    def submitMoveBuf(self, robotinoId, resourceId, isLoading):
+        self.submissionQueue.submit(
+            robotinoId,
+            self.client.requestFrames.moveBuf(robotinoId, resourceId, isLoading),
+        )
+
+    def submitSetDockingPos(self, dockedAt, robotinoId):
+        request = self.client.requestFrames.setDockingPos(dockedAt, robotinoId)
+        self.submissionQueue.submit(robotinoId, request, dockingPos=int(dockedAt))
+
+    def _sendBatch(self, requests):
+        """
+        Sends the requests of the SubmissionQueue on the event loop
+
+        Raises:
+            ConnectionError: if the client isn't running or the connection is broken
+            TimeoutError: if the IAS-MES didn't respond in time
+        """
+        loop = self.loop
+        if loop == None or not loop.is_running():
+            raise ConnectionError("MESClient isn't running")
+        future = asyncio.run_coroutine_threadsafe(self.client.sendBatch(requests), loop)
+        return future.result(self.timeout + 1)
+
+    def _call(self, coroutine):
+        """
+        Runs a coroutine of the AsyncMESClient on the event loop and waits for its result
+
+        Args:
+            coroutine (coroutine): the service request
+
+        Returns:
+            Result of the coroutine or None if the client isn't running
+        """
+        loop = self.loop
+        if loop == None or not loop.is_running():
+            coroutine.close()
+            return None
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            # the request itself times out after self.timeout, the margin covers the scheduling
+            return future.result(self.timeout + 1)
+        except Exception as e:
+            future.cancel()
+            appLogger.error(f"[MESCLIENT] {e}")
+
+    """
+    Setter
+    """
+
+    def setStatesRobotinos(self, states):
+        self.client.setStatesRobotinos(states)
+
+    def getMetrics(self):
+        return {
+            **self.client.getMetrics(),
+            "submissions": self.submissionQueue.getMetrics(),
+        }
+
+    def stopClient(self):
+        self.submissionQueue.stop()
+        self.client.serviceSocketIsAlive = False
+        loop, mainTask = self.loop, self.mainTask
+        if loop != None and mainTask != None:
+            try:
+                loop.call_soon_threadsafe(mainTask.cancel)
+            except RuntimeError:
+                # loop is already closed
+                pass
+        appLogger.info("Stopped MESClient")
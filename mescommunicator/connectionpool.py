@@ -0,0 +1,254 @@
+"""
+Filename: connectionpool.py
+Version name: 1.0, 2026-10-17
+Short description: pool of connections to the service port of the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import select
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+
+from .serviceconnection import ServiceConnection
+from conf import (
+    MES_PIPELINED_REQUESTS,
+    MES_POOL_MAX_SIZE,
+    MES_POOL_MIN_SIZE,
+    MES_REQUEST_TIMEOUT,
+    TCP_BUFF_SIZE,
+    appLogger,
+)
+
+
+class ServiceConnectionPool(object):
+    """
+    Pool of ServiceConnections so service requests of different Robotinos don't have to wait for each other. The pool
+    starts with minSize connections and lazily opens new ones up to maxSize when all are checked out. Idle connections
+    are health checked before they are handed out and replaced if the IAS-MES closed them
+    """
+
+    def __init__(
+        self,
+        address,
+        minSize=MES_POOL_MIN_SIZE,
+        maxSize=MES_POOL_MAX_SIZE,
+        pipelined=MES_PIPELINED_REQUESTS,
+        bufferSize=TCP_BUFF_SIZE,
+        timeout=MES_REQUEST_TIMEOUT,
+    ):
+        self.address = address
+        self.minSize = minSize
+        self.maxSize = max(minSize, maxSize)
+        self.pipelined = pipelined
+        self.bufferSize = bufferSize
+        self.timeout = timeout
+        self.idle = deque()
+        # number of open connections (idle and checked out)
+        self.size = 0
+        self.inUse = 0
+        self.isOpen = False
+        self.condition = Condition()
+        # metrics
+        self.checkouts = 0
+        self.totalWaitTime = 0.0
+        self.maxWaitTime = 0.0
+        self.busyTime = 0.0
+        self.peakInUse = 0
+        self.reconnects = 0
+        self.openedAt = time.monotonic()
+
+    def open(self):
+        """
+        Opens the pool with minSize connections
+
+        Raises:
+            OSError: if the IAS-MES isn't reachable
+        """
+        with self.condition:
+            self.isOpen = True
+            self.openedAt = time.monotonic()
+        for _ in range(self.minSize):
+            connection = self._createConnection()
+            with self.condition:
+                self.size += 1
+                self.idle.append(connection)
+
+    def close(self):
+        """
+        Closes all idle connections. Checked out connections are closed when they are checked in
+        """
+        with self.condition:
+            self.isOpen = False
+            idle = list(self.idle)
+            self.idle.clear()
+            self.size -= len(idle)
+            self.condition.notify_all()
+        for connection in idle:
+            connection.close()
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks out a connection for the duration of the with-block. A connection which broke or whose request timed
+        out while it was checked out is discarded, because a late response would be read by the next request
+
+        Yields:
+            ServiceConnection: a connected ServiceConnection
+        """
+        connection = self.checkout()
+        checkedOutAt = time.monotonic()
+        discard = False
+        try:
+            yield connection
+        except (ConnectionError, TimeoutError):
+            discard = True
+            raise
+        finally:
+            self.checkin(connection, time.monotonic() - checkedOutAt, discard)
+
+    def checkout(self):
+        """
+        Gets an idle connection, opens a new one if the pool isn't fully grown or waits until one is checked in
+
+        Returns:
+            ServiceConnection: a connected ServiceConnection
+
+        Raises:
+            ConnectionError: if the pool is closed or no connection could be opened
+            TimeoutError: if no connection got free in time
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        with self.condition:
+            while True:
+                if not self.isOpen:
+                    raise ConnectionError("Pool of connections to IAS-MES is closed")
+                connection = self._popHealthy()
+                if connection != None:
+                    break
+                if self.size < self.maxSize:
+                    # reserve the slot and connect outside of the lock
+                    self.size += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No connection to IAS-MES got free in time")
+                self.condition.wait(remaining)
+
+        if connection == None:
+            try:
+                connection = self._createConnection()
+            except Exception:
+                with self.condition:
+                    self.size -= 1
+                    self.condition.notify()
+                raise
+
+        waitTime = time.monotonic() - start
+        with self.condition:
+            self.checkouts += 1
+            self.inUse += 1
+            self.peakInUse = max(self.peakInUse, self.inUse)
+            self.totalWaitTime += waitTime
+            self.maxWaitTime = max(self.maxWaitTime, waitTime)
+        return connection
+
+    def checkin(self, connection, busyTime=0.0, discard=False):
+        """
+        Returns a checked out connection to the pool
+
+        Args:
+            connection (ServiceConnection): the connection which was checked out
+            busyTime (float, optional): how long the connection was checked out in seconds
+            discard (bool, optional): If the connection is closed instead of returned to the idle connections, e.g.
+                                      after a request timed out
+        """
+        with self.condition:
+            self.inUse -= 1
+            self.busyTime += busyTime
+            if connection.isAlive and self.isOpen and not discard:
+                self.idle.append(connection)
+            else:
+                # broken connection is replaced lazily on the next checkout
+                self.size -= 1
+                if self.isOpen:
+                    self.reconnects += 1
+                connection.close()
+            self.condition.notify()
+
+    def getMetrics(self):
+        """
+        Gets the metrics of the pool, e.g. to size it against the fleet
+
+        Returns:
+            dict: size, utilisation, wait times and reconnects of the pool
+        """
+        with self.condition:
+            uptime = max(time.monotonic() - self.openedAt, 1e-9)
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "inUse": self.inUse,
+                "peakInUse": self.peakInUse,
+                "checkouts": self.checkouts,
+                "avgWaitTime": self.totalWaitTime / self.checkouts
+                if self.checkouts
+                else 0.0,
+                "maxWaitTime": self.maxWaitTime,
+                "utilisation": self.busyTime / (uptime * self.maxSize),
+                "reconnects": self.reconnects,
+            }
+
+    def _popHealthy(self):
+        """
+        Pops idle connections until a healthy one is found. Broken connections are replaced lazily. Must be called
+        while holding the condition
+
+        Returns:
+            ServiceConnection: a healthy connection or None if no idle connection is left
+        """
+        while self.idle:
+            connection = self.idle.pop()
+            if self._isHealthy(connection):
+                return connection
+            appLogger.warning(
+                "Connection to IAS-MES was closed while idle. Reconnecting"
+            )
+            connection.close()
+            self.size -= 1
+            self.reconnects += 1
+        return None
+
+    def _isHealthy(self, connection):
+        """
+        Checks if an idle connection is still usable. In lock-step mode an idle connection mustn't be readable: Either
+        the IAS-MES closed it or stale data would bring the next response out of sync
+
+        Args:
+            connection (ServiceConnection): the idle connection
+
+        Returns:
+            bool: if the connection can be used
+        """
+        if not connection.isAlive:
+            return False
+        if self.pipelined:
+            return True
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+            if readable:
+                return False
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _createConnection(self):
+        connection = ServiceConnection(
+            self.address, self.pipelined, self.bufferSize, self.timeout
+        )
+        connection.connect(timeout=self.timeout)
+        return connection
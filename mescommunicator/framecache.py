@@ -0,0 +1,201 @@
+"""
+Filename: framecache.py
+Version name: 1.0, 2026-10-17
+Short description: cache of pre-encoded request frames for recurring service requests to the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import struct
+from collections import OrderedDict
+from threading import Lock
+
+from .servicerequests import (
+    BIN_BYTE_ORDER,
+    BIN_HEADER_SIZE,
+    MES_FIELDS_BY_ATTR,
+    ServiceRequests,
+    structFormat,
+)
+from conf import MES_FRAME_CACHE_SIZE
+
+
+class FrameCache(object):
+    """
+    LRU-bounded cache of request frames. Recurring requests only differ in a few fields, so the frame (tcpident,
+    header, reserved bytes and static serviceparams) is encoded once as template and only the variable fields are
+    patched into it for each request
+    """
+
+    def __init__(self, maxSize=MES_FRAME_CACHE_SIZE):
+        self.maxSize = maxSize
+        # key -> (buffer of template, byte order)
+        self.templates = OrderedDict()
+        self.lock = Lock()
+        # struct for each (byte order, field) which is patched
+        self._structs = {}
+        # instrumentation
+        self.hits = 0
+        self.misses = 0
+
+    def getFrame(self, key, createRequest, values):
+        """
+        Gets the encoded frame of a request
+
+        Args:
+            key (hashable): Identifies the template, e.g. the service and its static arguments
+            createRequest (callable): Creates the ServiceRequests with all static fields set. Only called if the
+                                      template isn't cached
+            values (dict): Variable fields which are patched into the template. Keys are either the attribute of a
+                           standardparameter (e.g. "resourceId") or the index of a serviceparam (int16)
+
+        Returns:
+            bytes: Encoded frame which can be send to the IAS-MES
+        """
+        with self.lock:
+            template = self.templates.get(key)
+            if template != None:
+                self.hits += 1
+                self.templates.move_to_end(key)
+            else:
+                self.misses += 1
+                request = createRequest()
+                template = (
+                    bytearray(request.encodeBytes()),
+                    BIN_BYTE_ORDER[str(request.tcpIdent)],
+                )
+                self.templates[key] = template
+                if len(self.templates) > self.maxSize:
+                    self.templates.popitem(last=False)
+
+            buffer, byteOrder = template
+            for field, value in values.items():
+                offset, layout = self._getPatch(byteOrder, field)
+                layout.pack_into(buffer, offset, value)
+            return bytes(buffer)
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the cache
+
+        Returns:
+            dict: Number of hits, misses and cached templates
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.templates)}
+
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
+
+    def _getPatch(self, byteOrder, field):
+        """
+        Gets offset and struct of a variable field
+
+        Args:
+            byteOrder (str): struct byte order character of the template
+            field (str or int): attribute of standardparameter or index of serviceparam
+
+        Returns:
+            (int, struct.Struct): offset of the field in the frame and struct to encode it
+        """
+        patch = self._structs.get((byteOrder, field))
+        if patch == None:
+            if isinstance(field, int):
+                patch = (BIN_HEADER_SIZE + 2 * field, struct.Struct(byteOrder + "H"))
+            else:
+                mesField = MES_FIELDS_BY_ATTR[field]
+                patch = (
+                    mesField.offset,
+                    struct.Struct(byteOrder + structFormat(mesField)),
+                )
+            self._structs[(byteOrder, field)] = patch
+        return patch
+
+
+class RequestFrames(object):
+    """
+    Encodes the recurring service requests of FleetIAS with the templates of a FrameCache
+    """
+
+    def __init__(self, frameCache=None):
+        self.frameCache = frameCache if frameCache != None else FrameCache()
+
+    def getTransportTasks(self, noOfActiveAGV):
+        """
+        Args:
+            noOfActiveAGV(int): number of tasks which should be returned at most
+
+        Returns:
+            bytes: encoded request
+        """
+        return self.frameCache.getFrame(
+            ("getTransportTasks",),
+            lambda: _createRequest("getTransportTasks", 0),
+            {"maxRecords": int(noOfActiveAGV)},
+        )
+
+    def moveBuf(self, robotinoId, resourceId, isLoading):
+        """
+        Args:
+            robotinoId (int): resourceId of the robotino which loads/unloads
+            resourceId (int): resourceId of resource where it loads/unloads the carrier
+            isLoading (bool): if robotino loads (True) or unLoads(False) the carrier
+
+        Returns:
+            bytes: encoded request
+        """
+        # serviceparams: [id of source, bufNo of source, bufPos of source, id of target, bufNo of target, bufPos of target]
+        if isLoading:
+            values = {0: int(resourceId), 3: int(robotinoId)}
+        else:
+            values = {0: int(robotinoId), 3: int(resourceId)}
+        return self.frameCache.getFrame(
+            ("moveBuf", bool(isLoading)),
+            lambda: _createRequest("moveBuf", 0, 0, isLoading),
+            values,
+        )
+
+    def delBuf(self, robotinoId):
+        """
+        Args:
+            robotinoId (int): resourceId of robotino which buffer should be deleted
+
+        Returns:
+            bytes: encoded request
+        """
+        return self.frameCache.getFrame(
+            ("delBuf",),
+            lambda: _createRequest("delBuf", 0),
+            {"resourceId": int(robotinoId)},
+        )
+
+    def setDockingPos(self, dockedAt, robotinoId):
+        """
+        Args:
+            dockedAt (int): resourceId of resource where it is docked at (undocked: dockedAt=0)
+            robotinoID (int): resourceId of robotino which has docked
+
+        Returns:
+            bytes: encoded request
+        """
+        return self.frameCache.getFrame(
+            ("setDockingPos",),
+            lambda: _createRequest("setDockingPos", 0, 0),
+            {"resourceId": int(dockedAt), "aux1Int": int(robotinoId)},
+        )
+
+
+def _createRequest(service, *args):
+    """
+    Creates a service request. Used to build the templates of the frame cache
+
+    Args:
+        service (str): Name of the method of ServiceRequests which sets up the request
+        args: Arguments of the method
+
+    Returns:
+        ServiceRequests: the set up request
+    """
+    request = ServiceRequests()
+    getattr(request, service)(*args)
+    return request
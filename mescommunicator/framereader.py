@@ -0,0 +1,125 @@
+"""
+Filename: framereader.py
+Version name: 1.0, 2026-10-17
+Short description: buffered reader which splits the tcp stream of the mes into frames
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import struct
+
+from .servicerequests import BIN_BYTE_ORDER, BIN_HEADER_SIZE, MES_FIELDS_BY_ATTR
+from conf import TCP_BUFF_SIZE
+
+_BYTE_ORDER_BY_IDENT = {
+    bytes.fromhex(ident): byteOrder for ident, byteOrder in BIN_BYTE_ORDER.items()
+}
+_DATA_LENGTH = MES_FIELDS_BY_ATTR["dataLength"]
+_DATA_LENGTH_LAYOUTS = {
+    byteOrder: struct.Struct(byteOrder + "H")
+    for byteOrder in _BYTE_ORDER_BY_IDENT.values()
+}
+
+
+def frameLength(header, offset=0):
+    """
+    Gets the length of a frame from its header
+
+    Args:
+        header (bytes-like): buffer which contains the header of the frame
+        offset (int, optional): Start of the frame in the buffer. Defaults to 0
+
+    Returns:
+        int: length of the frame (header and serviceparams)
+
+    Raises:
+        ValueError: if the header doesn't start with a tcpident
+    """
+    byteOrder = _BYTE_ORDER_BY_IDENT.get(bytes(header[offset : offset + 4]))
+    if byteOrder == None:
+        raise ValueError(
+            "Stream of IAS-MES is out of sync: Frame doesn't start with tcpident"
+        )
+    (dataLength,) = _DATA_LENGTH_LAYOUTS[byteOrder].unpack_from(
+        header, offset + _DATA_LENGTH.offset
+    )
+    return BIN_HEADER_SIZE + dataLength
+
+
+class FrameReader(object):
+    """
+    Reads binary frames from a stream socket. The length of a frame is taken from the DataLength field of its header,
+    so each call returns exactly one frame even if it was split over several reads or coalesced with the next one.
+    Bytes which belong to the next frame are kept in the buffer
+    """
+
+    def __init__(self, sock, bufferSize=TCP_BUFF_SIZE):
+        self.sock = sock
+        self.buffer = bytearray(max(bufferSize, BIN_HEADER_SIZE))
+        # received but not yet returned bytes are buffer[start:end]
+        self.start = 0
+        self.end = 0
+
+    def readFrame(self):
+        """
+        Reads the next frame. Blocks until it is completely received
+
+        Returns:
+            bytes: the frame (header and serviceparams)
+
+        Raises:
+            ConnectionError: if the connection was closed by the IAS-MES
+            ValueError: if the stream is out of sync, e.g. the data doesn't start with a tcpident
+        """
+        while True:
+            length = self._frameLength()
+            if length != None and self.end - self.start >= length:
+                # one copy, the buffer is reused for the next frames
+                with memoryview(self.buffer) as view:
+                    frame = bytes(view[self.start : self.start + length])
+                self.start += length
+                if self.start == self.end:
+                    self.start = self.end = 0
+                return frame
+            self._receive(length or BIN_HEADER_SIZE)
+
+    def reset(self):
+        """
+        Discards all buffered bytes, e.g. after the socket was reconnected
+        """
+        self.start = self.end = 0
+
+    def _frameLength(self):
+        """
+        Gets the length of the frame at the start of the buffer
+
+        Returns:
+            int: length of the frame or None if the header isn't completely received
+        """
+        if self.end - self.start < BIN_HEADER_SIZE:
+            return None
+        try:
+            return frameLength(self.buffer, self.start)
+        except ValueError:
+            self.reset()
+            raise
+
+    def _receive(self, required):
+        """
+        Receives from the socket into the free space of the buffer. Moves the unread bytes to the front or grows the
+        buffer if the frame wouldn't fit
+
+        Args:
+            required (int): number of bytes the current frame needs in the buffer
+        """
+        if self.start + required > len(self.buffer):
+            unread = self.end - self.start
+            self.buffer[:unread] = self.buffer[self.start : self.end]
+            self.start, self.end = 0, unread
+            if required > len(self.buffer):
+                self.buffer.extend(bytes(required - len(self.buffer)))
+        with memoryview(self.buffer) as view:
+            length = self.sock.recv_into(view[self.end :])
+        if length == 0:
+            raise ConnectionError("Connection was closed by IAS-MES")
+        self.end += length
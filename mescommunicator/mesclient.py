@@ -6,14 +6,16 @@ Short description: tcp server to receive and send messages to mes
 (C) 2003-2021 IAS, Universitaet Stuttgart
 
 """
-import binascii
-import numpy as np
 import socket
 import time
 from PySide6.QtCore import QThread, Signal
-from threading import Event, Lock
+from threading import Event
 
-from .servicerequests import ServiceRequests
+from .connectionpool import ServiceConnectionPool
+from .framecache import RequestFrames
+from .statuspublisher import StatusPublisher
+from .submissionqueue import SubmissionQueue
+from .supervisor import ConnectionSupervisor
 from conf import IP_FLEETIAS, TCP_BUFF_SIZE, IP_MES, appLogger
 
 
@@ -26,75 +28,79 @@ class MESClient(QThread):
         self.HOST = IP_FLEETIAS
         self.IP_MES = IP_MES
         self.BUFFSIZE = TCP_BUFF_SIZE
+        # templates of the recurring service requests
+        self.requestFrames = RequestFrames()
         # setup socket for cyclic communication
         self.CYCLIC_SOCKET = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.CYCLIC_SOCKET.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        # setup socket for service requests
-        self.SERVICE_SOCKET = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.SERVICE_SOCKET.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # setup pool of connections for service requests
+        self.servicePool = ServiceConnectionPool((self.IP_MES, 2000), bufferSize=self.BUFFSIZE)
+        # state changes of the robotinos which are sent batched
+        self.submissionQueue = SubmissionQueue(self._sendBatch)
+        # schedule of the cyclic status messages
+        self.statusPublisher = StatusPublisher()
+        # set when the states are updated, so changes are published right away in delta mode
+        self.statesChanged = Event()
+        # reconnects with backoff and uptime of the connection
+        self.supervisor = ConnectionSupervisor()
         # params regarding robotinos
         self.statesRobotinos = []
         self.stopFlag = Event()
-        self.lock = Lock()
         self.serviceSocketIsAlive = False
 
     def run(self):
         """
-        Runs/starts the MESClient
+        Runs/starts the MESClient. Reconnects with exponential backoff until it is stopped if the connection to the
+        IAS-MES can't be established or breaks
         """
         appLogger.info("MESClient started")
-        self.CYCLIC_SOCKET = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.CYCLIC_SOCKET.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.SERVICE_SOCKET = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.SERVICE_SOCKET.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        try:
-            # Set timeout for connection
-            self.CYCLIC_SOCKET.settimeout(5.0)
-            self.SERVICE_SOCKET.settimeout(5.0)
-            self.CYCLIC_SOCKET.connect((self.IP_MES, 2001))
-            self.SERVICE_SOCKET.connect((self.IP_MES, 2000))
-            self.serviceSocketIsAlive = True
-            # Reset tinmeout so socket is in blocking mode
-            self.CYCLIC_SOCKET.settimeout(None)
-            self.SERVICE_SOCKET.settimeout(None)
-            # Start cyclic communication
-            self.stopFlag.clear()
-            self.cyclicCommunication()
-        except Exception as e:
-            appLogger.warning(e)
-        self.serviceSocketIsAlive = False
+        self.stopFlag.clear()
+        self.submissionQueue.start()
+        while not self.stopFlag.is_set():
+            try:
+                self._connect()
+                self.supervisor.setConnected()
+                self.serviceSocketIsAlive = True
+                self.submissionQueue.setConnected(True)
+                # Start cyclic communication
+                self.cyclicCommunication()
+            except Exception as e:
+                appLogger.warning(e)
+            self.serviceSocketIsAlive = False
+            self.submissionQueue.setConnected(False)
+            self.supervisor.setDisconnected()
+            self._disconnect()
+            if not self.stopFlag.is_set():
+                delay = self.supervisor.getDelay()
+                appLogger.info(f"Reconnecting to IAS-MES in {delay:.1f}s")
+                self.stopFlag.wait(delay)
         self.stoppedSignal.emit()
 
-    def getTransportTasks(self, noOfActiveAGV):
+    def getTransportTasks(self, noOfActiveAGV, asArray=False):
         """
         Get transport tasks from IAS-MES
 
         Args:
-            noOfActiveAGV(int): number of active robotinos which can execute tasks
+            noOfActiveAGV(int): number of active robotinos which can execute tasks. Can be higher than the fleet size
+                                to build up a local backlog
+            asArray (bool, optional): If tasks should be returned as structured array instead of a set. Defaults to False
 
         Returns:
-            transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId)
+            transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId). If asArray
+                                       is set, a numpy.ndarray with the fields startId and targetId
         """
         # generate request
-        requestGenerator = ServiceRequests()
-        requestGenerator.getTransportTasks(noOfActiveAGV)
-        request = requestGenerator.encodeMessage()
+        request = self.requestFrames.getTransportTasks(noOfActiveAGV)
         try:
-            self.lock.acquire()
-            # send request
-            self.SERVICE_SOCKET.send(bytes.fromhex(request))
-            msg = self.SERVICE_SOCKET.recv(self.BUFFSIZE)
-            self.lock.release()
-            if msg:
-                responseGenerator = ServiceRequests()
-                responseGenerator.decodeMessage(binascii.hexlify(msg).decode())
-                response = responseGenerator.readTransportTasks()
-                return response
-        except BrokenPipeError:
+            response = self._serviceRequest(request)
+            if response != None and asArray:
+                return response.readTransportTasksArray()
+            elif response != None:
+                return response.readTransportTasks()
+        except ConnectionError:
             self.serviceSocketIsAlive = False
         except Exception as e:
             appLogger.error(e)
-  
 
     def moveBuf(self, robotinoId, resourceId, isLoading):
         """
@@ -105,20 +111,10 @@ class MESClient(QThread):
             resourceId (int): resourceId of resource where it loads/unloads the carrier
             isLoading (bool): if robotino loads (True) or unLoads(False) the carrier
         """
-        requestGenerator = ServiceRequests()
-        requestGenerator.moveBuf(robotinoId, resourceId, isLoading)
-        request = requestGenerator.encodeMessage()
+        request = self.requestFrames.moveBuf(robotinoId, resourceId, isLoading)
         try:
-            self.lock.acquire()
-            # send request
-            self.SERVICE_SOCKET.send(bytes.fromhex(request))
-            while True:
-                # get response and fetch transport tasks
-                msg = self.SERVICE_SOCKET.recv(self.BUFFSIZE)
-                self.lock.release()
-                if msg:
-                    return True
-        except BrokenPipeError:
+            return self._serviceRequest(request) != None
+        except ConnectionError:
             self.serviceSocketIsAlive = False
         except Exception as e:
             appLogger.error("[MESCLIENT] " + str(e))
@@ -130,20 +126,10 @@ class MESClient(QThread):
         Args:
             robotinoId (int): resourceId of robotino which buffer should be deleted
         """
-        requestGenerator = ServiceRequests()
-        requestGenerator.delBuf(robotinoId)
-        request = requestGenerator.encodeMessage()
+        request = self.requestFrames.delBuf(robotinoId)
         try:
-            self.lock.acquire()
-            # send request
-            self.SERVICE_SOCKET.send(bytes.fromhex(request))
-            while True:
-                # get response and fetch transport tasks
-                msg = self.SERVICE_SOCKET.recv(self.BUFFSIZE)
-                self.lock.release()
-                if msg:
-                    return True
-        except BrokenPipeError:
+            return self._serviceRequest(request) != None
+        except ConnectionError:
             self.serviceSocketIsAlive = False
         except Exception as e:
             appLogger.error("[MESCLIENT] " + str(e))
@@ -156,56 +142,121 @@ class MESClient(QThread):
             dockedAt (int): resourceId of resource where it is docked at (undocked: dockedAt=0)
             robotinoID (int): resourceId of robotino which has docked
         """
-        requestGenerator = ServiceRequests()
-        requestGenerator.setDockingPos(int(dockedAt), int(robotinoId))
-        request = requestGenerator.encodeMessage()
+        request = self.requestFrames.setDockingPos(dockedAt, robotinoId)
         try:
-            self.lock.acquire()
-            # send request
-            self.SERVICE_SOCKET.send(bytes.fromhex(request))
-            while True:
-                # get response and fetch transport tasks
-                msg = self.SERVICE_SOCKET.recv(self.BUFFSIZE)
-                self.lock.release()
-                if msg:
-                    return True
-        except BrokenPipeError:
+            return self._serviceRequest(request) != None
+        except ConnectionError:
             self.serviceSocketIsAlive = False
-            appLogger.error(f"Can't send message to IAS-MES: Connection is broken")
+            appLogger.error("Can't send message to IAS-MES: Connection is broken")
         except Exception as e:
             appLogger.error(str(e))
 
+    def submitMoveBuf(self, robotinoId, resourceId, isLoading):
+        """
+        Queue the information that robotino loads/unloads carrier. It is sent batched with the other state changes
+
+        Args:
+            robotinoId (int): resourceId of the robotino which loads/unloads
+            resourceId (int): resourceId of resource where it loads/unloads the carrier
+            isLoading (bool): if robotino loads (True) or unLoads(False) the carrier
+        """
+        self.submissionQueue.submit(robotinoId, self.requestFrames.moveBuf(robotinoId, resourceId, isLoading))
+
+    def submitSetDockingPos(self, dockedAt, robotinoId):
+        """
+        Queue a docking position update. Redundant updates of a robotino are coalesced before they are sent
+
+        Args:
+            dockedAt (int): resourceId of resource where it is docked at (undocked: dockedAt=0)
+            robotinoID (int): resourceId of robotino which has docked
+        """
+        request = self.requestFrames.setDockingPos(dockedAt, robotinoId)
+        self.submissionQueue.submit(robotinoId, request, dockingPos=int(dockedAt))
+
+    def _serviceRequest(self, request):
+        """
+        Sends a request over a connection of the pool and waits for its response. Requests of different threads use
+        different connections (or are pipelined on one connection, see MES_PIPELINED_REQUESTS)
+
+        Args:
+            request (bytes): encoded request
+
+        Returns:
+            MESResponse: response of the IAS-MES or None if it couldn't be decoded
+        """
+        with self.servicePool.connection() as connection:
+            return connection.request(request)
+
+    def _sendBatch(self, requests):
+        """
+        Sends several requests back-to-back in one write over a connection of the pool
+
+        Args:
+            requests (list): encoded requests
+
+        Returns:
+            bool: If all requests were answered
+
+        Raises:
+            ConnectionError: if the connection to the IAS-MES is broken
+            TimeoutError: if the IAS-MES didn't respond in time
+        """
+        try:
+            with self.servicePool.connection() as connection:
+                responses = connection.requestMany(requests)
+            return all(response != None for response in responses)
+        except (ConnectionError, TimeoutError):
+            self.serviceSocketIsAlive = False
+            appLogger.error("Can't send message to IAS-MES: Connection is broken")
+            raise
+
+    def _connect(self):
+        """
+        Connects to the cyclic port and opens the pool of the service port
+
+        Raises:
+            OSError: if the IAS-MES isn't reachable
+        """
+        self.CYCLIC_SOCKET = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.CYCLIC_SOCKET.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Set timeout for connection
+        self.CYCLIC_SOCKET.settimeout(5.0)
+        self.CYCLIC_SOCKET.connect((self.IP_MES, 2001))
+        # Reset tinmeout so socket is in blocking mode
+        self.CYCLIC_SOCKET.settimeout(None)
+        self.servicePool.open()
+
+    def _disconnect(self):
+        self.servicePool.close()
+        try:
+            self.CYCLIC_SOCKET.shutdown(socket.SHUT_RDWR)
+        except:
+            pass
+        self.CYCLIC_SOCKET.close()
+
     def cyclicCommunication(self):
         """
-        Thread for cyclically sending state of Robotinos to IAS-MES
+        Thread for cyclically sending state of Robotinos to IAS-MES. Returns when the client is stopped
+
+        Raises:
+            ConnectionError: if the connection to the IAS-MES broke
         """
-        lastUpdate = time.time()
+        self.statusPublisher.start()
         while not self.stopFlag.is_set():
-            if time.time() - lastUpdate >= 1:
-                # send task
-                for i in range(len(self.statesRobotinos)):
-                    msg = ""
-                    # resourceId of robotino
-                    msg += format(self.statesRobotinos[i].id, "04x")
-                    # sps type of robotino (set to 2 for readability)
-                    msg += format(2, "02x")
-                    # statusbits
-                    statusbits = np.array(
-                        [
-                            int(self.statesRobotinos[i].mesMode),
-                            int(self.statesRobotinos[i].errorL2),
-                            int(self.statesRobotinos[i].errorL1),
-                            int(self.statesRobotinos[i].errorL0),
-                            int(self.statesRobotinos[i].reset),
-                            int(self.statesRobotinos[i].busy),
-                            int(self.statesRobotinos[i].manualMode),
-                            int(self.statesRobotinos[i].autoMode),
-                        ]
-                    )
-                    msg += format(np.packbits(statusbits)[0], "02x")
-                    request = bytes.fromhex(msg)
-                    self.CYCLIC_SOCKET.send(request)
-                lastUpdate = time.time()
+            self.statesChanged.wait(self.statusPublisher.getDelay())
+            self.statesChanged.clear()
+            if self.stopFlag.is_set():
+                break
+            if not self.serviceSocketIsAlive:
+                raise ConnectionError("Connection to service port of IAS-MES is broken")
+            isDue = self.statusPublisher.isDue()
+            sentAt = time.monotonic()
+            # send states of all (delta mode: changed) robotinos in one write
+            states = self.statusPublisher.getFrame(self.statesRobotinos, isDue)
+            if states:
+                self.CYCLIC_SOCKET.sendall(states)
+            if isDue:
+                self.statusPublisher.setPublished(sentAt)
 
     """
     Setter
@@ -213,15 +264,30 @@ class MESClient(QThread):
 
     def setStatesRobotinos(self, states):
         self.statesRobotinos = states
+        if self.statusPublisher.deltaOnly:
+            self.statesChanged.set()
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the MESClient
+
+        Returns:
+            dict: metrics of the MESClient
+        """
+        return {
+            "frameCache": self.requestFrames.frameCache.getMetrics(),
+            "servicePool": self.servicePool.getMetrics(),
+            "submissions": self.submissionQueue.getMetrics(),
+            "statusPublisher": self.statusPublisher.getMetrics(),
+            "connection": self.supervisor.getMetrics(),
+        }
 
     def stopClient(self):
         self.stopFlag.set()
+        self.statesChanged.set()
         self.serviceSocketIsAlive = False
-        try:
-            self.SERVICE_SOCKET.shutdown(socket.SHUT_RDWR)
-            self.CYCLIC_SOCKET.shutdown(socket.SHUT_RDWR)
-        except:
-            pass
+        self.submissionQueue.stop()
+        self._disconnect()
         appLogger.info("Stopped MESClient")
 
 
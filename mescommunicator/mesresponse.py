@@ -0,0 +1,105 @@
+"""
+Filename: mesresponse.py
+Version name: 1.0, 2026-10-17
+Short description: compact record of a binary response from the mes which is decoded without copying the frame
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import sys
+from array import array
+
+from .servicerequests import (
+    BIN_BYTE_ORDER,
+    BIN_HEADER_SIZE,
+    BIN_LAYOUTS,
+    MES_FIELD_ATTRS,
+    readTransportTasks,
+    readTransportTasksArray,
+)
+from conf import appLogger
+
+# byte order of the binary format depending on the raw tcpident
+_BYTE_ORDER_BY_IDENT = {
+    bytes.fromhex(ident): byteOrder for ident, byteOrder in BIN_BYTE_ORDER.items()
+}
+_NATIVE_BYTE_ORDER = "<" if sys.byteorder == "little" else ">"
+
+
+class MESResponse(object):
+    """
+    Response of the IAS-MES in binary format. Header and standardparameter are read straight from the received buffer,
+    the serviceparams are only decoded when they are accessed
+    """
+
+    __slots__ = ("tcpIdent", "byteOrder", "_frame", "_serviceParams") + MES_FIELD_ATTRS
+
+    def __init__(self, frame, byteOrder):
+        self._frame = frame
+        self._serviceParams = None
+        self.byteOrder = byteOrder
+        values = BIN_LAYOUTS[byteOrder].unpack_from(frame)
+        self.tcpIdent = values[0].hex()
+        for attr, value in zip(MES_FIELD_ATTRS, values[1:]):
+            setattr(self, attr, value)
+
+    @classmethod
+    def fromBuffer(cls, buffer):
+        """
+        Decodes a response from the buffer in which it was received
+
+        Args:
+            buffer (bytes-like): buffer which contains exactly one frame. The buffer must not be changed while the
+                                 response is used, the serviceparams are a view of it
+
+        Returns:
+            MESResponse: decoded response or None if the buffer doesn't contain a frame in binary format
+        """
+        frame = memoryview(buffer)
+        byteOrder = _BYTE_ORDER_BY_IDENT.get(frame[:4].tobytes())
+        if byteOrder == None or len(frame) < BIN_HEADER_SIZE:
+            appLogger.warning(
+                "Error, couldn't decode response: Message isn't in binary format"
+            )
+            return None
+        return cls(frame, byteOrder)
+
+    @property
+    def serviceParams(self):
+        """
+        Servicespecific parameter as int16, decoded on first access. In native byte order they are a view of the
+        frame without copying, otherwise they are copied and byteswapped
+
+        Returns:
+            memoryview or array: serviceparams with format "H"
+        """
+        if self._serviceParams == None:
+            params = self._frame[BIN_HEADER_SIZE:]
+            params = params[: len(params) & ~1]
+            if self.byteOrder == _NATIVE_BYTE_ORDER:
+                self._serviceParams = params.cast("H")
+            else:
+                self._serviceParams = array("H")
+                self._serviceParams.frombytes(params)
+                self._serviceParams.byteswap()
+            # the serviceparams keep the part of the frame they need
+            self._frame = None
+        return self._serviceParams
+
+    def readTransportTasks(self):
+        """
+        Read the transport task from the response
+
+        Returns:
+            transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId)
+        """
+        return readTransportTasks(self.mClass, self.mNo, self.serviceParams)
+
+    def readTransportTasksArray(self):
+        """
+        Read the transport task from the response as structured array
+
+        Returns:
+            numpy.ndarray: transport tasks with the fields startId and targetId
+        """
+        return readTransportTasksArray(self.mClass, self.mNo, self.serviceParams)
@@ -0,0 +1,312 @@
+"""
+Filename: messimulator.py
+Version name: 1.0, 2026-10-17
+Short description: local stand-in of the IAS-MES for load and latency tests. Run with
+"python -m mescommunicator.messimulator" from the root of the repo
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import argparse
+import random
+import socket
+import time
+from threading import Event, Lock, Thread
+
+from .framereader import FrameReader
+from .servicerequests import ServiceRequests
+from .statusframe import STATUS_RECORD
+from conf import TCP_BUFF_SIZE, appLogger
+
+# resourceIds of the stations of the IAS-MES which can be start or target of a task
+DEFAULT_RESOURCES = (1, 2, 3, 4, 5, 6)
+
+
+class MESSimulator(object):
+    """
+    Serves the services which FleetIAS uses (200/21 getTransportTasks, 151/5 moveBuf, 151/12 delBuf and 201/1
+    setDockingPos) with the ServiceRequests codec and consumes the status stream on the cyclic port. New transport
+    tasks are generated with a fixed rate. Latency, jitter and disconnects can be injected and the service time of
+    each request is recorded
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        servicePort=2000,
+        cyclicPort=2001,
+        resources=DEFAULT_RESOURCES,
+        taskRate=0.5,
+        maxTasks=50,
+        latency=0.0,
+        jitter=0.0,
+        disconnectRate=0.0,
+        seed=None,
+    ):
+        """
+        Args:
+            host (str, optional): Address which the simulator listens on
+            servicePort (int, optional): Port of the service requests
+            cyclicPort (int, optional): Port of the cyclic status messages
+            resources (tuple, optional): resourceIds of the stations which are start or target of the tasks
+            taskRate (float, optional): New transport tasks per second
+            maxTasks (int, optional): Max number of open transport tasks
+            latency (float, optional): Delay of each response (in seconds)
+            jitter (float, optional): Max random deviation of the delay (in seconds)
+            disconnectRate (float, optional): Probability that a request isn't answered and the connection is dropped
+            seed (int, optional): Seed of the random generator, so a run can be repeated
+        """
+        self.host = host
+        self.servicePort = servicePort
+        self.cyclicPort = cyclicPort
+        self.resources = tuple(resources)
+        self.taskRate = taskRate
+        self.maxTasks = maxTasks
+        self.latency = latency
+        self.jitter = jitter
+        self.disconnectRate = disconnectRate
+        self.random = random.Random(seed)
+        self.listeners = []
+        self.connections = []
+        self.lock = Lock()
+        self.stopFlag = Event()
+        # state of the simulated IAS-MES
+        self.tasks = []
+        self.lastGeneration = time.monotonic()
+        self.dockingPositions = {}
+        self.buffers = {}
+        self.states = {}
+        # metrics: (mClass, mNo) -> list of service times in seconds
+        self.serviceTimes = {}
+        self.statusRecords = 0
+        self.disconnects = 0
+
+    def start(self):
+        """
+        Starts listening on the service and the cyclic port
+        """
+        self.stopFlag.clear()
+        self.lastGeneration = time.monotonic()
+        for port, handler in (
+            (self.servicePort, self._serveService),
+            (self.cyclicPort, self._serveCyclic),
+        ):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((self.host, port))
+            listener.listen()
+            self.listeners.append(listener)
+            Thread(target=self._accept, args=(listener, handler), daemon=True).start()
+        appLogger.info(
+            f"MES simulator listening on {self.host}:{self.servicePort} and {self.host}:{self.cyclicPort}"
+        )
+
+    def stop(self):
+        """
+        Stops listening and closes all connections
+        """
+        self.stopFlag.set()
+        for listener in self.listeners:
+            # shutdown wakes up the thread which blocks in accept
+            self._close(listener)
+        self.listeners = []
+        self.disconnect()
+
+    def disconnect(self):
+        """
+        Drops all connections of the clients, e.g. to test the reconnect of the MESClient
+        """
+        with self.lock:
+            connections, self.connections = self.connections, []
+            if connections:
+                self.disconnects += 1
+        for connection in connections:
+            self._close(connection)
+
+    def getMetrics(self):
+        """
+        Gets the recorded service times and the state of the simulator
+
+        Returns:
+            dict: count, mean, median, 99th percentile and max service time (in seconds) of each service and the
+                  number of open tasks, received status records and injected disconnects
+        """
+        with self.lock:
+            services = {}
+            for (mClass, mNo), times in self.serviceTimes.items():
+                ordered = sorted(times)
+                services[f"{mClass}/{mNo}"] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": ordered[len(ordered) // 2],
+                    "p99": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+                    "max": ordered[-1],
+                }
+            return {
+                "services": services,
+                "openTasks": len(self.tasks),
+                "statusRecords": self.statusRecords,
+                "disconnects": self.disconnects,
+            }
+
+    def _accept(self, listener, handler):
+        while not self.stopFlag.is_set():
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.connections.append(connection)
+            Thread(target=handler, args=(connection,), daemon=True).start()
+
+    def _serveService(self, connection):
+        """
+        Thread which answers the service requests of one connection
+        """
+        frameReader = FrameReader(connection, TCP_BUFF_SIZE)
+        while not self.stopFlag.is_set():
+            try:
+                frame = frameReader.readFrame()
+            except (OSError, ValueError):
+                break
+            receivedAt = time.monotonic()
+            request = ServiceRequests()
+            request.decodeBytes(frame)
+
+            if self.disconnectRate and self.random.random() < self.disconnectRate:
+                with self.lock:
+                    self.disconnects += 1
+                break
+            response = self._handle(request)
+            delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                connection.sendall(response.encodeBytes())
+            except OSError:
+                break
+            with self.lock:
+                self.serviceTimes.setdefault((request.mClass, request.mNo), []).append(
+                    time.monotonic() - receivedAt
+                )
+        self._close(connection)
+
+    def _serveCyclic(self, connection):
+        """
+        Thread which consumes the status stream of one connection
+        """
+        pending = b""
+        while not self.stopFlag.is_set():
+            try:
+                data = connection.recv(TCP_BUFF_SIZE)
+            except OSError:
+                break
+            if not data:
+                break
+            pending += data
+            length = len(pending) - len(pending) % STATUS_RECORD.size
+            with self.lock:
+                for id, _, status in STATUS_RECORD.iter_unpack(pending[:length]):
+                    self.states[id] = status
+                    self.statusRecords += 1
+            pending = pending[length:]
+        self._close(connection)
+
+    def _handle(self, request):
+        """
+        Executes a service request on the simulated state
+
+        Args:
+            request (ServiceRequests): the decoded request
+
+        Returns:
+            ServiceRequests: the response. Header is echoed (incl. RequestId), ErrorState is set for unknown services
+        """
+        params = list(request.serviceParams)
+        request.serviceParams = []
+        with self.lock:
+            if request.mClass == 200 and request.mNo == 21:
+                self._generateTasks()
+                for startId, targetId in self.tasks[: request.maxRecords]:
+                    request.serviceParams += [startId, 0, 0, 0, targetId, 0, 0, 0]
+            elif request.mClass == 151 and request.mNo == 5 and len(params) >= 4:
+                source, target = params[0], params[3]
+                self.buffers[target] = self.buffers.pop(source, True)
+                # task is picked up when the carrier is loaded at its start
+                for task in self.tasks:
+                    if task[0] == source:
+                        self.tasks.remove(task)
+                        break
+            elif request.mClass == 151 and request.mNo == 12:
+                self.buffers.pop(request.resourceId, None)
+            elif request.mClass == 201 and request.mNo == 1:
+                self.dockingPositions[request.aux1Int] = request.resourceId
+            else:
+                request.errorState = 1
+        request.dataLength = 2 * len(request.serviceParams)
+        return request
+
+    def _generateTasks(self):
+        """
+        Generates the transport tasks which arrived since the last call. Must be called while holding the lock
+        """
+        now = time.monotonic()
+        count = int((now - self.lastGeneration) * self.taskRate)
+        if count == 0:
+            return
+        self.lastGeneration += count / self.taskRate
+        for _ in range(count):
+            if len(self.tasks) >= self.maxTasks:
+                break
+            self.tasks.append(tuple(self.random.sample(self.resources, 2)))
+
+    def _close(self, connection):
+        with self.lock:
+            if connection in self.connections:
+                self.connections.remove(connection)
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in of the IAS-MES")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--task-rate", type=float, default=0.5, help="new transport tasks per second"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="delay of each response in seconds"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="max random deviation of the delay in seconds",
+    )
+    parser.add_argument(
+        "--disconnect-rate",
+        type=float,
+        default=0.0,
+        help="probability to drop a request",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = MESSimulator(
+        host=args.host,
+        taskRate=args.task_rate,
+        latency=args.latency,
+        jitter=args.jitter,
+        disconnectRate=args.disconnect_rate,
+        seed=args.seed,
+    )
+    simulator.start()
+    try:
+        while True:
+            time.sleep(10)
+            print(simulator.getMetrics())
+    except KeyboardInterrupt:
+        simulator.stop()
@@ -0,0 +1,270 @@
+"""
+Filename: serviceconnection.py
+Version name: 1.0, 2026-10-17
+Short description: connection to the service port of the mes which can pipeline requests
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import itertools
+import socket
+import struct
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from threading import Lock, Thread
+
+from .framereader import FrameReader
+from .mesresponse import MESResponse
+from .servicerequests import BIN_BYTE_ORDER, MES_FIELDS_BY_ATTR
+from conf import MES_PIPELINED_REQUESTS, MES_REQUEST_TIMEOUT, TCP_BUFF_SIZE, appLogger
+
+_BYTE_ORDER_BY_IDENT = {
+    bytes.fromhex(ident): byteOrder for ident, byteOrder in BIN_BYTE_ORDER.items()
+}
+_REQUEST_ID = MES_FIELDS_BY_ATTR["requestID"]
+_REQUEST_ID_LAYOUTS = {
+    byteOrder: struct.Struct(byteOrder + "H")
+    for byteOrder in _BYTE_ORDER_BY_IDENT.values()
+}
+
+
+def stampRequestId(frame, requestId):
+    """
+    Writes the RequestId into the header of a frame
+
+    Args:
+        frame (bytes): encoded request
+        requestId (int): RequestId which is written into the frame
+
+    Returns:
+        bytearray: the stamped frame
+    """
+    frame = bytearray(frame)
+    byteOrder = _BYTE_ORDER_BY_IDENT[bytes(frame[:4])]
+    _REQUEST_ID_LAYOUTS[byteOrder].pack_into(frame, _REQUEST_ID.offset, requestId)
+    return frame
+
+
+class ServiceConnection(object):
+    """
+    Connection to the service port of the IAS-MES. In lock-step mode each request blocks the connection until its
+    response is received. In pipelined mode each request is stamped with an unique RequestId, several requests can be
+    in flight and a single reader thread routes the responses by their RequestId to the waiting requests. Pipelining
+    requires that the IAS-MES echoes the RequestId of a request in its response
+    """
+
+    def __init__(
+        self,
+        address,
+        pipelined=MES_PIPELINED_REQUESTS,
+        bufferSize=TCP_BUFF_SIZE,
+        timeout=MES_REQUEST_TIMEOUT,
+    ):
+        self.address = address
+        self.pipelined = pipelined
+        self.bufferSize = bufferSize
+        self.timeout = timeout
+        self.sock = None
+        self.frameReader = None
+        self.isAlive = False
+        # lock-step: lock for the whole round trip. pipelined: lock for sending
+        self.lock = Lock()
+        # pipelined: requestId -> Future of the request which waits for the response
+        self.pending = {}
+        self.pendingLock = Lock()
+        self._requestIds = itertools.cycle(range(1, 0x10000))
+        self.readerThread = None
+
+    def connect(self, timeout=5.0):
+        """
+        Connects to the IAS-MES
+
+        Args:
+            timeout (float, optional): Timeout for establishing the connection in seconds. Defaults to 5.0
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.address)
+        # lock-step: reads time out after the request timeout. pipelined: the reader thread blocks, the timeout is
+        # applied to the futures of the requests
+        self.sock.settimeout(None if self.pipelined else self.timeout)
+        self.frameReader = FrameReader(self.sock, self.bufferSize)
+        self.isAlive = True
+        if self.pipelined:
+            self.readerThread = Thread(target=self._readResponses, daemon=True)
+            self.readerThread.start()
+
+    def close(self):
+        """
+        Closes the connection. Requests which are still waiting for a response fail with a ConnectionError
+        """
+        self.isAlive = False
+        if self.sock != None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except:
+                pass
+            self.sock.close()
+        self._failPending(ConnectionError("Connection to IAS-MES was closed"))
+
+    def request(self, frame):
+        """
+        Sends a request and waits for its response
+
+        Args:
+            frame (bytes): encoded request
+
+        Returns:
+            MESResponse: response of the IAS-MES or None if it couldn't be decoded
+
+        Raises:
+            ConnectionError: if the connection is broken
+            TimeoutError: if the IAS-MES didn't respond in time. The connection is closed in lock-step mode
+        """
+        if not self.pipelined:
+            with self.lock:
+                try:
+                    self.sock.sendall(frame)
+                    return MESResponse.fromBuffer(self.frameReader.readFrame())
+                except socket.timeout:
+                    self._closeOutOfSync()
+                    raise TimeoutError("IAS-MES didn't respond to request in time")
+
+        future = self.submit(frame)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            self._discard(future)
+            raise TimeoutError("IAS-MES didn't respond to request in time")
+
+    def requestMany(self, frames):
+        """
+        Sends several requests back-to-back in one write and waits for their responses
+
+        Args:
+            frames (list): encoded requests
+
+        Returns:
+            list: MESResponse of each request in the order of the requests (None if it couldn't be decoded)
+
+        Raises:
+            ConnectionError: if the connection is broken
+            TimeoutError: if the IAS-MES didn't respond in time. The connection is closed in lock-step mode
+        """
+        if not self.pipelined:
+            with self.lock:
+                try:
+                    self.sock.sendall(b"".join(frames))
+                    return [
+                        MESResponse.fromBuffer(self.frameReader.readFrame())
+                        for _ in frames
+                    ]
+                except socket.timeout:
+                    self._closeOutOfSync()
+                    raise TimeoutError("IAS-MES didn't respond to requests in time")
+
+        futures = self.submitMany(frames)
+        deadline = time.monotonic() + self.timeout
+        try:
+            return [
+                future.result(max(deadline - time.monotonic(), 0)) for future in futures
+            ]
+        except FutureTimeoutError:
+            for future in futures:
+                self._discard(future)
+            raise TimeoutError("IAS-MES didn't respond to requests in time")
+
+    def submit(self, frame):
+        """
+        Sends a request without waiting for its response. Only in pipelined mode
+
+        Args:
+            frame (bytes): encoded request
+
+        Returns:
+            Future: resolves to the MESResponse of the request
+        """
+        return self.submitMany([frame])[0]
+
+    def submitMany(self, frames):
+        """
+        Sends several requests in one write without waiting for their responses. Only in pipelined mode
+
+        Args:
+            frames (list): encoded requests
+
+        Returns:
+            list: Future of each request which resolves to its MESResponse
+        """
+        futures = []
+        stamped = []
+        with self.lock:
+            for frame in frames:
+                future = Future()
+                future.requestId = next(self._requestIds)
+                with self.pendingLock:
+                    self.pending[future.requestId] = future
+                futures.append(future)
+                stamped.append(stampRequestId(frame, future.requestId))
+            try:
+                self.sock.sendall(b"".join(stamped))
+            except Exception:
+                for future in futures:
+                    self._discard(future)
+                raise
+        return futures
+
+    def getPendingCount(self):
+        """
+        Returns:
+            int: number of requests which are in flight
+        """
+        return len(self.pending)
+
+    def _readResponses(self):
+        """
+        Thread which reads the responses in pipelined mode and routes them to the waiting requests
+        """
+        while self.isAlive:
+            try:
+                response = MESResponse.fromBuffer(self.frameReader.readFrame())
+            except ValueError as e:
+                appLogger.error(e)
+                continue
+            except Exception as e:
+                if self.isAlive:
+                    appLogger.error(f"Connection to IAS-MES is broken: {e}")
+                self.isAlive = False
+                self._failPending(ConnectionError("Connection to IAS-MES is broken"))
+                break
+            if response == None:
+                continue
+            with self.pendingLock:
+                future = self.pending.pop(response.requestID, None)
+            if future != None:
+                future.set_result(response)
+            else:
+                appLogger.warning(
+                    f"Received response for unknown RequestId {response.requestID}"
+                )
+
+    def _closeOutOfSync(self):
+        """
+        Closes the connection after a request timed out in lock-step mode. A late response would be read as the
+        response of the next request, so the connection can't be used anymore
+        """
+        appLogger.error("IAS-MES didn't respond in time, closing the connection")
+        self.close()
+
+    def _discard(self, future):
+        with self.pendingLock:
+            self.pending.pop(future.requestId, None)
+
+    def _failPending(self, exception):
+        with self.pendingLock:
+            pending = list(self.pending.values())
+            self.pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(exception)
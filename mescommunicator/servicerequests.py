@@ -6,9 +6,172 @@ Short description: servicerequests which can be send and received to mes
 (C) 2003-2021 IAS, Universitaet Stuttgart
 
 """
-import math
+import numpy as np
+import struct
+from collections import namedtuple
+from operator import attrgetter
+
 from conf import appLogger
 
+# Standard parameter of the IAS-MES in the order they are send. Each field is described by its parametername
+# in the string formats, the attribute of ServiceRequests, the offset and width (in bytes) in the binary format and
+# if it is signed. The schema drives the binary, the full string and the shortened string format
+MESField = namedtuple("MESField", ["name", "attr", "offset", "width", "signed"])
+MES_FIELDS = (
+    # header
+    MESField("RequestId", "requestID", 4, 2, False),
+    MESField("MClass", "mClass", 6, 2, False),
+    MESField("MNo", "mNo", 8, 2, False),
+    MESField("ErrorState", "errorState", 10, 2, False),
+    MESField("DataLength", "dataLength", 12, 2, False),
+    # standardparameter
+    MESField("ResourceID", "resourceId", 14, 2, False),
+    MESField("ONo", "oNo", 16, 4, False),
+    MESField("OPos", "oPos", 20, 2, False),
+    MESField("WPNo", "wpNo", 22, 2, False),
+    MESField("OpNo", "opNo", 24, 2, False),
+    MESField("BufNo", "bufNo", 26, 2, False),
+    MESField("BufPos", "bufPos", 28, 2, False),
+    MESField("CarrierID", "carrierId", 30, 2, False),
+    MESField("PalletID", "palletID", 32, 2, False),
+    MESField("PalletPos", "palletPos", 34, 2, False),
+    MESField("PNo", "pNo", 36, 4, False),
+    MESField("StopperID", "stopperId", 40, 2, False),
+    MESField("ErrorStepNo", "errorStepNo", 42, 2, False),
+    MESField("StepNo", "stepNo", 44, 2, False),
+    MESField("MaxRecords", "maxRecords", 46, 2, False),
+    MESField("BoxID", "boxId", 48, 2, False),
+    MESField("BoxPos", "boxPos", 50, 2, False),
+    MESField("MainOPos", "mainOPos", 52, 2, False),
+    MESField("BeltNo", "beltNo", 54, 2, False),
+    MESField("CNo", "cNo", 56, 4, False),
+    MESField("BoxPNo", "boxPNo", 60, 4, False),
+    MESField("PalletPNo", "palletPNo", 64, 4, False),
+    MESField("Aux1Int", "aux1Int", 68, 2, True),
+    MESField("Aux2Int", "aux2Int", 70, 2, True),
+    MESField("Aux1DInt", "aux1DInt", 72, 4, True),
+    MESField("Aux2DInt", "aux2DInt", 76, 4, True),
+    MESField("MainPNo", "mainPNo", 80, 4, False),
+)
+# lookup of the fields by their parametername for decoding the full string format
+MES_FIELDS_BY_NAME = {field.name: field for field in MES_FIELDS}
+MES_FIELDS_BY_ATTR = {field.attr: field for field in MES_FIELDS}
+MES_FIELD_ATTRS = tuple(field.attr for field in MES_FIELDS)
+_getFieldValues = attrgetter(*MES_FIELD_ATTRS)
+
+# Byte order of the binary format depending on the tcpident (struct notation)
+BIN_BYTE_ORDER = {"33333301": "<", "33333302": ">"}
+BIN_IDENTS = {
+    byteOrder: bytes.fromhex(ident) for ident, byteOrder in BIN_BYTE_ORDER.items()
+}
+# tcpident, standardparameter and reserved bytes
+BIN_HEADER_SIZE = 128
+
+# transport tasks returned by readTransportTasksArray
+TRANSPORT_TASK_DTYPE = np.dtype([("startId", np.uint16), ("targetId", np.uint16)])
+
+
+def structFormat(field):
+    """
+    Gets the struct format character of a field
+
+    Args:
+        field (MESField): field of the schema
+
+    Returns:
+        str: struct format character
+    """
+    fmt = {2: "h", 4: "i"}[field.width]
+    return fmt if field.signed else fmt.upper()
+
+
+def _binLayout(byteOrder):
+    """
+    Precompiles the layout of tcpident and standardparameter of the binary format from the schema
+
+    Args:
+        byteOrder (str): struct byte order character
+
+    Returns:
+        struct.Struct: compiled layout which covers the first BIN_HEADER_SIZE bytes of a frame
+    """
+    fmt = byteOrder + "4s"
+    position = 4
+    for field in sorted(MES_FIELDS, key=lambda field: field.offset):
+        if field.offset > position:
+            fmt += f"{field.offset - position}x"
+        fmt += structFormat(field)
+        position = field.offset + field.width
+    fmt += f"{BIN_HEADER_SIZE - position}x"
+    return struct.Struct(fmt)
+
+
+BIN_LAYOUTS = {byteOrder: _binLayout(byteOrder) for byteOrder in BIN_IDENTS}
+
+
+def readTransportTasksArray(mClass, mNo, serviceParams):
+    """
+    Read the transport tasks from the serviceparams of an response from the IAS-MES. Each task is a record of 8
+    serviceparams where the first is the startId and the fifth the targetId. All records are processed at once,
+    so it also scales for responses with a lot of records
+
+    Args:
+        mClass (int): serviceclass of the response
+        mNo (int): servicenumber of the response
+        serviceParams (sequence of int): serviceparams of the response
+
+    Returns:
+        numpy.ndarray: unique transport tasks with dtype TRANSPORT_TASK_DTYPE. Empty if data isnt a transport task
+    """
+    # check if data is a transport task
+    if not (mClass == 200 and mNo == 21):
+        appLogger.warning("Received data isnt a transport task")
+        return np.empty(0, dtype=TRANSPORT_TASK_DTYPE)
+    params = np.asarray(serviceParams, dtype=np.uint16)
+    records = params[: len(params) - len(params) % 8].reshape(-1, 8)
+    startIds = records[:, 0]
+    targetIds = records[:, 4]
+    # only keep tasks where startId and targetId are valid
+    isValid = (startIds != 0) & (targetIds != 0) & (startIds != targetIds)
+    transportTasks = np.empty(np.count_nonzero(isValid), dtype=TRANSPORT_TASK_DTYPE)
+    transportTasks["startId"] = startIds[isValid]
+    transportTasks["targetId"] = targetIds[isValid]
+    return np.unique(transportTasks)
+
+
+def transportTasksToSet(transportTasks):
+    """
+    Converts transport tasks from readTransportTasksArray to a set
+
+    Args:
+        transportTasks (numpy.ndarray): transport tasks with dtype TRANSPORT_TASK_DTYPE
+
+    Returns:
+        transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId)
+    """
+    return set(
+        zip(transportTasks["startId"].tolist(), transportTasks["targetId"].tolist())
+    )
+
+
+def readTransportTasks(mClass, mNo, serviceParams):
+    """
+    Read the transport task from the serviceparams of an response from the IAS-MES
+
+    Args:
+        mClass (int): serviceclass of the response
+        mNo (int): servicenumber of the response
+        serviceParams (sequence of int): serviceparams of the response
+
+    Returns:
+        transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId)
+    """
+    if mClass == 200 and mNo == 21:
+        return transportTasksToSet(readTransportTasksArray(mClass, mNo, serviceParams))
+    else:
+        appLogger.warning("Received data isnt a transport task")
+        return [(0, 0)]
+
 
 class ServiceRequests(object):
     def __init__(self):
@@ -69,20 +232,16 @@ class ServiceRequests(object):
         Args:
             transportTasks (int, int): set of transport tasks, each item is a tupel with: (startId, targetId)
         """
-        # check if data is a transport task
-        if self.mClass == 200 and self.mNo == 21:
-            transportTasks = set()
-            for i in range(int(len(self.serviceParams) / 8)):
-                startId = self.serviceParams[8 * i]
-                targetId = self.serviceParams[8 * i + 4]
-                task = (startId, targetId)
-                # add task to transport task if startId and targetId are valid
-                if startId != 0 and targetId != 0 and startId != targetId:
-                    transportTasks.add(task)
-            return transportTasks
-        else:
-            appLogger.warning("Received data isnt a transport task")
-            return [(0, 0)]
+        return readTransportTasks(self.mClass, self.mNo, self.serviceParams)
+
+    def readTransportTasksArray(self):
+        """
+        Read the transport task from an response from the IAS-MES as structured array
+
+        Returns:
+            numpy.ndarray: transport tasks with the fields startId and targetId
+        """
+        return readTransportTasksArray(self.mClass, self.mNo, self.serviceParams)
 
     def setDockingPos(self, dockedAt, robotinoID):
         """
@@ -146,8 +305,8 @@ class ServiceRequests(object):
         """
         self.msg = msg
         if msg[:6] == "333333":
-            self._decodeBin()
-        elif "<CR>" in msg and len(msg.split("<CR>")) > 3:
+            self.decodeBytes(bytes.fromhex(msg))
+        elif msg.count("<CR>") > 2:
             # msg is in shortened string format
             self._decodeStrShort()
         elif "=" in msg:
@@ -162,9 +321,9 @@ class ServiceRequests(object):
         Encodes message for PlcServiceOrderSocket in a format so it can be send
 
         Returns:
-            str: Encoded message
+            str: Encoded message as hex string
         """
-        return self._encodeBin()
+        return self.encodeBytes().hex()
 
     def _encodeStrFull(self):
         """
@@ -173,170 +332,37 @@ class ServiceRequests(object):
         Args:
             Takes all the neccessary attributes of the Object and parses them
         """
-        # Header
-        msg = str(self.tcpIdent)
-        if self.requestID != 0:
-            msg += ";RequestId=" + str(self.requestID)
-        if self.mClass != 0:
-            msg += ";MClass=" + str(self.mClass)
-        if self.mNo != 0:
-            msg += ";MNo=" + str(self.mNo)
-        if self.errorState != 0:
-            msg += ";ErrorState=" + str(self.errorState)
-        if self.dataLength != 0:
-            msg += ";DataLength=" + str(self.dataLength)
-
-        # standardparameter
-        if self.resourceId != 0:
-            msg += ";ResourceID=" + str(self.resourceId)
-        if self.oNo != 0:
-            msg += ";ONo=" + str(self.oNo)
-        if self.oPos != 0:
-            msg += ";OPos=" + str(self.oPos)
-        if self.wpNo != 0:
-            msg += ";WPNo=" + str(self.wpNo)
-        if self.opNo != 0:
-            msg += ";OpNo=" + str(self.opNo)
-        if self.bufNo != 0:
-            msg += ";BufNo=" + str(self.bufNo)
-        if self.bufPos != 0:
-            msg += ";BufPos=" + str(self.bufPos)
-        if self.carrierId != 0:
-            msg += ";CarrierID=" + str(self.carrierId)
-        if self.palletID != 0:
-            msg += ";PalletID=" + str(self.palletID)
-        if self.palletPos != 0:
-            msg += ";PalletPos=" + str(self.palletPos)
-        if self.pNo != 0:
-            msg += ";PNo=" + str(self.pNo)
-        if self.stopperId != 0:
-            msg += ";StopperID=" + str(self.stopperId)
-        if self.errorStepNo != 0:
-            msg += ";ErrorStepNo=" + str(self.errorStepNo)
-        if self.stepNo != 0:
-            msg += ";StepNo=" + str(self.stepNo)
-        if self.maxRecords != 0:
-            msg += ";MaxRecords=" + str(self.maxRecords)
-        if self.boxId != 0:
-            msg += ";BoxID=" + str(self.boxId)
-        if self.boxPos != 0:
-            msg += ";BoxPos=" + str(self.boxPNo)
-        if self.mainOPos != 0:
-            msg += ";MainOPos=" + str(self.mainOPos)
-        if self.beltNo != 0:
-            msg += ";BeltNo=" + str(self.beltNo)
-        if self.cNo != 0:
-            msg += ";CNo=" + str(self.cNo)
-        if self.boxPNo != 0:
-            msg += ";BoxPNo=" + str(self.boxPNo)
-        if self.palletPNo != 0:
-            msg += ";PalletPNo=" + str(self.palletPNo)
-        if self.aux1Int != 0:
-            msg += ";Aux1Int=" + str(self.aux1Int)
-        if self.aux2Int != 0:
-            msg += ";Aux2Int=" + str(self.aux2Int)
-        if self.aux1DInt != 0:
-            msg += ";Aux1DInt=" + str(self.aux1DInt)
-        if self.aux2DInt != 0:
-            msg += ";Aux2DInt=" + str(self.aux2DInt)
-        if self.mainPNo != 0:
-            msg += ";MainPNo=" + str(self.mainPNo)
-
+        msg = [str(self.tcpIdent)]
+        # header and standardparameter which are set
+        for field, value in zip(MES_FIELDS, _getFieldValues(self)):
+            if value != 0:
+                msg.append(f"{field.name}={value}")
         # service specific paramter. Each parameter is a 2 tuple with (parametername, parameter)
         for item in self.serviceParams:
-            msg += ";" + item[0] + "=" + item[1]
+            msg.append(f"{item[0]}={item[1]}")
 
         # evry message ends with <CR>
-        msg += "<CR>"
-        return msg
+        return ";".join(msg) + "<CR>"
 
     def _decodeStrFull(self):
         """
-        Encodes message in binary format.
+        Decodes message in full string format. Each parameter is looked up by its name in the schema
 
         Args:
             Takes all the neccessary attributes of the Object and parses them
         """
-        # split parameter
-        msg = self.msg.split(";")
-        # saving all parameter into object
-        for item in msg:
-            # Header
-            param = item.split("=")
-            # replace <CR> if its in item
-            if len(param) == 2:
-                if "<CR>" in param[1]:
-                    param[1] = param[1].replace("<CR>", "")
-            if "444" in item or "445" in item:
-                self.tcpIdent = int(item)
-            elif "RequestId" in item:
-                self.requestID = param[1]
-            elif "MClass" in item:
-                self.mClass = param[1]
-            elif "MNo" in item:
-                self.mNo = param[1]
-            elif "ErrorState" in item:
-                self.errorState = param[1]
-            elif "DataLength" in item:
-                self.dataLength = param[1]
-
-            # standardparameter
-            elif "ResourceID" in item:
-                self.resourceId = param[1]
-            elif "ONo" in item:
-                self.oNo = param[1]
-            elif "OPos" in item:
-                self.oPos = param[1]
-            elif "wpNo" in item:
-                self.wpNo = param[1]
-            elif "OpNo" in item:
-                self.opNo = param[1]
-            elif "BufNo" in item:
-                self.bufNo = param[1]
-            elif "BufPos" in item:
-                self.bufPos = param[1]
-            elif "CarrierID" in item:
-                self.carrierId = param[1]
-            elif "PalletID" in item:
-                self.palletID = param[1]
-            elif "PalletPos" in item:
-                self.palletPos = param[1]
-            elif "PNo" in item:
-                self.pNo = param[1]
-            elif "StopperID" in item:
-                self.stopperId = param[1]
-            elif "ErrorStepNo" in item:
-                self.errorStepNo = param[1]
-            elif "StepNo" in item:
-                self.stepNo = param[1]
-            elif "MaxRecords" in item:
-                self.maxRecords = param[1]
-            elif "BoxID" in item:
-                self.boxId = param[1]
-            elif "BoxPos" in item:
-                self.boxPos = param[1]
-            elif "MainOPos" in item:
-                self.mainOPos = param[1]
-            elif "BeltNo" in item:
-                self.beltNo = param[1]
-            elif "CNo" in item:
-                self.cNo = param[1]
-            elif "BoxPNo" in item:
-                self.boxPNo = param[1]
-            elif "PalletPNo=" in item:
-                self.palletPNo = param[1]
-            elif "Aux1Int" in item:
-                self.aux1Int = param[1]
-            elif "Aux2Int" in item:
-                self.aux2Int = param[1]
-            elif "Aux1DInt" in item:
-                self.aux1DInt = param[1]
-            elif "Aux2DInt" in item:
-                self.aux2DInt = param[1]
-            elif "MainPNo" in item:
-                self.mainPNo = param[1]
+        for item in self.msg.replace("<CR>", "").split(";"):
+            name, isParam, value = item.partition("=")
+            if not isParam:
+                # tcpident is the only item without a value
+                if "444" in item or "445" in item:
+                    self.tcpIdent = int(item)
+                continue
+            field = MES_FIELDS_BY_NAME.get(name)
+            if field != None:
+                setattr(self, field.attr, int(value))
             else:
-                self.serviceParams.append((param[0], param[1]))
+                self.serviceParams.append((name, value))
 
     def _encodeStrShort(self):
         """
@@ -345,253 +371,112 @@ class ServiceRequests(object):
         Args:
             Takes all the neccessary attributes of the Object and parses them
         """
-        # header
-        msg = "445<CR>"
-        msg += str(self.requestID) + "<CR>"
-        msg += str(self.mClass) + "<CR>"
-        msg += str(self.mNo) + "<CR>"
-        msg += str(self.errorState) + "<CR>"
-        msg += str(self.dataLength) + "<CR>"
-
-        # standard parameter
-        msg += str(self.resourceId) + "<CR>"
-        msg += str(self.oNo) + "<CR>"
-        msg += str(self.oPos) + "<CR>"
-        msg += str(self.wpNo) + "<CR>"
-        msg += str(self.opNo) + "<CR>"
-        msg += str(self.bufNo) + "<CR>"
-        msg += str(self.bufPos) + "<CR>"
-        msg += str(self.carrierId) + "<CR>"
-        msg += str(self.palletID) + "<CR>"
-        msg += str(self.palletPos) + "<CR>"
-        msg += str(self.pNo) + "<CR>"
-        msg += str(self.stopperId) + "<CR>"
-        msg += str(self.errorStepNo) + "<CR>"
-        msg += str(self.stepNo) + "<CR>"
-        msg += str(self.maxRecords) + "<CR>"
-        msg += str(self.boxId) + "<CR>"
-        msg += str(self.boxPos) + "<CR>"
-        msg += str(self.mainOPos) + "<CR>"
-        msg += str(self.beltNo) + "<CR>"
-        msg += str(self.cNo) + "<CR>"
-        msg += str(self.boxPNo) + "<CR>"
-        msg += str(self.palletPNo) + "<CR>"
-        msg += str(self.aux1Int) + "<CR>"
-        msg += str(self.aux2Int) + "<CR>"
-        msg += str(self.aux1DInt) + "<CR>"
-        msg += str(self.aux2DInt) + "<CR>"
-        msg += str(self.mainPNo) + "<CR>"
-
+        msg = ["445"]
+        # header and standard parameter
+        msg.extend(str(value) for value in _getFieldValues(self))
         # service-specific parameter
-        for item in self.serviceParams:
-            msg += str(item) + "<CR>"
-        return msg
+        msg.extend(str(item) for item in self.serviceParams)
+        return "<CR>".join(msg) + "<CR>"
 
     def _decodeStrShort(self):
-        bytes = self.msg.split("<CR>")
-
-        self.requestID = bytes[1]
-        self.mClass = bytes[2]
-        self.mNo = bytes[3]
-        self.errorState = bytes[4]
-        self.dataLength = bytes[5]
-
-        # standard parameter
-        self.resourceId = bytes[6]
-        self.oNo = bytes[7]
-        self.oPos = bytes[8]
-        self.wpNo = bytes[9]
-        self.opNo = bytes[10]
-        self.bufNo = bytes[11]
-        self.bufPos = bytes[12]
-        self.carrierId = bytes[13]
-        self.palletID = bytes[14]
-        self.palletPos = bytes[15]
-        self.pNo = bytes[16]
-        self.stopperId = bytes[17]
-        self.errorStepNo = bytes[18]
-        self.stepNo = bytes[19]
-        self.maxRecords = bytes[20]
-        self.boxId = bytes[21]
-        self.boxPos = bytes[22]
-        self.mainOPos = bytes[23]
-        self.beltNo = bytes[24]
-        self.cNo = bytes[25]
-        self.boxPNo = bytes[26]
-        self.palletPNo = bytes[27]
-        self.aux1Int = bytes[28]
-        self.aux2Int = bytes[29]
-        self.aux1DInt = bytes[30]
-        self.aux2DInt = bytes[31]
-        self.mainPNo = bytes[32]
-
-        if len(bytes) >= 33:
-            for i in range(33, len(bytes)):
-                self.serviceParams.append(bytes[i])
-
-    def _encodeBin(self):
-        # Header
-        msg = str(self.tcpIdent)
-        msg += self._parseToEndian(self.requestID, False)
-        msg += self._parseToEndian(self.mClass, False)
-        msg += self._parseToEndian(self.mNo, False)
-        msg += self._parseToEndian(self.errorState, False)
-        msg += self._parseToEndian(self.dataLength, False)
-
-        # standardparameter
-        msg += self._parseToEndian(self.resourceId, False)
-        msg += self._parseToEndian(self.oNo, True)
-        msg += self._parseToEndian(self.oPos, False)
-        msg += self._parseToEndian(self.wpNo, False)
-        msg += self._parseToEndian(self.opNo, False)
-        msg += self._parseToEndian(self.bufNo, False)
-        msg += self._parseToEndian(self.bufPos, False)
-        msg += self._parseToEndian(self.carrierId, False)
-        msg += self._parseToEndian(self.palletID, False)
-        msg += self._parseToEndian(self.palletPos, False)
-        msg += self._parseToEndian(self.pNo, True)
-        msg += self._parseToEndian(self.stopperId, False)
-        msg += self._parseToEndian(self.errorStepNo, False)
-        msg += self._parseToEndian(self.stepNo, False)
-        msg += self._parseToEndian(self.maxRecords, False)
-        msg += self._parseToEndian(self.boxId, False)
-        msg += self._parseToEndian(self.boxPos, False)
-        msg += self._parseToEndian(self.mainOPos, False)
-        msg += self._parseToEndian(self.beltNo, False)
-        msg += self._parseToEndian(self.cNo, True)
-        msg += self._parseToEndian(self.boxPNo, True)
-        msg += self._parseToEndian(self.palletPNo, True)
-        msg += self._parseToEndian(self.aux1Int, False)
-        msg += self._parseToEndian(self.aux2Int, False)
-        msg += self._parseToEndian(self.aux1DInt, True)
-        msg += self._parseToEndian(self.aux2DInt, True)
-        msg += self._parseToEndian(self.mainPNo, True)
-        # standardparameter bytes reserved
-        for item in range(44):
-            msg += "00"
-
-        # servicespecific parameter, could be to be parsed diffrently odepending on request
-        # encoding for getBufForBufNo
-        if self.mClass == 150 and self.mNo == 1:
-            msg += self._parseToEndian(self.serviceParams[0], False)
-            msg += self._parseToEndian(self.serviceParams[1], False)
-            msg += self._parseToEndian(self.serviceParams[2], True)
-            msg += self._parseToEndian(self.serviceParams[3], True)
-            msg += self._parseToEndian(self.serviceParams[4], False)
-        # getUnknownParts
-        elif self.mClass == 200 and self.mNo == 5:
-            for i in range(math.ceil(len(self.serviceParams) / 35)):
-                for j in range(35):
-                    if j == 0:
-                        msg += self._parseToEndian(self.serviceParams[j + 35 * i], True)
-                    else:
-                        if len(self.serviceParams) > (j + 35 * i):
-                            msg += format(self.serviceParams[j + 35 * i], "02x")
-        elif self.mClass == 100 and self.mNo == 111:
-            for i in range(len(self.serviceParams)):
-                msg += format(self.serviceParams[i], "02x")
-        else:
-            for i in range(len(self.serviceParams)):
-                msg += self._parseToEndian(self.serviceParams[i], False)
-
-        return msg
-
-    def _decodeBin(self):
-        # header
-        bytes = list((self.msg[i : i + 2] for i in range(0, len(self.msg), 2)))
-        self.requestID = self._parseFromEndian(bytes[4:6])
-        self.mClass = self._parseFromEndian(bytes[6:8])
-        self.mNo = self._parseFromEndian(bytes[8:10])
-        self.errorState = self._parseFromEndian(bytes[10:12])
-        self.dataLength = self._parseFromEndian(bytes[12:14])
-
-        # standard parameter
-        self.resourceId = self._parseFromEndian(bytes[14:16])
-        self.oNo = self._parseFromEndian(bytes[16:20])
-        self.oPos = self._parseFromEndian(bytes[20:22])
-        self.wpNo = self._parseFromEndian(bytes[22:24])
-        self.opNo = self._parseFromEndian(bytes[24:26])
-        self.bufNo = self._parseFromEndian(bytes[26:28])
-        self.bufPos = self._parseFromEndian(bytes[28:30])
-        self.carrierId = self._parseFromEndian(bytes[30:32])
-        self.palletID = self._parseFromEndian(bytes[32:34])
-        self.palletPos = self._parseFromEndian(bytes[34:36])
-        self.pNo = self._parseFromEndian(bytes[36:40])
-        self.stopperId = self._parseFromEndian(bytes[40:42])
-        self.errorStepNo = self._parseFromEndian(bytes[42:44])
-        self.stepNo = self._parseFromEndian(bytes[44:46])
-        self.maxRecords = self._parseFromEndian(bytes[46:48])
-        self.boxId = self._parseFromEndian(bytes[48:50])
-        self.boxPos = self._parseFromEndian(bytes[50:52])
-        self.mainOPos = self._parseFromEndian(bytes[52:54])
-        self.beltNo = self._parseFromEndian(bytes[54:56])
-        self.cNo = self._parseFromEndian(bytes[56:60])
-        self.boxPNo = self._parseFromEndian(bytes[60:64])
-        self.palletPNo = self._parseFromEndian(bytes[64:68])
-        self.aux1Int = self._parseFromEndian(bytes[68:70])
-        self.aux2Int = self._parseFromEndian(bytes[70:72])
-        self.aux1DInt = self._parseFromEndian(bytes[72:76])
-        self.aux2DInt = self._parseFromEndian(bytes[76:80])
-        self.mainPNo = self._parseFromEndian(bytes[80:84])
+        """
+        Decodes message in shortend string format. The parameter are assigned by their position in the schema
+        """
+        items = self.msg.split("<CR>")
+        if items[-1] == "":
+            items.pop()
+        # header and standard parameter
+        values = items[1 : len(MES_FIELDS) + 1]
+        self.__dict__.update(zip(MES_FIELD_ATTRS, map(int, values)))
+        # service-specific parameter
+        self.serviceParams.extend(items[len(MES_FIELDS) + 1 :])
+
+    def encodeBytes(self):
+        """
+        Encodes message in binary format directly into bytes
+
+        Returns:
+            bytes: Encoded frame which can be send to the IAS-MES
+        """
+        byteOrder = self._byteOrder()
+        header = BIN_LAYOUTS[byteOrder].pack(
+            BIN_IDENTS[byteOrder], *_getFieldValues(self)
+        )
+        return header + self._encodeServiceParams(byteOrder)
+
+    def decodeBytes(self, data):
+        """
+        Decodes a frame in binary format. The byte order is taken from the tcpident of the frame
+
+        Args:
+            data (bytes-like): received frame
+        """
+        byteOrder = BIN_BYTE_ORDER.get(bytes(data[:4]).hex())
+        if byteOrder == None:
+            appLogger.warning("Error, couldn't decode message: Unknown tcpident")
+            return
+        values = BIN_LAYOUTS[byteOrder].unpack_from(data)
+        self.tcpIdent = values[0].hex()
+        self.__dict__.update(zip(MES_FIELD_ATTRS, values[1:]))
 
         # service-specific parameter
-        if len(bytes) != 128:
+        params = memoryview(data)[BIN_HEADER_SIZE:]
+        if len(params) != 0:
             # serviceparams is string
             if self.mClass == 100 and self.mNo == 111:
-                for i in range(128, len(bytes), 1):
-                    self.serviceParams.append(self._parseFromEndian(bytes[i : i + 1]))
+                self.serviceParams.extend(params)
             # serviceparams are normal bytes
             else:
-                for i in range(128, len(bytes), 2):
-                    self.serviceParams.append(self._parseFromEndian(bytes[i : i + 2]))
-
-    def _parseToEndian(self, number, isInt32):
+                evenLength = len(params) & ~1
+                self.serviceParams.extend(
+                    value
+                    for (value,) in struct.iter_unpack(
+                        byteOrder + "H", params[:evenLength]
+                    )
+                )
+                if evenLength != len(params):
+                    self.serviceParams.append(params[-1])
+
+    def _encodeServiceParams(self, byteOrder):
         """
-        Parses a number to hex in the binary format
+        Encodes the servicespecific parameter, could be to be parsed diffrently depending on request
 
         Args:
-            number (int): number to parse
-            isInt32 (bool): if number is int32 (true) or int16(false)
+            byteOrder (str): struct byte order character of the frame
 
         Returns:
-            str: parsed hex number
+            bytes: encoded servicespecific parameter
         """
-        if isInt32:
-            hex = format(number, "08x")
+        # encoding for getBufForBufNo
+        if self.mClass == 150 and self.mNo == 1:
+            return struct.pack(byteOrder + "HHIIH", *self.serviceParams[:5])
+        # getUnknownParts
+        elif self.mClass == 200 and self.mNo == 5:
+            params = bytearray()
+            for i in range(0, len(self.serviceParams), 35):
+                params += struct.pack(byteOrder + "I", self.serviceParams[i])
+                params += bytes(self.serviceParams[i + 1 : i + 35])
+            return bytes(params)
+        elif self.mClass == 100 and self.mNo == 111:
+            return bytes(self.serviceParams)
         else:
-            hex = format(number, "04x")
-
-        binArray = [hex[i : i + 2] for i in range(0, len(hex), 2)]
-        binStr = ""
+            return struct.pack(
+                f"{byteOrder}{len(self.serviceParams)}H", *self.serviceParams
+            )
 
-        if self.tcpIdent == "33333302":
-            for i in range(0, len(binArray), 1):
-                binStr += binArray[i]
-        elif self.tcpIdent == "33333301":
-            for i in range(len(binArray) - 1, -1, -1):
-                binStr += binArray[i]
-
-        return binStr
-
-    def _parseFromEndian(self, bytes):
+    def _byteOrder(self):
         """
-        Parses given bytes to number depending if message is in big or little endian
-
-        Args:
-            bytes(str): bytes to parse
+        Gets the byte order of the binary format which is specified by the tcpident
 
         Returns:
-            int: parsed number
+            str: struct byte order character ("<": little endian, ">": big endian)
         """
-        nmbrstr = ""
-        if self.tcpIdent == "33333302":
-            for i in range(0, len(bytes), 1):
-                nmbrstr += bytes[i]
-        elif self.tcpIdent == "33333301":
-            for i in range(len(bytes) - 1, -1, -1):
-                nmbrstr += bytes[i]
-
-        return int(nmbrstr, 16)
+        try:
+            return BIN_BYTE_ORDER[str(self.tcpIdent)]
+        except KeyError:
+            raise ValueError(
+                f"Can't encode message in binary format: Unknown tcpident {self.tcpIdent}"
+            )
 
     def _printAttr(self):
         """
@@ -0,0 +1,81 @@
+"""
+Filename: statusframe.py
+Version name: 1.0, 2026-10-17
+Short description: packs the states of the whole fleet into one frame for the cyclic communication with the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import struct
+
+# resourceId, sps type and statusbits of a robotino
+STATUS_RECORD = struct.Struct(">HBB")
+# sps type of the robotinos (set to 2 for readability)
+SPS_TYPE = 2
+
+
+def statusByte(state):
+    """
+    Packs the statusbits of a Robotino into one byte (from MSB to LSB: mesMode, errorL2, errorL1, errorL0, reset,
+    busy, manualMode, autoMode)
+
+    Args:
+        state (Robotino): Robotino whose state is packed
+
+    Returns:
+        int: the statusbits
+    """
+    return (
+        bool(state.mesMode) << 7
+        | bool(state.errorL2) << 6
+        | bool(state.errorL1) << 5
+        | bool(state.errorL0) << 4
+        | bool(state.reset) << 3
+        | bool(state.busy) << 2
+        | bool(state.manualMode) << 1
+        | bool(state.autoMode)
+    )
+
+
+class StatusFrame(object):
+    """
+    Preallocated buffer which holds the status records of the whole fleet, so the states are sent in a single write
+    per cycle. The buffer only grows if the fleet does. Remembers the last status byte sent of each Robotino, so a
+    frame can be limited to the records which changed
+    """
+
+    def __init__(self, fleetSize=8):
+        self.buffer = bytearray(STATUS_RECORD.size * fleetSize)
+        # resourceId of robotino -> last status byte which was packed
+        self.lastSent = {}
+
+    def pack(self, states, onlyChanged=False):
+        """
+        Packs the status records of the Robotinos into the buffer
+
+        Args:
+            states (list): Robotinos whose states are packed
+            onlyChanged (bool, optional): If only records whose status byte changed since they were last packed are
+                                          packed. Defaults to False
+
+        Returns:
+            memoryview: the packed records. Only valid until the next call
+        """
+        length = STATUS_RECORD.size * len(states)
+        if length > len(self.buffer):
+            self.buffer = bytearray(length)
+        offset = 0
+        for state in states:
+            status = statusByte(state)
+            if onlyChanged and self.lastSent.get(state.id) == status:
+                continue
+            STATUS_RECORD.pack_into(self.buffer, offset, state.id, SPS_TYPE, status)
+            self.lastSent[state.id] = status
+            offset += STATUS_RECORD.size
+        return memoryview(self.buffer)[:offset]
+
+    def reset(self):
+        """
+        Forgets the last sent status bytes, e.g. after a reconnect, so the next frame contains all records
+        """
+        self.lastSent.clear()
@@ -0,0 +1,147 @@
+"""
+Filename: statuspublisher.py
+Version name: 1.1, 2026-10-17
+Short description: schedule of the cyclic status messages to the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import math
+import time
+
+from .statusframe import STATUS_RECORD, StatusFrame
+from conf import MES_STATUS_DELTA, MES_STATUS_KEEPALIVE, MES_STATUS_PERIOD
+
+
+class StatusPublisher(object):
+    """
+    Schedules the cyclic status messages to the IAS-MES by a monotonic deadline. Each deadline is one period after
+    the previous one, so the delay of a single send doesn't shift the following ones. Deadlines which were missed
+    completely (e.g. the sender was blocked for longer than a period) are skipped. The jitter is the delay between a
+    deadline and the actual send.
+
+    In delta mode only the records which changed since they were last sent are published, either on a deadline or
+    right away when the states are updated. A full refresh of all records is sent every keepalive interval
+    """
+
+    def __init__(
+        self,
+        period=MES_STATUS_PERIOD,
+        deltaOnly=MES_STATUS_DELTA,
+        keepalive=MES_STATUS_KEEPALIVE,
+    ):
+        """
+        Args:
+            period (float, optional): Time between two status messages (in seconds)
+            deltaOnly (bool, optional): If only changed records are published between the full refreshes
+            keepalive (float, optional): Time between two full refreshes in delta mode (in seconds)
+        """
+        self.period = period
+        self.deltaOnly = deltaOnly
+        self.keepalive = keepalive
+        self.statusFrame = StatusFrame()
+        self.deadline = time.monotonic()
+        self.lastRefresh = None
+        # metrics
+        self.published = 0
+        self.skipped = 0
+        self.totalJitter = 0.0
+        self.maxJitter = 0.0
+        self.lastJitter = 0.0
+        self.framesSent = 0
+        self.bytesSent = 0
+        # frames and bytes which would have been sent with a full refresh on each deadline
+        self.framesFull = 0
+        self.bytesFull = 0
+
+    def start(self):
+        """
+        Schedules the first status message immediately. It is always a full refresh
+        """
+        self.deadline = time.monotonic()
+        self.lastRefresh = None
+        self.statusFrame.reset()
+
+    def getDelay(self):
+        """
+        Returns:
+            float: time until the next status message is due (in seconds)
+        """
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def isDue(self):
+        """
+        Returns:
+            bool: If the deadline of the next status message is reached
+        """
+        return self.deadline <= time.monotonic()
+
+    def getFrame(self, states, isDue):
+        """
+        Packs the status records which have to be published
+
+        Args:
+            states (list): Robotinos whose states are published
+            isDue (bool): If the frame is sent on a deadline. Otherwise only changed records are packed
+
+        Returns:
+            memoryview: the packed records, can be empty. Only valid until the next call
+        """
+        now = time.monotonic()
+        isRefresh = isDue and (
+            not self.deltaOnly
+            or self.lastRefresh == None
+            or now - self.lastRefresh >= self.keepalive
+        )
+        frame = self.statusFrame.pack(states, onlyChanged=not isRefresh)
+        if isRefresh:
+            self.lastRefresh = now
+        if frame:
+            self.framesSent += 1
+            self.bytesSent += len(frame)
+        if isDue and states:
+            self.framesFull += 1
+            self.bytesFull += STATUS_RECORD.size * len(states)
+        return frame
+
+    def setPublished(self, sentAt):
+        """
+        Records a status message which was sent on a deadline and schedules the next one
+
+        Args:
+            sentAt (float): time.monotonic() when the message was sent
+        """
+        jitter = max(sentAt - self.deadline, 0.0)
+        self.published += 1
+        self.totalJitter += jitter
+        self.maxJitter = max(self.maxJitter, jitter)
+        self.lastJitter = jitter
+
+        self.deadline += self.period
+        now = time.monotonic()
+        if self.deadline <= now:
+            missed = math.floor((now - self.deadline) / self.period) + 1
+            self.skipped += missed
+            self.deadline += missed * self.period
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the schedule
+
+        Returns:
+            dict: Number of published and skipped messages, send jitter (in seconds) and frames and bytes sent and
+                  saved compared to a full refresh on each deadline
+        """
+        return {
+            "period": self.period,
+            "deltaOnly": self.deltaOnly,
+            "published": self.published,
+            "skipped": self.skipped,
+            "avgJitter": self.totalJitter / self.published if self.published else 0.0,
+            "maxJitter": self.maxJitter,
+            "lastJitter": self.lastJitter,
+            "framesSent": self.framesSent,
+            "bytesSent": self.bytesSent,
+            "framesSaved": self.framesFull - self.framesSent,
+            "bytesSaved": self.bytesFull - self.bytesSent,
+        }
@@ -0,0 +1,223 @@
+"""
+Filename: submissionqueue.py
+Version name: 1.1, 2026-10-17
+Short description: queue which collects state changes of the robotinos and sends them batched to the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+from threading import Condition, Thread
+
+from conf import MES_REPLAY_QUEUE_SIZE, MES_SUBMIT_WINDOW, appLogger
+
+
+class Submission(object):
+    """
+    Request which waits in the SubmissionQueue
+    """
+
+    __slots__ = ("robotinoId", "dockingPos", "frame")
+
+    def __init__(self, robotinoId, dockingPos, frame):
+        self.robotinoId = robotinoId
+        self.dockingPos = dockingPos
+        self.frame = frame
+
+
+class SubmissionQueue(object):
+    """
+    Collects the state changing requests (setDockingPos, moveBuf) of the Robotinos for a short window and sends them
+    back-to-back in one write. Inside the window a docking position update replaces the pending one of the same
+    Robotino, and an update which reports the docking position the IAS-MES already knows isn't sent at all. The order
+    of the requests of one Robotino is kept.
+
+    While the connection to the IAS-MES is down the requests are kept (at most maxSize, the oldest are dropped first)
+    and replayed in order after the reconnect
+    """
+
+    def __init__(
+        self, sendBatch, window=MES_SUBMIT_WINDOW, maxSize=MES_REPLAY_QUEUE_SIZE
+    ):
+        """
+        Args:
+            sendBatch (callable): Sends a list of encoded requests in one write. Returns True if all were successful
+                                  and raises ConnectionError or TimeoutError if the connection is broken
+            window (float, optional): Time in which requests are collected before they are sent (in seconds)
+            maxSize (int, optional): Max number of requests which are kept while the connection is down
+        """
+        self.sendBatch = sendBatch
+        self.window = window
+        self.maxSize = maxSize
+        self.queue = []
+        self.isConnected = False
+        # number of requests at the front of the queue which were submitted while the connection was down
+        self.toReplay = 0
+        # resourceId of robotino -> docking position which was last sent successfully
+        self.lastDockingPos = {}
+        self.condition = Condition()
+        self.isRunning = False
+        self.thread = None
+        # metrics
+        self.submitted = 0
+        self.coalesced = 0
+        self.suppressed = 0
+        self.sent = 0
+        self.batches = 0
+        self.failed = 0
+        self.replayed = 0
+        self.dropped = 0
+
+    def start(self):
+        with self.condition:
+            if self.isRunning:
+                return
+            self.isRunning = True
+        self.thread = Thread(target=self._flushLoop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the queue after the pending requests were flushed
+        """
+        with self.condition:
+            self.isRunning = False
+            self.condition.notify_all()
+
+    def setConnected(self, isConnected):
+        """
+        Sets if the connection to the IAS-MES is up. Requests are only sent while it is up
+
+        Args:
+            isConnected (bool): If the connection is up
+        """
+        with self.condition:
+            if isConnected and not self.isConnected:
+                self.toReplay = len(self.queue)
+            self.isConnected = isConnected
+            self.condition.notify_all()
+
+    def submit(self, robotinoId, frame, dockingPos=None):
+        """
+        Queues a request
+
+        Args:
+            robotinoId (int): resourceId of the robotino which the request belongs to
+            frame (bytes): encoded request
+            dockingPos (int, optional): Docking position if the request is a setDockingPos, so it can be coalesced
+        """
+        with self.condition:
+            self.submitted += 1
+            if dockingPos != None:
+                pending = self._lastPending(robotinoId)
+                if pending != None and pending.dockingPos != None:
+                    # newer docking position of the window replaces the pending one
+                    self.coalesced += 1
+                    if dockingPos == self.lastDockingPos.get(robotinoId):
+                        # IAS-MES already knows the docking position
+                        self.suppressed += 1
+                        self.queue.remove(pending)
+                    else:
+                        pending.dockingPos = dockingPos
+                        pending.frame = frame
+                    return
+                if pending == None and dockingPos == self.lastDockingPos.get(
+                    robotinoId
+                ):
+                    self.suppressed += 1
+                    return
+            self.queue.append(Submission(robotinoId, dockingPos, frame))
+            self._dropOverflow()
+            self.condition.notify()
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the queue
+
+        Returns:
+            dict: Number of submitted, saved and sent requests and number of writes
+        """
+        with self.condition:
+            return {
+                "submitted": self.submitted,
+                "saved": self.coalesced + self.suppressed,
+                "coalesced": self.coalesced,
+                "suppressed": self.suppressed,
+                "sent": self.sent,
+                "batches": self.batches,
+                "failed": self.failed,
+                "replayed": self.replayed,
+                "dropped": self.dropped,
+                "pending": len(self.queue),
+            }
+
+    def _lastPending(self, robotinoId):
+        """
+        Gets the latest pending request of a robotino. Must be called while holding the condition
+        """
+        for submission in reversed(self.queue):
+            if submission.robotinoId == robotinoId:
+                return submission
+        return None
+
+    def _dropOverflow(self):
+        """
+        Drops the oldest requests if the queue is full. Must be called while holding the condition
+        """
+        overflow = len(self.queue) - self.maxSize
+        if overflow > 0:
+            if self.dropped == 0:
+                appLogger.warning(
+                    "Queue of requests to IAS-MES is full. Dropping the oldest requests"
+                )
+            del self.queue[:overflow]
+            self.toReplay = max(self.toReplay - overflow, 0)
+            self.dropped += overflow
+
+    def _flushLoop(self):
+        """
+        Thread which sends the collected requests after each window
+        """
+        while True:
+            with self.condition:
+                while (not self.queue or not self.isConnected) and self.isRunning:
+                    self.condition.wait()
+                if not self.queue or not self.isConnected:
+                    return
+                # collect the requests which arrive inside the window
+                self.condition.wait_for(lambda: not self.isRunning, self.window)
+                batch, self.queue = self.queue, []
+            if not batch:
+                continue
+
+            try:
+                isSuccessful = self.sendBatch(
+                    [submission.frame for submission in batch]
+                )
+            except (ConnectionError, TimeoutError):
+                with self.condition:
+                    # keep the requests and replay them after the reconnect
+                    self.queue[:0] = batch
+                    self._dropOverflow()
+                    self.isConnected = False
+                    self.lastDockingPos.clear()
+                continue
+            except Exception as e:
+                appLogger.error(f"[MESCLIENT] {e}")
+                isSuccessful = False
+
+            with self.condition:
+                self.batches += 1
+                replayed = min(self.toReplay, len(batch))
+                self.toReplay -= replayed
+                if isSuccessful:
+                    self.sent += len(batch)
+                    self.replayed += replayed
+                    for submission in batch:
+                        if submission.dockingPos != None:
+                            self.lastDockingPos[
+                                submission.robotinoId
+                            ] = submission.dockingPos
+                else:
+                    # state in IAS-MES is unknown, so no update can be suppressed
+                    self.failed += len(batch)
+                    self.lastDockingPos.clear()
@@ -0,0 +1,91 @@
+"""
+Filename: supervisor.py
+Version name: 1.0, 2026-10-17
+Short description: supervises the connection to the mes. Computes the backoff of the reconnects and tracks the uptime
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import random
+import time
+
+from conf import MES_RECONNECT_MAX_DELAY, MES_RECONNECT_MIN_DELAY
+
+
+class ConnectionSupervisor(object):
+    """
+    Tracks if the connection to the IAS-MES is up and computes the delay of the next reconnect. The delay doubles with
+    each failed attempt up to maxDelay and is randomised, so several clients don't reconnect in lock-step
+    """
+
+    def __init__(
+        self, minDelay=MES_RECONNECT_MIN_DELAY, maxDelay=MES_RECONNECT_MAX_DELAY
+    ):
+        """
+        Args:
+            minDelay (float, optional): Delay of the first reconnect (in seconds)
+            maxDelay (float, optional): Upper bound of the delay (in seconds)
+        """
+        self.minDelay = minDelay
+        self.maxDelay = maxDelay
+        # failed attempts since the connection was last up
+        self.attempts = 0
+        self.isConnected = False
+        self.startedAt = time.monotonic()
+        self.connectedAt = None
+        self.disconnectedAt = self.startedAt
+        # metrics
+        self.connects = 0
+        self.disconnects = 0
+        self.totalUptime = 0.0
+        self.lastDowntime = 0.0
+
+    def setConnected(self):
+        now = time.monotonic()
+        if not self.isConnected:
+            self.lastDowntime = now - self.disconnectedAt
+        self.isConnected = True
+        self.connectedAt = now
+        self.connects += 1
+        self.attempts = 0
+
+    def setDisconnected(self):
+        now = time.monotonic()
+        if self.isConnected:
+            self.totalUptime += now - self.connectedAt
+            self.disconnects += 1
+            self.disconnectedAt = now
+        self.isConnected = False
+
+    def getDelay(self):
+        """
+        Gets the delay of the next reconnect and counts it as attempt
+
+        Returns:
+            float: delay (in seconds)
+        """
+        delay = min(self.maxDelay, self.minDelay * 2**self.attempts)
+        self.attempts += 1
+        return random.uniform(delay / 2, delay)
+
+    def getMetrics(self):
+        """
+        Gets the uptime metrics of the connection
+
+        Returns:
+            dict: state, number of connects/disconnects and uptime (in seconds and as ratio since the start)
+        """
+        now = time.monotonic()
+        currentUptime = now - self.connectedAt if self.isConnected else 0.0
+        totalUptime = self.totalUptime + currentUptime
+        return {
+            "isConnected": self.isConnected,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "failedAttempts": self.attempts,
+            "currentUptime": currentUptime,
+            "currentDowntime": 0.0 if self.isConnected else now - self.disconnectedAt,
+            "lastDowntime": self.lastDowntime,
+            "totalUptime": totalUptime,
+            "uptimeRatio": totalUptime / max(now - self.startedAt, 1e-9),
+        }
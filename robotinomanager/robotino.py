@@ -10,12 +10,15 @@ import time
 from PySide6.QtCore import Signal, QThread
 from threading import Event, Lock
 
+from commandserver.robotinomessages import RobotInfo, parseCommandInfo, parseRobotInfo
 from conf import appLogger
 
 
 class Robotino(QThread):
     deleteTaskInfoSignal = Signal(int, int, int, str)
     newTaskInfoSignal = Signal(int, int, int, str)
+    # emitted with the resourceId of the robotino when it finished executing a transport task
+    taskFinishedSignal = Signal(int)
 
     def __init__(self, mesClient, robotinoServer):
         super(Robotino, self).__init__()
@@ -29,13 +32,8 @@ class Robotino(QThread):
         self.errorL1 = False
         self.errorL2 = False
         self.mesMode = False
-        self.batteryVoltage = 0.0
-        self.laserWarning = False
-        self.laserSaftey = False
-        self.boxPresent = False
-        self.positionX = 0.0
-        self.positionY = 0.0
-        self.positionPhi = 0.0
+        # telemetry (battery, laser, box, position) from the last RobotInfo message
+        self.robotInfo = RobotInfo()
         self.dockedAt = 0
         self.target = 0
         # instances of mesclient and robotinoserver for executing operations
@@ -48,7 +46,11 @@ class Robotino(QThread):
         self.stopFlagAutoOperation = Event()
 
     def run(self):
-        self.executeTransportTask()
+        try:
+            self.executeTransportTask()
+        finally:
+            # release the task in the ledger even if the execution failed
+            self.taskFinishedSignal.emit(self.id)
 
     def fetchStateMsg(self, msg):
         """
@@ -57,67 +59,76 @@ class Robotino(QThread):
         Args:
             msg (str): State message from which the information gets fetched
         """
-        self.errorL2 = False
-        # fetch resourceId
-        strId = msg.split("robotinoid:")
-        self.id = int(strId[1][0])
-        # fetch state
-        strState = msg.split("state:")
-        if "IDLE" in strState[1]:
-            self.busy = False
-        elif "BUSY" in strState[1]:
-            self.busy = True
-        elif "ERROR" in strState[1]:
-            self.busy = False
-            self.errorL2 = True
+        try:
+            robotInfo = parseRobotInfo(msg)
+        except ValueError as e:
+            appLogger.error(f"[ROBOTINO] Could'nt fetch statemessage: {e}")
+            return
+        self.setRobotInfo(robotInfo)
+
+    def setRobotInfo(self, robotInfo):
+        """
+        Applies the telemetry of a RobotInfo message. The record is swapped in one assignment, so the telemetry is
+        never read half updated
+
+        Args:
+            robotInfo (RobotInfo): the parsed RobotInfo message
+        """
+        busy = self.busy
+        errorL2 = False
+        state = robotInfo.state.upper()
+        if "IDLE" in state:
+            busy = False
+        elif "BUSY" in state:
+            busy = True
+        elif "ERROR" in state:
+            busy = False
+            errorL2 = True
         else:
             appLogger.error("[ROBOTINO] Could'nt fetch state from statemessage")
-        # fetch battery voltage
-        strBattery = msg.split("batteryvoltage:")
-        strBattery = strBattery[1].split(" ")
-        self.batteryVoltage = float(strBattery[0])
-        # fetch laserwarning
-        strLaserWarning = msg.split("laserwarning:")
-        if len(strLaserWarning) >= 2:
-            strLaserWarning = strLaserWarning[1].split(" ")
-        if "0" in strLaserWarning[0]:
-            self.laserWarning = False
-        elif "1" in strLaserWarning[0]:
-            self.laserWarning = True
-            self.errorL2 = True
-        else:
-            appLogger.error("[ROBOTINO] Couldnt fetch laserwarning from statemessage")
-        # fetch laserSaftey
-        strLaserSafey = msg.split("lasersafety:")
-        strLaserSafey = strLaserSafey[1].split(" ")
-        if "0" in strLaserSafey[0]:
-            self.laserSaftey = False
-        elif "1" in strLaserSafey[0]:
-            self.laserSaftey = True
-            self.errorL2 = True
-        else:
-            appLogger.error("[ROBOTINO] Couldnt fetch lasersaftey from statemessage")
-        # fetch boxPresent
-        strBox = msg.split("boxpresent:")
-        strBox = strBox[1].split(" ")
-        if "0" in strBox[0]:
-            self.boxPresent = False
-        elif "1" in strBox[0]:
-            self.boxPresent = True
-        else:
-            appLogger.error("[ROBOTINO] Couldnt fetch boxpresent from statemessage")
-        # fetch position x
-        strPosX = msg.split("x:")
-        strPosX = strPosX[1].split(" ")
-        self.positionX = float(strPosX[0])
-        # fetch position y
-        strPosY = msg.split("y:")
-        strPosY = strPosY[1].split(" ")
-        self.positionY = float(strPosY[0])
-        # fetch position phi
-        strPosPhi = msg.split("phi:")
-        strPosPhi = strPosPhi[1].split(" ")
-        self.positionPhi = float(strPosPhi[0])
+        if robotInfo.laserWarning or robotInfo.laserSafety:
+            errorL2 = True
+
+        self.id = robotInfo.robotinoId
+        self.robotInfo = robotInfo
+        self.busy = busy
+        self.errorL2 = errorL2
+
+    """
+    Telemetry from the last RobotInfo message
+    """
+
+    @property
+    def batteryVoltage(self):
+        return self.robotInfo.batteryVoltage
+
+    @property
+    def current(self):
+        return self.robotInfo.current
+
+    @property
+    def laserWarning(self):
+        return self.robotInfo.laserWarning
+
+    @property
+    def laserSaftey(self):
+        return self.robotInfo.laserSafety
+
+    @property
+    def boxPresent(self):
+        return self.robotInfo.boxPresent
+
+    @property
+    def positionX(self):
+        return self.robotInfo.positionX
+
+    @property
+    def positionY(self):
+        return self.robotInfo.positionY
+
+    @property
+    def positionPhi(self):
+        return self.robotInfo.positionPhi
 
     def printState(self):
         """
@@ -133,6 +144,7 @@ class Robotino(QThread):
         appLogger.debug("ErrorL2: " + str(self.errorL2))
         appLogger.debug("MesMode: " + str(self.mesMode))
         appLogger.debug("Battery voltage: " + str(self.batteryVoltage))
+        appLogger.debug("Current: " + str(self.current))
         appLogger.debug("Laser Warning: " + str(self.laserWarning))
         appLogger.debug("Laser Saftey: " + str(self.laserSaftey))
         appLogger.debug("Box present: " + str(self.boxPresent))
@@ -186,9 +198,7 @@ class Robotino(QThread):
         # update state of transport task in gui
         self._updateTaskFrontend("finished")
         # inform robotino
-        # self.robotinoServer.lock.acquire()
         # self.robotinoServer.ack(self.id)
-        # self.robotinoServer.lock.release()
         # remove task from robotino
         appLogger.debug(f"Robotino {self.id} finished transport task {self.task}")
 
@@ -207,13 +217,11 @@ class Robotino(QThread):
         ERROR_MSGS = ["NoStationResponse", "PartAlreadyPresent", "NoPartLoaded"]
         self.lock.acquire()
 
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.loadBox(self.id)
-        self.robotinoServer.lock.release()
 
         # Update state in IAS-MES
-        if self._waitForOpResponse("Started-LoadBox") and self.mesClient.serviceSocketIsAlive:
-            self.mesClient.moveBuf(self.id, self.dockedAt, True)
+        if self._waitForOpResponse("Started-LoadBox"):
+            self.mesClient.submitMoveBuf(self.id, self.dockedAt, True)
 
         if self._waitForOpResponse("Finished-LoadBox", errMsgs=ERROR_MSGS):
             self.lock.release()
@@ -238,13 +246,11 @@ class Robotino(QThread):
         ERR_MSGS = ["NoStationResponse", "PartNotPresent", "PartNotUnloaded"]
         self.lock.acquire()
 
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.unloadBox(self.id)
-        self.robotinoServer.lock.release()
 
         # Update state in IAS-MES
-        if self._waitForOpResponse("Started-UnloadBox") and self.mesClient.serviceSocketIsAlive:
-            self.mesClient.moveBuf(self.id, self.dockedAt, False)
+        if self._waitForOpResponse("Started-UnloadBox"):
+            self.mesClient.submitMoveBuf(self.id, self.dockedAt, False)
         if self._waitForOpResponse("Finished-UnloadBox", errMsgs=ERR_MSGS):
             self.lock.release()
             appLogger.debug(f"Robotino {self.id} finished unloading carrier at resource {self.dockedAt}")
@@ -272,16 +278,13 @@ class Robotino(QThread):
 
         self.lock.acquire()
 
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.dock(self.id)
-        self.robotinoServer.lock.release()
 
         # Update state in IAS-MES
         if self._waitForOpResponse("Finished-DockTo", errMsgs=ERR_MSGS):
-            if self.mesClient.serviceSocketIsAlive:
-                self.mesClient.setDockingPos(self.dockedAt, self.id)
-                self.lock.release()
-                appLogger.debug(f"Robotino {self.id} finished docking at resource {position}")
+            self.mesClient.submitSetDockingPos(self.dockedAt, self.id)
+            self.lock.release()
+            appLogger.debug(f"Robotino {self.id} finished docking at resource {position}")
         elif retryOp:
             self.lock.release()
             self.dock(position, not retryOp)
@@ -300,14 +303,11 @@ class Robotino(QThread):
         ERR_MSGS = ["NotDocked"]
         self.lock.acquire()
 
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.undock(self.id)
-        self.robotinoServer.lock.release()
 
         # Update state in IAS-MES
         if self._waitForOpResponse("Finished-Undock", errMsgs=ERR_MSGS):
-            if self.mesClient.serviceSocketIsAlive:
-                self.mesClient.setDockingPos(self.dockedAt, self.id)
+            self.mesClient.submitSetDockingPos(self.dockedAt, self.id)
 
             self.lock.release()
             appLogger.debug(f"Robotino {self.id} finished undocking from resource {self.dockedAt}")
@@ -334,9 +334,7 @@ class Robotino(QThread):
         print(self.target)
         self.setDockingPos(0)
         self.lock.acquire()
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.goTo(position, self.id)
-        self.robotinoServer.lock.release()
         if self._waitForOpResponse("Finished-GotoPosition", errMsgs=ERR_MSGS):
             # self.busy = False
             self.lock.release()
@@ -364,9 +362,7 @@ class Robotino(QThread):
         self.target = (int(position[0]), int(position[1]))
         self.lock.acquire()
 
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.goTo(self.target, self.id, "coordinate")
-        self.robotinoServer.lock.release()
 
         if self._waitForOpResponse("Finished-DriveToManual"):
             self.lock.release()
@@ -388,16 +384,13 @@ class Robotino(QThread):
         """
         self.target = int(position)
         self.dockedAt = int(position)
-        if self.mesClient.serviceSocketIsAlive:
-            self.mesClient.setDockingPos(int(position), self.id)
+        self.mesClient.submitSetDockingPos(int(position), self.id)
 
     def endTask(self):
         """
         Push command end the task which also resets error
         """
-        self.robotinoServer.lock.acquire()
         self.robotinoServer.endTask(self.id)
-        self.robotinoServer.lock.release()
         self.target = 0
         self.task = (0, 0)
 
@@ -409,17 +402,7 @@ class Robotino(QThread):
             state (str): string with the state message of the command info
             id (int): resourceId of Robotino from which the command info comes
         """
-        id = self.commandInfo.split("robotinoid:")
-        if id[0] != "":
-            id = int(id[1][0])
-            state = self.commandInfo.split('"')
-            if len(state) >= 2:
-                state = state[1]
-            else:
-                state = ""
-            return id, state
-        else:
-            return 0, ""
+        return parseCommandInfo(self.commandInfo)
 
     def _updateTaskFrontend(self, strState):
         """
@@ -445,7 +428,9 @@ class Robotino(QThread):
         while not self.stopFlagAutoOperation.is_set():
             id, state = self._parseCommandInfo()
             # print(f"Robotino id: {id}\nRobotino state message:  {state}")
+            # no command info yet, wait like for any other state instead of spinning
             if state == "":
+                time.sleep(1)
                 continue
             # Check for errorMsgs which show failure for operation
             for errMsg in errMsgs:
@@ -9,10 +9,13 @@ Short description: class to manage all robotinos (delegate tasks, delegate state
 
 import time
 from threading import Event, Thread, Lock
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QThread, Signal, Qt
 
 from .robotino import Robotino
-from conf import POLL_TIME_STATUSUPDATES, POLL_TIME_TASKS, appLogger
+from commandserver.robotinomessages import getAllRobotinoIds, getRobotinoId
+from .taskledger import TaskLedger
+from .taskpoller import TaskPoller
+from conf import POLL_TIME_FLEET, POLL_TIME_STATUSUPDATES, POLL_TIME_TASKS, appLogger
 
 
 class RobotinoManager(QThread):
@@ -22,13 +25,18 @@ class RobotinoManager(QThread):
 
     def __init__(self, mesClient, robotinoServer):
         super(RobotinoManager, self).__init__()
-        # fleet
+        # fleet: resourceId -> robotino and the robotinos in the order of the AllRobotinoID message for iterating.
+        # Both are replaced as a whole when the fleet changes, so readers never see a half updated fleet
+        self.robotinos = {}
         self.fleet = []
         # params for automated control
         self.transportTasks = []
         self.commandInfo = ""
         self.POLL_TIME_STATEUPDATES = POLL_TIME_STATUSUPDATES
+        self.POLL_TIME_FLEET = POLL_TIME_FLEET
         self.POLL_TIME_TASKS = POLL_TIME_TASKS
+        self.taskPoller = TaskPoller(interval=POLL_TIME_TASKS)
+        self.taskLedger = TaskLedger()
         # instances of mesclient and commandserver for executing operations
         self.mesClient = mesClient
         self.robotinoServer = robotinoServer
@@ -74,53 +82,81 @@ class RobotinoManager(QThread):
         except Exception as e:
             appLogger.error(f"Robotinomanager crashed. Exception: {e}")
 
+        self.robotinos = {}
         self.fleet = []
         appLogger.info("Stopped RobotinoManager")
 
     def createFleet(self, msg):
         """
-        Creates the fleet with robotinos inside
+        Creates the fleet with robotinos inside or updates it. Robotinos which are already in the fleet are kept with
+        their state and task, only the robotinos which joined are created and the ones which left are removed
 
         Args:
             msg (str): message passed from the commandserver
         """
-        self.stopCyclicStateUpdate()
-        self.fleet = []
-        strIds = msg.split("AllRobotinoID")
-        strIds = strIds[1].split(",")
-        if len(strIds) != 0:
-            for id in strIds:
-                robotino = Robotino(
-                    mesClient=self.mesClient, robotinoServer=self.robotinoServer
-                )
-                robotino.id = int(id)
-                robotino.manualMode = True
-                robotino.deleteTaskInfoSignal.connect(self.emitDeleteTaskInfo)
-                robotino.newTaskInfoSignal.connect(self.emitNewTaskInfo)
-                self.fleet.append(robotino)
-        else:
-            robotino = Robotino(
-                mesClient=self.mesClient, robotinoServer=self.robotinoServer
-            )
-            robotino.id = 7
-            robotino.manualMode = True
-            self.fleet.append(robotino)
+        ids = getAllRobotinoIds(msg)
+        if len(ids) == 0:
+            ids = [7]
+        robotinos = {}
+        for id in ids:
+            robotino = self.robotinos.get(id)
+            if robotino == None:
+                robotino = self._createRobotino(id)
+            robotinos[id] = robotino
+        for id, robotino in self.robotinos.items():
+            if id not in robotinos:
+                appLogger.info(f"[ROBOTINOMANAGER] Removed Robotino {id} from fleet")
+                # task of the robotino can be assigned to another robotino
+                record = self.taskLedger.setReleased(id)
+                if record != None and record.getState() == "open":
+                    self._updateTasksFrontend([record], [])
+                robotino.stopFlagAutoOperation.set()
+        self.robotinos = robotinos
+        self.fleet = list(robotinos.values())
         self.statesRobotinoSignal.emit(self.fleet)
         self.startCyclicStateUpdate()
 
+    def _createRobotino(self, id):
+        """
+        Creates a robotino which joined the fleet
+
+        Args:
+            id (int): resourceId of the robotino
+
+        Returns:
+            Robotino: the robotino in manual mode
+        """
+        robotino = Robotino(mesClient=self.mesClient, robotinoServer=self.robotinoServer)
+        robotino.id = id
+        robotino.manualMode = True
+        robotino.deleteTaskInfoSignal.connect(self.emitDeleteTaskInfo)
+        robotino.newTaskInfoSignal.connect(self.emitNewTaskInfo)
+        # direct connection so the poller is woken up without going through an event loop
+        robotino.taskFinishedSignal.connect(self.onTaskFinished, Qt.DirectConnection)
+        robotino.finished.connect(self.taskPoller.wakeUp, Qt.DirectConnection)
+        appLogger.info(f"[ROBOTINOMANAGER] Added Robotino {id} to fleet")
+        return robotino
+
     def cyclicStateUpdate(self):
         """
         Cyclically update state of Robotinos. Is started from the class itself and runs as a thread
         """
         appLogger.info("Started cyclic state updates")
+        fleetPolledAt = time.monotonic()
         while not self.stopFlagCyclicUpdates.is_set():
-            for robotino in self.fleet:
-                self.robotinoServer.lock.acquire()
-                self.robotinoServer.getRobotinoInfo(robotino.id)
-                self.robotinoServer.lock.release()
-            self.mesClient.setStatesRobotinos(self.fleet)
-            self.statesRobotinoSignal.emit(self.fleet)
-            time.sleep(self.POLL_TIME_STATEUPDATES)
+            startedAt = time.monotonic()
+            # the fleet is updated by createFleet when the AllRobotinoID message arrives
+            if startedAt - fleetPolledAt >= self.POLL_TIME_FLEET:
+                self.robotinoServer.getAllRobotinoID()
+                fleetPolledAt = startedAt
+            fleet = self.fleet
+            # one batched poll for the whole fleet which returns when all robotinos replied
+            missing = self.robotinoServer.pollRobotInfos([robotino.id for robotino in fleet])
+            if len(missing) != 0:
+                appLogger.warning(f"[ROBOTINOMANAGER] No state update from Robotinos {missing}")
+            self.mesClient.setStatesRobotinos(fleet)
+            self.statesRobotinoSignal.emit(fleet)
+            time.sleep(max(self.POLL_TIME_STATEUPDATES - (time.monotonic() - startedAt), 0))
         # reset stopflag after the cyclicStateUpdate got killed
         appLogger.info("[ROBOTINOMANAGER] Stopped cyclic state updates")
         self.stopFlagCyclicUpdates.clear()
@@ -133,44 +169,51 @@ class RobotinoManager(QThread):
         self.stopFlagAutoOperation.clear()
 
         while not self.stopFlagAutoOperation.is_set():
+            freeRobotinos = self._getFreeRobotinos()
+            if len(freeRobotinos) == 0:
+                # polling is useless while all robotinos are busy or not in automated operation. Recheck after the
+                # poll time in case a robotino got activated
+                self.taskPoller.setSkipped()
+                self.taskPoller.wait(self.POLL_TIME_TASKS)
+                continue
+
             # poll transport task from mes
             if self.mesClient.serviceSocketIsAlive:
                 self.transportTasks = self.mesClient.getTransportTasks(len(self.fleet))
-            if self.transportTasks != None:
-                self.transportTasks = list(self.transportTasks)
-                # assign Tasks
-                for task in self.transportTasks:
-                    # check if task is already assigned
-                    isAlreadyAssigned = False
-                    for robotino in self.fleet:
-                        if robotino.task == task:
-                            isAlreadyAssigned = True
-                            break
-                    # assign task if it isnt already assigned
-                    if not isAlreadyAssigned:
-                        appLogger.debug(
-                            f"Got transport task {task} from MES. Assigning to Robotino"
-                        )
-                        for robotino in self.fleet:
-                            if (
-                                robotino.task == (0, 0)
-                                and robotino.autoMode
-                                and task != (0, 0)
-                            ):
-                                appLogger.info(
-                                    "Assigned task to robotino " + str(robotino.id)
-                                )
-                                robotino.task = task
-                                robotino.start()
-                                break
-
-            time.sleep(self.POLL_TIME_TASKS)
+                if self.transportTasks != None:
+                    added, removed = self.taskLedger.update(self.transportTasks)
+                    self._updateTasksFrontend(added, removed)
+            # assign the open tasks, oldest first
+            assignedTasks = 0
+            for record in self.taskLedger.getOpenTasks():
+                if len(freeRobotinos) == 0:
+                    break
+                appLogger.debug(
+                    f"Got transport task {record.task} from MES. Assigning to Robotino"
+                )
+                robotino = freeRobotinos.pop(0)
+                appLogger.info("Assigned task to robotino " + str(robotino.id))
+                robotino.task = record.task
+                self.taskLedger.setAssigned(record.task, robotino.id)
+                self.taskPoller.setAssigned(robotino.id)
+                robotino.start()
+                assignedTasks += 1
+
+            self.taskPoller.setPolled(assignedTasks)
+            self.taskPoller.wait(self.taskPoller.getInterval())
 
         appLogger.info("Stopped automated operation")
 
         # reset stopflag after the automatedOperation got killed
         self.stopFlagAutoOperation.clear()
 
+    def onTaskFinished(self, robotinoId):
+        """
+        Callback when a robotino finished its transport task. Polls the next task right away
+        """
+        self.taskLedger.setFinished(robotinoId)
+        self.taskPoller.wakeUp()
+
     def retryOp(self, errorMsg, robotinoId):
         """
         Retries an failed operation
@@ -197,6 +240,40 @@ class RobotinoManager(QThread):
             if robotino != None:
                 robotino.undock()
 
+    def _getFreeRobotinos(self):
+        """
+        Gets the robotinos in automated operation which have no task. Marks them as free in the poller
+
+        Returns:
+            list: the free robotinos
+        """
+        freeRobotinos = []
+        for robotino in self.fleet:
+            if robotino.task == (0, 0) and robotino.autoMode:
+                # thread of a robotino which just finished its task could still be winding down. It is skipped in this
+                # poll, the poller is woken up again when the thread finished
+                if robotino.isRunning():
+                    continue
+                self.taskPoller.setFree(robotino.id)
+                freeRobotinos.append(robotino)
+        return freeRobotinos
+
+    def _updateTasksFrontend(self, added, removed):
+        """
+        Shows the tasks which were added since the last poll as waiting in the frontend and removes the ones which
+        vanished before they were assigned
+
+        Args:
+            added (list): TaskRecords of the added tasks
+            removed (list): TaskRecords of the removed tasks
+        """
+        for record in added:
+            self.emitDeleteTaskInfo(record.task[0], record.task[1], 0, "Waiting")
+            self.emitNewTaskInfo(record.task[0], record.task[1], 0, "Waiting")
+        for record in removed:
+            if record.assigned == None:
+                self.emitDeleteTaskInfo(record.task[0], record.task[1], 0, "Waiting")
+
     def _getIDfromCommandInfo(self):
         """
         Splits the commandinfo into an id and state
@@ -204,12 +281,7 @@ class RobotinoManager(QThread):
         Returns:
             int: resourceId of robotino from which the command info comes
         """
-        id = self.commandInfo.split("robotinoid:")
-        if id[0] != "":
-            id = int(id[1][0])
-            return id
-        else:
-            return 0
+        return getRobotinoId(self.commandInfo)
 
     """
     Setter and getter
@@ -218,12 +290,15 @@ class RobotinoManager(QThread):
     def setCommandInfo(self, msg):
         self.commandInfo = msg
         id = self._getIDfromCommandInfo()
-        self.getRobotino(int(id)).setCommandInfo(msg)
+        # robotino could have left the fleet already
+        robotino = self.getRobotino(int(id))
+        if robotino != None:
+            robotino.setCommandInfo(msg)
 
     def getRobotino(self, id):
-        for robotino in self.fleet:
-            if robotino.id == id:
-                return robotino
+        robotino = self.robotinos.get(id)
+        if robotino != None:
+            return robotino
         appLogger.error(
             "[ROBOTINOMANAGER] Couldnt return robotino, because it doesnt exist"
         )
@@ -235,6 +310,19 @@ class RobotinoManager(QThread):
     def stopAutomatedOperation(self):
         self.isAutoMode = False
         self.stopFlagAutoOperation.set()
+        self.taskPoller.wakeUp()
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the RobotinoManager
+
+        Returns:
+            dict: metrics of the RobotinoManager
+        """
+        return {
+            "taskPoller": self.taskPoller.getMetrics(),
+            "taskLedger": self.taskLedger.getMetrics(),
+        }
 
     def startCyclicStateUpdate(self):
         self.runsStateUpdates = True
@@ -258,10 +346,12 @@ class RobotinoManager(QThread):
         self.isAutoMode = False
         self.runsStateUpdates = False
         self.stopFlagAutoOperation.set()
+        self.taskPoller.wakeUp()
         self.stopFlagCyclicUpdates.set()
         self.stopFlag.set()
         for robotino in self.fleet:
             robotino.stopFlagAutoOperation.set()
+        self.robotinos = {}
         self.fleet = []
         self.statesRobotinoSignal.emit(self.fleet)
 
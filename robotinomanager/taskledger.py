@@ -0,0 +1,239 @@
+"""
+Filename: taskledger.py
+Version name: 1.0, 2026-10-17
+Short description: ledger of the transport tasks from the mes and their lifecycle
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import time
+from threading import Lock
+
+# number of finished or vanished tasks which are kept for the metrics
+TASK_HISTORY_SIZE = 100
+
+
+class TaskRecord(object):
+    """
+    Lifecycle of one transport task. Timestamps are time.time() (None if the step isn't reached yet)
+    """
+
+    __slots__ = ("task", "robotinoId", "firstSeen", "assigned", "finished", "vanished")
+
+    def __init__(self, task, firstSeen):
+        self.task = task
+        self.robotinoId = 0
+        self.firstSeen = firstSeen
+        self.assigned = None
+        self.finished = None
+        self.vanished = None
+
+    def getState(self):
+        """
+        Returns:
+            str: "open", "assigned", "finished" or "vanished"
+        """
+        if self.finished != None:
+            return "finished"
+        elif self.assigned != None:
+            return "assigned"
+        elif self.vanished != None:
+            return "vanished"
+        return "open"
+
+
+class TaskLedger(object):
+    """
+    Keeps the transport tasks of the IAS-MES indexed by (start, target). Each poll is diffed against the previous
+    one, so only the tasks which were added or removed since then have to be handled. Open tasks are kept in the
+    order they were first seen. Tracks when each task was first seen, assigned and finished
+    """
+
+    def __init__(self, historySize=TASK_HISTORY_SIZE):
+        """
+        Args:
+            historySize (int, optional): Number of finished or vanished tasks which are kept
+        """
+        self.historySize = historySize
+        self.lock = Lock()
+        # tasks of the last poll
+        self.polled = set()
+        # (start, target) -> TaskRecord of the tasks which aren't assigned yet
+        self.open = {}
+        # (start, target) -> TaskRecord of the tasks which aren't finished yet
+        self.active = {}
+        # resourceId of robotino -> TaskRecord
+        self.assignedTo = {}
+        self.history = []
+        # metrics
+        self.added = 0
+        self.removed = 0
+        self.assignments = 0
+        self.finished = 0
+        self.vanished = 0
+        self.totalWaitTime = 0.0
+        self.totalDuration = 0.0
+
+    def update(self, tasks):
+        """
+        Diffs the tasks of a poll against the previous poll. Tasks which vanished before they were assigned are
+        moved to the history. A response which isn't a transport task is read as [(0, 0)] and carries no information,
+        so the ledger is left unchanged
+
+        Args:
+            tasks (set): transport tasks (start, target) returned by the IAS-MES
+
+        Returns:
+            list, list: TaskRecords of the added tasks and of the removed tasks
+        """
+        current = set(tasks)
+        if current == {(0, 0)}:
+            return [], []
+        current.discard((0, 0))
+        now = time.time()
+        with self.lock:
+            added = []
+            for task in current - self.polled:
+                # an assigned task which is reported again is still the same task
+                if task in self.active:
+                    continue
+                record = TaskRecord(task, now)
+                self.active[task] = record
+                self.open[task] = record
+                self.added += 1
+                added.append(record)
+            removed = []
+            for task in self.polled - current:
+                record = self.active.get(task)
+                if record == None:
+                    continue
+                removed.append(record)
+                self.removed += 1
+                # a task which is assigned disappears when the carrier is picked up and stays active until finished
+                if record.assigned == None:
+                    record.vanished = now
+                    self.vanished += 1
+                    del self.active[task]
+                    del self.open[task]
+                    self._addHistory(record)
+            self.polled = current
+            return added, removed
+
+    def getOpenTasks(self):
+        """
+        Returns:
+            list: TaskRecords of the tasks which aren't assigned yet, oldest first
+        """
+        with self.lock:
+            return list(self.open.values())
+
+    def setAssigned(self, task, robotinoId):
+        """
+        Records that a task was assigned to a Robotino
+
+        Args:
+            task (tuple): the transport task (start, target)
+            robotinoId (int): resourceId of the robotino
+        """
+        with self.lock:
+            record = self.open.pop(task, None)
+            if record == None:
+                record = TaskRecord(task, time.time())
+                self.active[task] = record
+            record.robotinoId = robotinoId
+            record.assigned = time.time()
+            self.assignments += 1
+            self.totalWaitTime += record.assigned - record.firstSeen
+            self.assignedTo[robotinoId] = record
+
+    def setFinished(self, robotinoId):
+        """
+        Records that a Robotino finished its task
+
+        Args:
+            robotinoId (int): resourceId of the robotino
+
+        Returns:
+            TaskRecord: the finished task or None if the robotino had no task of the ledger
+        """
+        with self.lock:
+            record = self.assignedTo.pop(robotinoId, None)
+            if record == None:
+                return None
+            record.finished = time.time()
+            self.finished += 1
+            self.totalDuration += record.finished - record.assigned
+            self.active.pop(record.task, None)
+            # if the IAS-MES still reports the task, the next poll treats it as new one
+            self.polled.discard(record.task)
+            self._addHistory(record)
+            return record
+
+    def setReleased(self, robotinoId):
+        """
+        Takes back the task of a Robotino which left the fleet. The task is open again if the IAS-MES still reports it,
+        otherwise (e.g. the carrier was already picked up) it is moved to the history as vanished
+
+        Args:
+            robotinoId (int): resourceId of the robotino
+
+        Returns:
+            TaskRecord: the released task or None if the robotino had no task of the ledger
+        """
+        with self.lock:
+            record = self.assignedTo.pop(robotinoId, None)
+            if record == None:
+                return None
+            record.robotinoId = 0
+            record.assigned = None
+            if record.task in self.polled:
+                self.open[record.task] = record
+            else:
+                record.vanished = time.time()
+                self.vanished += 1
+                self.active.pop(record.task, None)
+                self._addHistory(record)
+            return record
+
+    def getRecord(self, task):
+        """
+        Args:
+            task (tuple): the transport task (start, target)
+
+        Returns:
+            TaskRecord: record of the task which isn't finished yet or None
+        """
+        with self.lock:
+            return self.active.get(task)
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the ledger
+
+        Returns:
+            dict: number of open, assigned, added, removed, finished and vanished tasks, average time until assignment
+                  and average duration of the execution (in seconds)
+        """
+        with self.lock:
+            return {
+                "open": len(self.open),
+                "assigned": len(self.assignedTo),
+                "added": self.added,
+                "removed": self.removed,
+                "finished": self.finished,
+                "vanished": self.vanished,
+                "avgWaitTime": self.totalWaitTime / self.assignments
+                if self.assignments
+                else 0.0,
+                "avgDuration": self.totalDuration / self.finished
+                if self.finished
+                else 0.0,
+            }
+
+    def _addHistory(self, record):
+        """
+        Must be called while holding the lock
+        """
+        self.history.append(record)
+        if len(self.history) > self.historySize:
+            del self.history[: len(self.history) - self.historySize]
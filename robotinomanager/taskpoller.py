@@ -0,0 +1,120 @@
+"""
+Filename: taskpoller.py
+Version name: 1.0, 2026-10-17
+Short description: adaptive schedule for polling the transport tasks from the mes
+
+(C) 2003-2026 IAS, Universitaet Stuttgart
+
+"""
+import time
+from threading import Event
+
+from conf import POLL_TIME_TASKS, POLL_TIME_TASKS_MAX
+
+
+class TaskPoller(object):
+    """
+    Schedules the polls of the transport tasks. The poll interval doubles (up to maxInterval) while the IAS-MES has no
+    task which could be assigned and is reset as soon as one is. The automated operation can be woken up, e.g. when a
+    Robotino finished its task, so it polls right away. Measures the pickup latency, i.e. the time between a Robotino
+    becoming free and getting a task assigned
+    """
+
+    def __init__(self, interval=POLL_TIME_TASKS, maxInterval=POLL_TIME_TASKS_MAX):
+        """
+        Args:
+            interval (float, optional): Poll interval while there are tasks (in seconds)
+            maxInterval (float, optional): Upper bound of the interval while there are no tasks (in seconds)
+        """
+        self.interval = interval
+        self.maxInterval = max(interval, maxInterval)
+        self.wakeUpFlag = Event()
+        # polls in a row which didn't assign a task
+        self.emptyPolls = 0
+        # resourceId of robotino -> time.monotonic() when it became free
+        self.freeSince = {}
+        # metrics
+        self.polls = 0
+        self.skippedPolls = 0
+        self.assignments = 0
+        self.totalPickupLatency = 0.0
+        self.maxPickupLatency = 0.0
+        self.lastPickupLatency = 0.0
+
+    def wakeUp(self):
+        """
+        Ends the current wait, so the next poll starts right away
+        """
+        self.wakeUpFlag.set()
+
+    def wait(self, timeout):
+        """
+        Waits until the timeout passed or wakeUp is called
+
+        Args:
+            timeout (float): max wait time (in seconds)
+
+        Returns:
+            bool: If it was woken up
+        """
+        isWokenUp = self.wakeUpFlag.wait(timeout)
+        self.wakeUpFlag.clear()
+        return isWokenUp
+
+    def getInterval(self):
+        """
+        Returns:
+            float: time until the next poll (in seconds)
+        """
+        return min(self.interval * 2 ** min(self.emptyPolls, 16), self.maxInterval)
+
+    def setFree(self, robotinoId):
+        """
+        Marks a Robotino as free. Only the first call since its last assignment counts
+        """
+        self.freeSince.setdefault(robotinoId, time.monotonic())
+
+    def setAssigned(self, robotinoId):
+        """
+        Records that a task was assigned to a Robotino
+        """
+        latency = time.monotonic() - self.freeSince.pop(robotinoId, time.monotonic())
+        self.assignments += 1
+        self.totalPickupLatency += latency
+        self.maxPickupLatency = max(self.maxPickupLatency, latency)
+        self.lastPickupLatency = latency
+
+    def setPolled(self, assignedTasks):
+        """
+        Records a poll and adapts the interval
+
+        Args:
+            assignedTasks (int): number of tasks which were assigned after the poll
+        """
+        self.polls += 1
+        self.emptyPolls = 0 if assignedTasks else self.emptyPolls + 1
+
+    def setSkipped(self):
+        """
+        Records a poll which was skipped because no Robotino was free
+        """
+        self.skippedPolls += 1
+
+    def getMetrics(self):
+        """
+        Gets the instrumentation of the poller
+
+        Returns:
+            dict: number of polls, skipped polls and assignments, current interval and pickup latency (in seconds)
+        """
+        return {
+            "polls": self.polls,
+            "skippedPolls": self.skippedPolls,
+            "interval": self.getInterval(),
+            "assignments": self.assignments,
+            "avgPickupLatency": self.totalPickupLatency / self.assignments
+            if self.assignments
+            else 0.0,
+            "maxPickupLatency": self.maxPickupLatency,
+            "lastPickupLatency": self.lastPickupLatency,
+        }